@@ -0,0 +1,184 @@
+# Concurrent AI summary stage for the ranking scripts.
+# Summaries are requested from a chat-completions endpoint with bounded
+# concurrency, a token-bucket rate limit and retries with exponential backoff.
+# Results are cached on disk by hash(model, prompt), so re-running over the
+# same candidates makes no API calls at all.
+#
+# The endpoint is plain HTTP + JSON, so OPENAI_API_BASE can point at any
+# compatible server, e.g. tools/fake_chat_server.py for local testing.
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from metrics import REGISTRY, track
+from sections import excerpt
+from text_cache import TextCache
+
+DEFAULT_MODEL = "gpt-4"
+DEFAULT_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
+DEFAULT_CONCURRENCY = int(os.getenv("RESUME_SUMMARY_CONCURRENCY", "4"))
+DEFAULT_RATE_PER_MINUTE = float(os.getenv("RESUME_SUMMARY_RPM", "60"))
+DEFAULT_RETRIES = int(os.getenv("RESUME_SUMMARY_RETRIES", "4"))
+DEFAULT_REQUEST_TIMEOUT = float(os.getenv("RESUME_SUMMARY_TIMEOUT", "120"))
+DEFAULT_CACHE_PATH = os.getenv(
+    "RESUME_SUMMARY_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_matcher", "summary_cache.sqlite3"),
+)
+SUMMARY_CACHE_VERSION = "chat-completions-v1"
+
+SYSTEM_PROMPT = "You are a professional technical recruiter."
+# Resume characters per prompt, shared between its sections (see
+# sections.excerpt) rather than cut from the top of the text.
+PROMPT_CHARS = 4000
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+def build_prompt(text):
+    return f"""
+    Analyze the following resume content:
+
+    {excerpt(text, PROMPT_CHARS)}
+
+    Provide a summary with:
+    - Key strengths
+    - Weaknesses
+    - Technologies used
+    - Project experience
+    Keep it clear and concise.
+    """
+
+def summary_key(prompt, model):
+    return hashlib.sha256(f"{model}\0{SYSTEM_PROMPT}\0{prompt}".encode("utf-8")).hexdigest()
+
+class TokenBucket:
+    # Reservation-based: acquire() books a token under a thread lock and then
+    # sleeps off any debt, so one bucket can be shared by several event loops
+    # (e.g. pipeline threads each calling generate_ai_summaries).
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            await asyncio.sleep(wait)
+
+class SummaryError(Exception):
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+def _post_chat_completion(api_base, api_key, model, prompt, timeout):
+    body = json.dumps({
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+    }).encode("utf-8")
+    request = urllib.request.Request(
+        api_base.rstrip("/") + "/chat/completions",
+        data=body,
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {api_key or ''}"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        try:
+            retry_after = float(e.headers.get("Retry-After"))
+        except (AttributeError, TypeError, ValueError):
+            retry_after = None
+        raise SummaryError(f"HTTP {e.code}: {e.reason}", e.code, retry_after)
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise SummaryError(str(e))
+    return payload["choices"][0]["message"]["content"].strip()
+
+async def _summarize_one(prompt, model, api_base, api_key, semaphore, bucket, retries, timeout):
+    attempt = 0
+    while True:
+        async with semaphore:
+            await bucket.acquire()
+            try:
+                with track("summary_request", chars=len(prompt)):
+                    return await asyncio.to_thread(_post_chat_completion, api_base, api_key, model, prompt, timeout)
+            except SummaryError as e:
+                retryable = e.status is None or e.status in RETRYABLE_STATUS
+                if not retryable or attempt >= retries:
+                    raise
+                if e.retry_after is not None:
+                    delay = e.retry_after
+                else:
+                    delay = min(60.0, 2 ** attempt) * (0.5 + random.random())
+                REGISTRY.inc("summary_retries", status=e.status or "network")
+        # Back off outside the semaphore so other requests can proceed.
+        await asyncio.sleep(delay)
+        attempt += 1
+
+async def summarize_all_async(texts, model=DEFAULT_MODEL, api_key=None, api_base=DEFAULT_API_BASE,
+                              concurrency=DEFAULT_CONCURRENCY, rate_per_minute=DEFAULT_RATE_PER_MINUTE,
+                              retries=DEFAULT_RETRIES, timeout=DEFAULT_REQUEST_TIMEOUT, cache=None, bucket=None):
+    # Returns one summary per text, in order.  Failures come back as
+    # "AI Summary failed: ..." strings, matching generate_ai_summary.  Pass a
+    # shared TokenBucket to rate-limit several concurrent calls together.
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    prompts = [build_prompt(text) for text in texts]
+    keys = [summary_key(prompt, model) for prompt in prompts]
+    summaries = [cache.get(key, SUMMARY_CACHE_VERSION) if cache else None for key in keys]
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    bucket = bucket or TokenBucket(rate_per_minute)
+
+    async def run(i):
+        try:
+            summary = await _summarize_one(prompts[i], model, api_base, api_key, semaphore, bucket, retries, timeout)
+        except Exception as e:
+            return f"AI Summary failed: {e}"
+        if cache is not None:
+            cache.put(keys[i], SUMMARY_CACHE_VERSION, summary)
+        return summary
+
+    # Identical prompts (e.g. duplicate uploads) share a single request.
+    pending = {}
+    for i, summary in enumerate(summaries):
+        if summary is None and keys[i] not in pending:
+            pending[keys[i]] = asyncio.ensure_future(run(i))
+    if pending:
+        await asyncio.gather(*pending.values())
+    return [summary if summary is not None else pending[key].result() for summary, key in zip(summaries, keys)]
+
+def generate_ai_summaries(texts, **kwargs):
+    kwargs.setdefault("cache", get_default_summary_cache())
+    texts = list(texts)
+    with track("generate_ai_summary", items=len(texts)):
+        return asyncio.run(summarize_all_async(texts, **kwargs))
+
+def generate_ai_summary(text, **kwargs):
+    return generate_ai_summaries([text], **kwargs)[0]
+
+_default_summary_cache = None
+_default_lock = threading.Lock()
+
+def get_default_summary_cache():
+    global _default_summary_cache
+    with _default_lock:
+        if _default_summary_cache is None:
+            _default_summary_cache = TextCache(DEFAULT_CACHE_PATH, name="summary_cache")
+        return _default_summary_cache
@@ -1,56 +1,152 @@
 import streamlit as st
-import pandas as pd
-import fitz  # PyMuPDF
-import docx
 import os
 import re
+import time
+
+from corpus_index import get_default_index
+from dedup import find_duplicates, minhash
+from metrics import render_diagnostics_panel, serve_from_env, track
+from extraction import (
+    DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, DEFAULT_TIMEOUT, DEFAULT_WORKERS, ExtractionPool, extract_text_cached,
+)
+from pipeline import Throughput, iter_pipeline
+from skill_matcher import (
+    ResumeSkills, SkillMatcher, found_hit_matrix, score_hit_matrix, score_matched_skills, skill_years_matrix,
+    update_resume_skills,
+)
+from text_cache import file_digest, get_default_cache
 
 # -------------------- Helper Functions -------------------- #
-def extract_text_from_pdf(file):
-    text = ""
-    with fitz.open(stream=file.read(), filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+def parse_resume(file):
+    return extract_text_cached(file.type, file.getvalue(), get_default_cache())
 
-def extract_text_from_docx(file):
-    doc = docx.Document(file)
-    return " ".join([para.text for para in doc.paragraphs])
+def iter_parsed_resumes(files, indexes, matcher, max_workers=None, timeout=None, max_pages=None, stop_skills=None):
+    # Streams {"Index", "Skills", "Signature", "Error"} records as each
+    # resume is extracted (one thread per worker process) and skill-matched,
+    # in completion order; Skills is the resume's ResumeSkills (what it
+    # contains, kept for later skill lists) and Signature its MinHash for
+    # duplicate detection.
+    # A text is dropped as soon as it has been matched, and the queue between
+    # the stages is sized to the pool, so at most a few texts per worker are
+    # alive at once however many resumes there are.
+    indexes = list(indexes)
+    pool = ExtractionPool(min(max_workers or DEFAULT_WORKERS, len(indexes) or 1), timeout, get_default_cache(),
+                          max_pages, DEFAULT_MAX_CHARS, stop_skills)
 
-def parse_resume(file):
-    if file.type == "application/pdf":
-        return extract_text_from_pdf(file)
-    elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(file)
-    else:
-        return ""
+    def extract(record):
+        file = files[record["Index"]]
+        record["Text"] = pool.extract(file.type, file.getvalue())
+
+    def match(record):
+        text = record.pop("Text")
+        record["Skills"] = ResumeSkills(text, matcher)
+        record["Signature"] = minhash(text)
+
+    try:
+        records = ({"Index": i, "Skills": None, "Signature": None, "Error": None} for i in indexes)
+        yield from iter_pipeline(records, [(extract, pool.workers), (match, 1)], queue_size=2 * pool.workers)
+    finally:
+        pool.close()
 
-def calculate_match(resume_text, essential_skills, preferred_skills, skill_experience_map):
-    resume_text_lower = resume_text.lower()
-    total_essential = len(essential_skills)
-    total_preferred = len(preferred_skills)
+# -------------------- Rerun Caches -------------------- #
+# Streamlit reruns this script on every widget change.  Each stage below is
+# cached on its inputs, so e.g. a years-of-experience change only redoes the
+# weight arithmetic in score_hit_matrix, and a skill-list edit only looks for
+# the skills that are new.
 
-    essential_score = 0
-    preferred_score = 0
+def upload_digests(files):
+    # UploadedFile.file_id is stable for the life of an upload, so each file
+    # is hashed once per session rather than once per rerun.
+    digests = st.session_state.setdefault("upload_digests", {})
+    for f in files:
+        if f.file_id not in digests:
+            digests[f.file_id] = file_digest(f.getvalue())
+    return tuple(digests[f.file_id] for f in files)
 
-    for skill in essential_skills:
-        if skill.lower() in resume_text_lower:
-            weight = 1 + 0.1 * skill_experience_map.get(skill, 0)
-            essential_score += weight
+@st.cache_resource(show_spinner=False, max_entries=16)
+def get_skill_matcher(skills):
+    return SkillMatcher(list(skills))
 
-    for skill in preferred_skills:
-        if skill.lower() in resume_text_lower:
-            weight = 1 + 0.1 * skill_experience_map.get(skill, 0)
-            preferred_score += weight
+def load_resume_skills(files, digests, matcher, essential_skills, preferred_skills, skill_experience_map,
+                       years_from_resume, max_workers, timeout, max_pages, stop_skills):
+    # Each resume's ResumeSkills and signature are kept in session state
+    # keyed by upload digest and read budget; the texts themselves only live
+    # in the on-disk text cache.  Files not seen yet are streamed through the
+    # extraction pipeline, with a progress bar and a results table that fills
+    # in as each resume finishes.  A changed skill list only looks for the
+    # new skills, mostly without reading any text (see ResumeSkills).  Only
+    # parsed resumes are kept: a file that failed or timed out is tried
+    # again on the next run.
+    import pandas as pd
 
-    max_essential_score = total_essential * 2
-    max_preferred_score = total_preferred * 2
+    store = st.session_state.setdefault("resume_skills", {})
+    budget = (max_pages, stop_skills)
+    # The same file uploaded twice is only extracted once.
+    first = {}
+    for i, digest in enumerate(digests):
+        if (digest, budget) not in store:
+            first.setdefault(digest, i)
+    missing = list(first.values())
+    failed = {}
+    if missing:
+        progress = st.progress(0.0, text="Extracting resumes...")
+        live = st.empty()
+        meter = Throughput(len(missing))
+        rows = []
+        drawn = 0.0
+        for record in iter_parsed_resumes(files, missing, matcher, max_workers, timeout, max_pages, stop_skills):
+            i = record["Index"]
+            meter.update()
+            if record["Error"] is not None:
+                failed[digests[i]] = record["Error"]
+            else:
+                store[(digests[i], budget)] = (record["Skills"], record["Signature"])
+                resume = record["Skills"]
+                years = resume.years(matcher.skills) if years_from_resume else skill_experience_map
+                match_score = score_matched_skills(resume.found, essential_skills, preferred_skills, years)
+                rows.append({"Candidate": files[i].name, "Match %": match_score})
+            # Redraw a few times a second rather than once per resume.
+            now = time.perf_counter()
+            if now - drawn > 0.25 or meter.done == meter.total:
+                progress.progress(meter.fraction, text=str(meter))
+                live.dataframe(pd.DataFrame(rows))
+                drawn = now
+        progress.empty()
+        live.empty()
+    # Forget uploads that have been removed.
+    current = set(digests)
+    for key in [key for key in store if key[0] not in current]:
+        del store[key]
+    entries = [store.get((digest, budget), (None, None)) for digest in digests]
+    resumes = [resume for resume, _ in entries]
+    parsed = [i for i, resume in enumerate(resumes) if resume is not None]
 
-    essential_percent = (essential_score / max_essential_score * 100) if total_essential else 0
-    preferred_percent = (preferred_score / max_preferred_score * 100) if total_preferred else 0
+    def load_text(k):
+        file = files[parsed[k]]
+        return extract_text_cached(file.type, file.getvalue(), get_default_cache(), max_pages, DEFAULT_MAX_CHARS,
+                                   stop_skills)
 
-    total_score = (0.7 * essential_percent + 0.3 * preferred_percent)
-    return round(total_score, 2)
+    with track("update_resume_skills", resumes=len(parsed), skills=len(matcher.skills)) as span:
+        span.add(rescanned=update_resume_skills([resumes[i] for i in parsed], matcher.skills, load_text,
+                                                spans=years_from_resume))
+    errors = {i: failed[digest] for i, digest in enumerate(digests) if digest in failed}
+    return resumes, [signature for _, signature in entries], errors
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def find_resume_skills(digests, parsed, max_pages, stop_skills, skills, years_from_resume, _resumes):
+    # Resumes x skills hit matrix and the matching stated-years matrix (all
+    # zero unless years_from_resume); the ResumeSkills are determined by the
+    # other arguments.  parsed says which uploads have one, so a file that
+    # parses on a retry isn't served the result from when it failed.
+    hits, skills = found_hit_matrix([resume.found if resume else () for resume in _resumes], skills)
+    years = [resume.years(skills) if resume and years_from_resume else {} for resume in _resumes]
+    return hits, skills, skill_years_matrix(years, skills)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def find_duplicate_resumes(digests, parsed, max_pages, stop_skills, _signatures):
+    # For each upload, the position of the earlier upload it near-duplicates
+    # (None for originals); the signatures are determined by the arguments.
+    return find_duplicates(_signatures)
 
 def colorize(score):
     if score > 80:
@@ -61,6 +157,7 @@ def colorize(score):
         return 'red'
 
 # -------------------- Streamlit UI -------------------- #
+serve_from_env()
 st.title("📄 Resume Matcher App")
 
 st.subheader("Step 1: Paste Job Description")
@@ -74,25 +171,85 @@ st.subheader("Step 3: Upload Resumes (PDF/DOCX)")
 resume_files = st.file_uploader("Upload multiple resumes", type=["pdf", "docx"], accept_multiple_files=True)
 
 st.subheader("Step 4: Input Years of Experience")
+years_source = st.radio("Weight skills by years of experience", ["entered below", "read from each resume"],
+                        horizontal=True)
+years_from_resume = years_source == "read from each resume"
 skill_experience_map = {}
 
-if essential_input or preferred_input:
+if (essential_input or preferred_input) and not years_from_resume:
     all_skills = list(set([s.strip() for s in (essential_input + "," + preferred_input).split(",") if s.strip()]))
     for skill in all_skills:
         years = st.number_input(f"Years of experience in '{skill}'", min_value=0, max_value=50, value=0, step=1)
         skill_experience_map[skill] = years
 
+with st.sidebar.expander("Advanced"):
+    extract_workers = st.number_input("Extraction workers", min_value=1, max_value=64, value=min(DEFAULT_WORKERS, 64), step=1)
+    extract_timeout = st.number_input("Per-file timeout (seconds)", min_value=1, max_value=600, value=int(DEFAULT_TIMEOUT), step=5)
+    max_pages = st.number_input("Max pages per PDF (0 = all)", min_value=0, max_value=1000, value=DEFAULT_MAX_PAGES or 0, step=1)
+    stop_early = st.checkbox("Stop reading a resume once all skills are found", value=False)
+    save_to_index = st.checkbox("Add matched resumes to the candidate index", value=False)
+    index_top_k = st.number_input("Indexed candidates to show", min_value=1, max_value=1000, value=20, step=5)
+
 # -------------------- Processing -------------------- #
-if st.button("Match Resumes") and resume_files:
-    essential_skills = [s.strip() for s in essential_input.split(',') if s.strip()]
-    preferred_skills = [s.strip() for s in preferred_input.split(',') if s.strip()]
+essential_skills = [s.strip() for s in essential_input.split(',') if s.strip()]
+preferred_skills = [s.strip() for s in preferred_input.split(',') if s.strip()]
+
+match_clicked = st.button("Match Resumes")
+digests = upload_digests(resume_files) if resume_files else ()
+if match_clicked and resume_files:
+    st.session_state["matched_uploads"] = digests
+
+# Results stay on screen across reruns for the uploads that were matched.
+# pandas is imported where a table is built, not on a cold start.
+if resume_files and st.session_state.get("matched_uploads") == digests:
+    import pandas as pd
+
+    start = time.perf_counter()
+    all_skills = tuple(essential_skills + preferred_skills)
+    stop_skills = all_skills if stop_early else None
+
+    resumes, signatures, parse_errors = load_resume_skills(
+        resume_files, digests, get_skill_matcher(all_skills), essential_skills, preferred_skills,
+        skill_experience_map, years_from_resume, extract_workers, extract_timeout, max_pages or None, stop_skills)
+    for i, message in parse_errors.items():
+        st.warning(f"Could not parse {resume_files[i].name}: {message}")
+
+    parsed = tuple(resume is not None for resume in resumes)
+    hits, hit_skills, years_matrix = find_resume_skills(digests, parsed, max_pages or None, stop_skills, all_skills,
+                                                        years_from_resume, resumes)
+    match_scores = score_hit_matrix(hits, hit_skills, essential_skills, preferred_skills, skill_experience_map,
+                                    resume_years=years_matrix if years_from_resume else None)
+
+    # Near-duplicate uploads are folded into the first copy's row.
+    duplicate_of = find_duplicate_resumes(digests, parsed, max_pages or None, stop_skills, signatures)
+    duplicate_counts = {}
+    for original in duplicate_of:
+        if original is not None:
+            duplicate_counts[original] = duplicate_counts.get(original, 0) + 1
 
     results = []
+    for i, (file, match_score) in enumerate(zip(resume_files, match_scores.tolist())):
+        if duplicate_of[i] is not None:
+            continue
+        result = {"Candidate": file.name, "Match %": match_score, "Duplicates": duplicate_counts.get(i, 0),
+                  "Color": colorize(match_score)}
+        if years_from_resume:
+            result["Stated Experience"] = ", ".join(
+                f"{skill} {years:g}y" for skill, hit, years in zip(hit_skills, hits[i], years_matrix[i].tolist())
+                if hit and years)
+        results.append(result)
 
-    for file in resume_files:
-        resume_text = parse_resume(file)
-        match_score = calculate_match(resume_text, essential_skills, preferred_skills, skill_experience_map)
-        results.append({"Candidate": file.name, "Match %": match_score, "Color": colorize(match_score)})
+    if match_clicked and save_to_index and stop_early:
+        st.info("Resumes read with early stopping are partial and were not added to the candidate index.")
+    elif match_clicked and save_to_index:
+        # Texts come back from the text cache one at a time.
+        index = get_default_index()
+        for i, file in enumerate(resume_files):
+            if i not in parse_errors and duplicate_of[i] is None:
+                resume_text = extract_text_cached(file.type, file.getvalue(), get_default_cache(),
+                                                  max_pages or None, DEFAULT_MAX_CHARS)
+                index.add_file(file.name, file.getvalue(), resume_text, commit=False)
+        index.commit()
 
     df = pd.DataFrame(results)
 
@@ -100,6 +257,30 @@ if st.button("Match Resumes") and resume_files:
         return [f'color: {row.Color}'] * len(row)
 
     st.subheader("📊 Match Results")
-    st.dataframe(df.style.apply(highlight_row, axis=1).hide_columns(["Color"]))
+    st.dataframe(df.style.apply(highlight_row, axis=1).hide(subset=["Color"], axis="columns"))
+    collapsed = f", {len(resume_files) - len(results)} duplicates collapsed" if len(results) < len(resume_files) else ""
+    st.caption(f"Scored {len(results)} resumes{collapsed} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    st.success("Matching completed!")
+
+# -------------------- Indexed Candidates -------------------- #
+if st.button("Match Indexed Candidates") and (essential_skills or preferred_skills):
+    import pandas as pd
+
+    index = get_default_index()
+    top = index.top_k(index_top_k, jd_input, essential_skills, preferred_skills, skill_experience_map)
+    if top:
+        df = pd.DataFrame(top).rename(columns={"Score": "Match %"})
+        df["Color"] = df["Match %"].map(colorize)
+
+        def highlight_row(row):
+            return [f'color: {row.Color}'] * len(row)
+
+        st.subheader(f"🗂️ Top {len(top)} of {len(index)} Indexed Candidates")
+        st.dataframe(df.drop(columns=["Resume ID"]).style.apply(highlight_row, axis=1).hide(subset=["Color"], axis="columns"))
+    else:
+        st.info("The candidate index is empty. Enable 'Add matched resumes to the candidate index' and match some resumes first.")
 
-    st.success("Matching completed!")
\ No newline at end of file
+# Rendered last so it includes this run's timings.
+with st.sidebar.expander("Diagnostics"):
+    render_diagnostics_panel()
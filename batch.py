@@ -0,0 +1,257 @@
+# Headless batch ranking over directories of resumes (no Streamlit).
+#
+#   python batch.py --jd job.txt --resumes ./resumes --essential "Python,SQL" \
+#       --preferred "Docker,Kubernetes" --output results.csv [--summaries]
+#
+# Resumes are read, parsed and skill-scored in a process pool, a bounded
+# window of files at a time, while the main process computes JD similarity,
+# optional AI summaries and appends each finished chunk to the output file.
+# Memory therefore stays flat no matter how many resumes are processed, apart
+# from a MinHash signature per distinct resume for duplicate detection.
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from ai_summary import generate_ai_summaries
+from dedup import DuplicateIndex, minhash
+from extraction import (
+    DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, DEFAULT_TIMEOUT, DEFAULT_WORKERS, DOCX_TYPE, PDF_TYPE,
+    extract_text_cached,
+)
+from results import ResultStore
+from scoring import skill_hits, weighted_skill_score
+from similarity import calculate_similarities
+from text_cache import get_default_cache
+
+FILE_TYPES = {".pdf": PDF_TYPE, ".docx": DOCX_TYPE}
+SUMMARY_COLUMNS = ["Candidate", "Skill Match %", "JD Similarity %", "Essential Skills", "Preferred Skills", "Match Level"]
+
+# -------------------- Inputs -------------------- #
+def iter_resume_paths(source):
+    # A directory is walked recursively; anything else is treated as a glob.
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in FILE_TYPES:
+                    yield os.path.join(root, name)
+    else:
+        for path in sorted(glob.iglob(source, recursive=True)):
+            if os.path.splitext(path)[1].lower() in FILE_TYPES and os.path.isfile(path):
+                yield path
+
+def parse_skills(value):
+    return [s.strip() for s in (value or "").split(",") if s.strip()]
+
+# -------------------- Worker -------------------- #
+def score_resume(path, essential_skills, preferred_skills):
+    # Runs in a pool worker: extract (through the text cache) and
+    # fuzzy-score one resume, and fingerprint it for duplicate detection.
+    # The file is hashed and parsed by path, so it is never read into memory
+    # whole.  Only the hit vector comes back, not a table of emoji.
+    file_type = FILE_TYPES[os.path.splitext(path)[1].lower()]
+    text = extract_text_cached(file_type, path, get_default_cache(),
+                               max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS)
+    hits = skill_hits(text, essential_skills + preferred_skills)
+    weighted_score, _, _ = weighted_skill_score(hits, len(essential_skills), len(preferred_skills))
+    return text, {
+        "Path": path,
+        "Hits": hits,
+        "Skill Match %": weighted_score,
+        "Error": None,
+        "_signature": minhash(text),
+    }
+
+def failed_result(path, message):
+    return "", {"Path": path, "Hits": None, "Skill Match %": None, "Error": message}
+
+def iter_scored(paths, essential_skills, preferred_skills, workers=None, timeout=None, window=None):
+    # Yields (text, result) in input order.  At most `window` files are in
+    # flight, so memory is bounded by the window rather than the batch.  A
+    # file exceeding `timeout` is reported as failed and the pool restarted,
+    # resubmitting the other in-flight files, so it can't hold a worker.
+    workers = workers or DEFAULT_WORKERS
+    timeout = timeout or DEFAULT_TIMEOUT
+    window = window or workers * 4
+    ctx = multiprocessing.get_context("spawn")
+    pool = ctx.Pool(processes=workers)
+    in_flight = deque()
+    paths = iter(paths)
+
+    def submit(path):
+        in_flight.append((path, pool.apply_async(score_resume, (path, essential_skills, preferred_skills))))
+
+    try:
+        for path in paths:
+            submit(path)
+            if len(in_flight) >= window:
+                break
+        while in_flight:
+            path, result = in_flight.popleft()
+            try:
+                yield result.get(timeout)
+            except multiprocessing.TimeoutError:
+                yield failed_result(path, f"timed out after {timeout:g}s")
+                pool.terminate()
+                pool.join()
+                pool = ctx.Pool(processes=workers)
+                retry = [p for p, _ in in_flight]
+                in_flight.clear()
+                for p in retry:
+                    submit(p)
+            except Exception as e:
+                yield failed_result(path, str(e))
+            next_path = next(paths, None)
+            if next_path is not None:
+                submit(next_path)
+    finally:
+        pool.terminate()
+        pool.join()
+
+# -------------------- Pipeline -------------------- #
+def iter_result_chunks(jd_text, paths, essential_skills, preferred_skills, summaries=False,
+                       workers=None, timeout=None, chunk_size=500):
+    # Yields a ResultStore per chunk_size resumes.  JD similarity is fitted
+    # per chunk, so IDF reflects a chunk-sized sample of the pool.
+    # A near-duplicate of an earlier resume keeps its own skill scores, takes
+    # that resume's JD similarity, gets no AI summary and names its path in
+    # "Duplicate Of".
+    chunk = ResultStore(essential_skills, preferred_skills, capacity=chunk_size)
+    texts = []
+    duplicates = DuplicateIndex()
+    similarities = {}
+    for text, result in iter_scored(paths, essential_skills, preferred_skills, workers, timeout,
+                                    window=max(chunk_size, (workers or DEFAULT_WORKERS) * 4)):
+        row = chunk.append(result["Path"], result["Hits"], result["Skill Match %"], result["Error"])
+        if result["Error"] is None:
+            original = duplicates.add(result["Path"], result["_signature"])
+            if original is not None:
+                chunk.duplicate_of[row] = original
+                text = ""
+        texts.append(text)
+        if len(chunk) >= chunk_size:
+            yield finish_chunk(jd_text, chunk, texts, summaries, similarities)
+            chunk, texts = ResultStore(essential_skills, preferred_skills, capacity=chunk_size), []
+    if len(chunk):
+        yield finish_chunk(jd_text, chunk, texts, summaries, similarities)
+
+def finish_chunk(jd_text, chunk, texts, summaries, similarities=None):
+    # similarities: JD similarity by path of every original seen so far,
+    # for the duplicates in later chunks.
+    similarities = {} if similarities is None else similarities
+    ok = chunk.ok_rows()
+    for row, similarity in zip(ok, calculate_similarities(jd_text, [texts[row] for row in ok])):
+        chunk.similarity[row] = similarities[chunk.paths[row]] = round(float(similarity), 2)
+    for row, original in chunk.duplicate_of.items():
+        chunk.similarity[row] = similarities.get(original, np.nan)
+    if summaries:
+        chunk.summaries.update(zip(ok, generate_ai_summaries([texts[row] for row in ok])))
+    return chunk
+
+def process_resumes(jd_text, resume_paths, essential_skills, preferred_skills, summaries=True, **kwargs):
+    # In-memory convenience wrapper with the same shape as the scripts'
+    # output: near-duplicates are collapsed into their original's
+    # "Duplicates" count.  Results are collected in one ResultStore and
+    # rendered, skills tables included, only when the frame is built.
+    store = ResultStore(essential_skills, preferred_skills)
+    for chunk in iter_result_chunks(jd_text, resume_paths, essential_skills, preferred_skills, summaries, **kwargs):
+        store.extend(chunk)
+    return store.to_frame(skills_table="dict", collapse_duplicates=True)
+
+# -------------------- Output -------------------- #
+class ResultWriter:
+    # Appends result chunks to CSV, JSONL or Parquet as they complete.
+    def __init__(self, path, fmt=None):
+        self.path = path
+        self.format = fmt or os.path.splitext(path)[1].lstrip(".").lower() or "csv"
+        if self.format not in ("csv", "jsonl", "parquet"):
+            raise ValueError(f"Unsupported output format: {self.format!r}")
+        self.rows = 0
+        self._parquet = None
+        if self.format != "parquet" and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, chunk):
+        # chunk is a ResultStore; its skills tables are rendered here, as
+        # JSON objects in JSONL and as JSON strings in CSV and Parquet.
+        if self.format == "jsonl":
+            df = chunk.to_frame(skills_table="dict")
+            with open(self.path, "a", encoding="utf-8") as f:
+                df.to_json(f, orient="records", lines=True, force_ascii=False)
+        else:
+            df = chunk.to_frame(skills_table="json")
+            if self.format == "csv":
+                df.to_csv(self.path, mode="a", header=self.rows == 0, index=False)
+            else:
+                self._write_parquet(df)
+        self.rows += len(chunk)
+
+    def _write_parquet(self, df):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+        # Optional text columns are often all None in the first chunk, which
+        # would otherwise fix their type as null for the whole file.
+        table = pa.Table.from_pandas(df.astype({"Skill Match %": "float64", "JD Similarity %": "float64",
+                                                "Duplicate Of": "string", "Error": "string"}),
+                                     preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table.cast(self._parquet.schema))
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+# -------------------- CLI -------------------- #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank resumes against a job description without the Streamlit UI.")
+    parser.add_argument("--jd", required=True, help="path to the job description text file")
+    parser.add_argument("--resumes", required=True, help="directory (searched recursively) or glob of PDF/DOCX resumes")
+    parser.add_argument("--essential", default="", help="essential skills, comma-separated")
+    parser.add_argument("--preferred", default="", help="preferred skills, comma-separated")
+    parser.add_argument("--output", required=True, help="output file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], help="output format (default: from extension)")
+    parser.add_argument("--summaries", action="store_true", help="also generate AI summaries (needs OPENAI_API_KEY)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parsing/scoring processes")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds allowed per resume")
+    parser.add_argument("--chunk-size", type=int, default=500, help="resumes per output chunk")
+    args = parser.parse_args(argv)
+
+    with open(args.jd, encoding="utf-8") as f:
+        jd_text = f.read()
+    essential_skills = parse_skills(args.essential)
+    preferred_skills = parse_skills(args.preferred)
+    if args.summaries and not os.getenv("OPENAI_API_KEY"):
+        parser.error("--summaries needs OPENAI_API_KEY to be set")
+
+    writer = ResultWriter(args.output, args.format)
+    start = time.perf_counter()
+    failures = 0
+    duplicates = 0
+    try:
+        for chunk in iter_result_chunks(jd_text, iter_resume_paths(args.resumes), essential_skills,
+                                        preferred_skills, args.summaries, args.workers, args.timeout,
+                                        args.chunk_size):
+            writer.write(chunk)
+            failures += len(chunk.errors)
+            duplicates += len(chunk.duplicate_of)
+            elapsed = time.perf_counter() - start
+            print(f"{writer.rows} resumes ({failures} failed, {duplicates} duplicates) in {elapsed:.1f}s "
+                  f"- {writer.rows / elapsed:.1f}/s", file=sys.stderr)
+    finally:
+        writer.close()
+    print(f"Wrote {writer.rows} results to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
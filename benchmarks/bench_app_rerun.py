@@ -0,0 +1,139 @@
+# Benchmark: app.py rerun latency for a session with many uploaded resumes.
+# Drives the real script through Streamlit's AppTest, with the file uploader
+# patched to return synthetic PDFs, and times the first "Match Resumes" run
+# (extraction included) against the reruns triggered by the years inputs and
+# by editing the skill lists (adding, removing and moving skills).
+#
+#   python benchmarks/bench_app_rerun.py [--resumes 200] [--reruns 10]
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "AWS", "React", "Machine Learning", "Spark"]
+# Each edit starts from the previous one's lists.
+SKILL_EDITS = [
+    ("add an essential skill", SKILLS[:4] + ["Java"], SKILLS[4:]),
+    ("add a two-word skill", SKILLS[:4] + ["Java"], SKILLS[4:] + ["Data Engineering"]),
+    ("move a skill to preferred", SKILLS[:3] + ["Java"], [SKILLS[3]] + SKILLS[4:] + ["Data Engineering"]),
+    ("remove a skill", SKILLS[:3] + ["Java"], [SKILLS[3]] + SKILLS[5:] + ["Data Engineering"]),
+]
+FILLER = ("designed built maintained services teams delivered projects data pipelines customers "
+          "improved reliability performance mentored engineers across product platform").split()
+
+def make_resumes(directory, count, seed=0):
+    import fitz
+    rng = random.Random(seed)
+    for n in range(count):
+        doc = fitz.open()
+        for _ in range(2):
+            words = [rng.choice(FILLER) for _ in range(300)] + rng.sample(SKILLS, 3)
+            rng.shuffle(words)
+            page = doc.new_page()
+            page.insert_textbox(fitz.Rect(50, 50, 550, 800), " ".join(words), fontsize=9)
+        doc.save(os.path.join(directory, f"candidate_{n:04d}.pdf"))
+        doc.close()
+
+def app_script(resume_dir, app_path, root):
+    # Runs inside AppTest.  Uploads are built once per session and reused, as
+    # Streamlit's file manager does for a real upload.
+    import io
+    import os
+    import sys
+    import streamlit as st
+
+    sys.path.insert(0, root)
+
+    class Upload(io.BytesIO):
+        def __init__(self, path):
+            with open(path, "rb") as f:
+                super().__init__(f.read())
+            self.name = self.file_id = os.path.basename(path)
+            self.type = "application/pdf"
+
+    if "bench_uploads" not in st.session_state:
+        st.session_state["bench_uploads"] = [
+            Upload(os.path.join(resume_dir, name)) for name in sorted(os.listdir(resume_dir))]
+    uploads = st.session_state["bench_uploads"]
+    st.file_uploader = lambda *args, **kwargs: uploads
+    with open(app_path, encoding="utf-8") as f:
+        exec(compile(f.read(), app_path, "exec"), {"__name__": "__main__"})
+
+# AppTest makes the script the __main__ module, which spawned extraction
+# workers re-import as __mp_main__; the guard keeps them from running it.
+SCRIPT = """
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, {bench!r})
+    from bench_app_rerun import app_script
+    app_script({resume_dir!r}, {app_path!r}, {root!r})
+"""
+
+def app_test(resume_dir, app_path, directory, **kwargs):
+    from streamlit.testing.v1 import AppTest
+
+    path = os.path.join(directory, "bench_app.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(SCRIPT.format(bench=os.path.dirname(os.path.abspath(__file__)), resume_dir=resume_dir,
+                              app_path=app_path, root=ROOT))
+    return AppTest.from_file(path, **kwargs)
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resume_dir = os.path.join(tmp, "resumes")
+        os.mkdir(resume_dir)
+        make_resumes(resume_dir, args.resumes)
+        # Start from an empty on-disk text cache so the first match is cold.
+        os.environ["RESUME_TEXT_CACHE_PATH"] = os.path.join(tmp, "text_cache.sqlite3")
+
+        at = app_test(resume_dir, os.path.join(ROOT, "app.py"), tmp, default_timeout=600)
+        timed_run(at)
+        at.text_input[0].input(", ".join(SKILLS[:4]))
+        at.text_input[1].input(", ".join(SKILLS[4:]))
+        timed_run(at)
+        match = next(b for b in at.button if b.label == "Match Resumes")
+        match.click()
+        first = timed_run(at)
+
+        years = [n for n in at.number_input if n.label.startswith("Years of experience")]
+        reruns = []
+        for i in range(args.reruns):
+            years[i % len(years)].set_value(1 + i)
+            reruns.append(timed_run(at))
+            years = [n for n in at.number_input if n.label.startswith("Years of experience")]
+
+        edits = []
+        for _, essential, preferred in SKILL_EDITS:
+            at.text_input[0].input(", ".join(essential))
+            at.text_input[1].input(", ".join(preferred))
+            edits.append(timed_run(at))
+
+    print(f"{args.resumes} resumes, {len(SKILLS)} skills")
+    print(f"first match (extract + score): {first:8.1f} ms")
+    print(f"years rerun median:            {statistics.median(reruns):8.1f} ms")
+    print(f"years rerun max:               {max(reruns):8.1f} ms")
+    for (label, _, _), elapsed in zip(SKILL_EDITS, edits):
+        print(f"{label + ':':<31}{elapsed:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Benchmark: re-weighting a candidate pool after a years-of-experience change,
+# per-resume score_matched_skills loop vs the vectorised score_hit_matrix.
+#
+#   python benchmarks/bench_batch_scoring.py [--resumes 10000] [--skills 50]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from skill_matcher import score_hit_matrix, score_matched_skills
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--skills", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    skills = [f"skill{i}" for i in range(args.skills)]
+    essential = skills[: args.skills // 2]
+    preferred = skills[args.skills // 2:]
+    hits = np.asfortranarray(np.random.default_rng(0).random((args.resumes, args.skills)) < 0.3)
+    found = [{skills[j] for j in np.flatnonzero(row)} for row in hits]
+
+    print(f"{args.resumes} resumes x {args.skills} skills")
+    print(f"{'change':>8} {'loop ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for change in range(3):
+        experience = {skill: rng.randint(0, 15) for skill in skills}
+        loop_ms, expected = best_of(
+            lambda: [score_matched_skills(f, essential, preferred, experience) for f in found], args.repeat)
+        numpy_ms, scores = best_of(
+            lambda: score_hit_matrix(hits, skills, essential, preferred, experience), args.repeat)
+        assert [float(x).hex() for x in scores] == [float(x).hex() for x in expected]
+        print(f"{change:>8} {loop_ms:>10.2f} {numpy_ms:>10.2f} {loop_ms / numpy_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Benchmark: cold start of every entry point.
+# Each entry point runs in a fresh interpreter, so nothing is already in
+# sys.modules.  The two Streamlit apps go through AppTest up to their first
+# render (no uploads yet); the headless scripts are only imported.  Reports
+# the median time over --repeat runs and which heavy dependencies got loaded,
+# then what each heavy dependency costs when it is first used, and an import
+# profile (python -X importtime) of the slowest entry point, summed by
+# top-level package.
+#
+#   python benchmarks/bench_cold_start.py [--repeat 5] [--top 12]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ["pandas", "sklearn", "scipy", "fitz", "docx", "PyPDF2", "pyarrow", "numpy"]
+HEAVY_IMPORTS = {
+    "pandas": "import pandas",
+    "sklearn": "from sklearn.feature_extraction.text import TfidfVectorizer",
+    "scipy": "from scipy import sparse",
+    "fitz": "import fitz",
+    "docx": "import docx",
+    "PyPDF2": "import PyPDF2",
+    "numpy": "import numpy",
+}
+
+def _import_file(path):
+    return ("import importlib.util\n"
+            f"spec = importlib.util.spec_from_file_location('entry', {path!r})\n"
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n")
+
+def _first_render(path):
+    return ("from streamlit.testing.v1 import AppTest\n"
+            f"at = AppTest.from_file({path!r}, default_timeout=300)\n"
+            "at.run()\n"
+            "assert not at.exception, at.exception\n")
+
+ENTRY_POINTS = {
+    "app.py (first render)": _first_render(os.path.join(ROOT, "app.py")),
+    "ranking script (4) (first render)": _first_render(os.path.join(ROOT, "resume_match_and_ranking_script (4).py")),
+    "resume_matcher_app (5).py (import)": _import_file(os.path.join(ROOT, "resume_matcher_app (5).py")),
+    "batch.py (import)": "import batch\n",
+    "service.py (import)": "import service\n",
+    "corpus_index.py (import)": "import corpus_index\n",
+}
+
+# Runs in the child: times `code` and lists the heavy modules it loaded.
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+exec(compile({code!r}, "<entry>", "exec"), {{"__name__": "entry"}})
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def run_probe(code, extra_args=()):
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    # Streamlit's bare-mode warnings go to stderr; the result is the last
+    # line of stdout.
+    result = subprocess.run([sys.executable, *extra_args, "-c", PROBE.format(root=ROOT, code=code, heavy=HEAVY)],
+                            capture_output=True, text=True, cwd=ROOT, env=env)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "probe failed")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+def import_profile(stderr, top):
+    # python -X importtime lines: "import time: self | cumulative | name".
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return sorted(totals.items(), key=lambda item: -item[1])[:top]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    print(f"{'entry point':38}{'median ms':>10}  heavy modules loaded")
+    slowest = None
+    for label, code in ENTRY_POINTS.items():
+        runs = [run_probe(code)[0] for _ in range(args.repeat)]
+        median = statistics.median(run["seconds"] for run in runs) * 1000
+        print(f"{label:38}{median:>10.0f}  {', '.join(runs[0]['loaded']) or '-'}")
+        if slowest is None or median > slowest[1]:
+            slowest = (label, median, code)
+
+    print(f"\n{'dependency (first use)':38}{'median ms':>10}")
+    for name, code in HEAVY_IMPORTS.items():
+        median = statistics.median(run_probe(code)[0]["seconds"] for _ in range(args.repeat)) * 1000
+        print(f"{name:38}{median:>10.0f}")
+
+    label, _, code = slowest
+    _, stderr = run_probe(code, ["-X", "importtime"])
+    print(f"\nimport profile of {label}, self time by package:")
+    for package, micros in import_profile(stderr, args.top):
+        print(f"  {package:36}{micros / 1000:>10.1f} ms")
+
+if __name__ == "__main__":
+    main()
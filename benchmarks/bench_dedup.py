@@ -0,0 +1,91 @@
+# Benchmark: near-duplicate detection on a pool where some candidates applied
+# more than once.  Copies are re-exported (different line breaks and case),
+# gain an agency header, or have a few words edited.  Reports fingerprinting
+# and indexing time per resume, how many copies were caught, how many
+# distinct resumes were wrongly merged, and what the all-pairs comparison
+# the LSH index avoids would have cost.
+#
+#   python benchmarks/bench_dedup.py [--resumes 5000] [--duplicates 0.2] [--words 600]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from corpus import resume_text
+from dedup import DEFAULT_THRESHOLD, DuplicateIndex, minhash, similarity
+
+def near_copy(rng, text):
+    words = text.split()
+    kind = rng.randrange(3)
+    if kind == 0:
+        # Re-exported: same words, different layout and case.
+        return "\n".join(" ".join(words[i:i + 7]) for i in range(0, len(words), 7)).upper()
+    if kind == 1:
+        return f"Submitted by {rng.choice(['Acme', 'Globex', 'Initech'])} Recruiting on behalf of the candidate\n{text}"
+    for _ in range(max(1, len(words) // 200)):
+        words[rng.randrange(len(words))] = rng.choice(["updated", "2025", "lead", "senior"])
+    return " ".join(words)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="fraction of the pool that is a copy")
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    originals = int(args.resumes * (1 - args.duplicates))
+    pool = [(resume_text(i, words=args.words), i) for i in range(originals)]
+    pool += [(near_copy(rng, pool[source][0]), source)
+             for source in (rng.randrange(originals) for _ in range(args.resumes - originals))]
+    rng.shuffle(pool)
+
+    start = time.perf_counter()
+    signatures = [minhash(text) for text, _ in pool]
+    signing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = DuplicateIndex()
+    found = [index.add(i, signature) for i, signature in enumerate(signatures)]
+    indexing = time.perf_counter() - start
+
+    copies = caught = merged = 0
+    first = {}
+    for i, ((_, source), original) in enumerate(zip(pool, found)):
+        if source in first:
+            copies += 1
+        if original is not None:
+            if pool[original][1] == source:
+                caught += 1
+            else:
+                merged += 1
+        first.setdefault(source, i)
+
+    # All-pairs comparison, timed on a sample and scaled up.
+    sample = signatures[:200]
+    start = time.perf_counter()
+    for a in sample:
+        for b in sample:
+            similarity(a, b)
+    pair_time = (time.perf_counter() - start) / len(sample) ** 2
+    all_pairs = pair_time * len(pool) * (len(pool) - 1) / 2
+
+    print(f"{len(pool)} resumes x {args.words} words, {copies} copies, threshold {DEFAULT_THRESHOLD}")
+    print(f"minhash:           {signing / len(pool) * 1000:8.3f} ms/resume")
+    print(f"LSH index:         {indexing / len(pool) * 1000:8.3f} ms/resume ({indexing:.2f}s total)")
+    print(f"all-pairs instead: {all_pairs:8.1f} s (estimated)")
+    print(f"copies caught:     {caught / max(copies, 1):8.1%} ({caught}/{copies})")
+    print(f"wrongly merged:    {merged:8d}")
+    print(f"signature memory:  {np.dtype(np.uint32).itemsize * len(signatures[0]) * len(index) / 1024 ** 2:8.1f} MB "
+          f"for {len(index)} originals")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Benchmark: stated years of experience read from resume text.
+# Writes synthetic resumes whose skills come with a known duration, phrased
+# the ways resumes phrase it ("5 years of X", "X (5 yrs)", a dated job
+# entry), and reports how often experience_years recovers it, plus the time
+# it adds to skill matching per resume.
+#
+#   python benchmarks/bench_experience.py [--resumes 500] [--words 600]
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import FILLER
+from experience import experience_years
+from skill_matcher import SkillMatcher
+
+SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "AWS", "React", "Machine Learning", "Spark"]
+TODAY = datetime.date(2025, 1, 1)
+
+def mention(rng, skill, years):
+    # One way of stating years of experience in skill.
+    form = rng.randrange(4)
+    if form == 0:
+        return f"{years} years of experience in {skill}."
+    if form == 1:
+        return f"{skill} ({years} yrs)"
+    if form == 2:
+        return f"{skill} - {years} years;"
+    start = TODAY.year - years
+    return f"\nEngineer, Example Corp   Jan {start} – Jan {TODAY.year}\nBuilt services with {skill}.\n"
+
+def make_resume(rng, words):
+    # Returns (text, {skill: stated years}).
+    stated = {skill: rng.randint(1, 12) for skill in rng.sample(SKILLS, 3)}
+    tokens = rng.choices(FILLER, k=words)
+    for skill, years in stated.items():
+        tokens.insert(rng.randrange(len(tokens) + 1), mention(rng, skill, years))
+    return " ".join(tokens), stated
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    resumes = [make_resume(rng, args.words) for _ in range(args.resumes)]
+    matcher = SkillMatcher(SKILLS)
+
+    start = time.perf_counter()
+    for text, _ in resumes:
+        matcher.matched(text)
+    matched_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = []
+    for text, _ in resumes:
+        spans = matcher.find(text)
+        results.append(experience_years(text, spans, today=TODAY))
+    years_time = time.perf_counter() - start
+
+    stated = sum(len(truth) for _, truth in resumes)
+    exact = sum(found.get(skill) == years for (_, truth), found in zip(resumes, results)
+                for skill, years in truth.items())
+    spurious = sum(skill not in truth for (_, truth), found in zip(resumes, results) for skill in found)
+    print(f"{args.resumes} resumes x {args.words} words, {len(SKILLS)} skills")
+    print(f"matched() only:          {matched_time / len(resumes) * 1000:8.3f} ms/resume")
+    print(f"find() + years:          {years_time / len(resumes) * 1000:8.3f} ms/resume")
+    print(f"stated years recovered:  {exact / stated:8.1%} ({exact}/{stated})")
+    print(f"years for unstated skills: {spurious}")
+
+if __name__ == "__main__":
+    main()
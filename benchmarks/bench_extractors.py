@@ -0,0 +1,98 @@
+# Benchmark: extraction backends compared on the same documents.
+# Runs every backend on its own, then the default fallback chain ("auto"),
+# over a directory of real resumes or the synthetic corpus, and reports
+# throughput, characters recovered and how often each backend's output was
+# empty, garbled or failed outright.  For "auto" it also counts which backend
+# won, i.e. how often the fallback was needed.
+#
+#   python benchmarks/bench_extractors.py [DIR] [--count 100] [--repeat 3]
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+
+TYPES = {".pdf": "application/pdf",
+         ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+
+def load_documents(directory):
+    documents = []
+    for name in sorted(os.listdir(directory)):
+        file_type = TYPES.get(os.path.splitext(name)[1].lower())
+        if file_type:
+            with open(os.path.join(directory, name), "rb") as f:
+                documents.append((name, file_type, f.read()))
+    return documents
+
+def run(documents, backends, repeat):
+    # Returns per-document outcomes of the last pass and the best pass time.
+    from extraction import extract_text_detailed, is_usable
+    timings = []
+    for _ in range(repeat):
+        outcomes = []
+        start = time.perf_counter()
+        for name, file_type, data in documents:
+            chain = backends(file_type)
+            if not chain:
+                continue
+            try:
+                text, winner = extract_text_detailed(file_type, data, backends=chain)
+            except Exception:
+                outcomes.append(("error", 0, None))
+                continue
+            if is_usable(text):
+                status = "ok"
+            else:
+                status = "garbled" if text.strip() else "empty"
+            outcomes.append((status, len(text), winner))
+        timings.append(time.perf_counter() - start)
+    return outcomes, min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF/DOCX extraction backends.")
+    parser.add_argument("directory", nargs="?", help="resumes to extract (default: synthetic corpus)")
+    parser.add_argument("--count", type=int, default=100, help="synthetic resumes when no directory is given")
+    parser.add_argument("--repeat", type=int, default=3, help="passes per backend; the fastest is reported")
+    args = parser.parse_args()
+
+    from extraction import BACKENDS, backends_for
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.directory
+        if directory is None:
+            directory = tmp
+            generate_corpus(directory, args.count)
+        documents = load_documents(directory)
+    if not documents:
+        parser.error(f"no .pdf or .docx files in {args.directory}")
+
+    configs = {name: (lambda file_type, name=name: [name] if BACKENDS[name].file_type == file_type else [])
+               for name in BACKENDS}
+    configs["auto"] = backends_for
+
+    print(f"{len(documents)} documents from {args.directory or 'synthetic corpus'}")
+    print(f"{'backend':<12} {'docs':>5} {'docs/s':>9} {'median chars':>13} {'empty':>6} {'garbled':>8} {'errors':>7}  winners")
+    for label, backends in configs.items():
+        outcomes, seconds = run(documents, backends, args.repeat)
+        if not outcomes:
+            continue
+        counts = {status: sum(1 for o in outcomes if o[0] == status) for status in ("empty", "garbled", "error")}
+        winners = {}
+        for _, _, winner in outcomes:
+            if winner:
+                winners[winner] = winners.get(winner, 0) + 1
+        chars = statistics.median(o[1] for o in outcomes)
+        print(f"{label:<12} {len(outcomes):>5} {len(outcomes) / seconds:>9.1f} {chars:>13.0f} {counts['empty']:>6} "
+              f"{counts['garbled']:>8} {counts['error']:>7}  "
+              + ", ".join(f"{name}={n}" for name, n in sorted(winners.items())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Benchmark: FuzzyIndex vs the original difflib word-by-word fuzzy_match
+# used by evaluate_skills.
+#
+#   python benchmarks/bench_fuzzy_matcher.py [--resumes 20] [--words 1500]
+
+import argparse
+import difflib
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzy_matcher import FuzzyIndex
+
+def legacy_fuzzy_match(term, text, threshold=0.6):
+    # Original implementation from the ranking scripts, kept as the baseline.
+    words = text.split()
+    matches = [word for word in words if difflib.SequenceMatcher(None, word.lower(), term.lower()).ratio() >= threshold]
+    return bool(matches)
+
+def make_vocabulary(rng, n):
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 12))) for _ in range(n)]
+
+def make_resume(rng, vocabulary, skills, words):
+    tokens = [rng.choice(vocabulary) for _ in range(words)]
+    for skill in rng.sample(skills, max(1, len(skills) // 3)):
+        # Misspell some skills so the fuzzy path actually has work to do.
+        if rng.random() < 0.5 and len(skill) > 3:
+            i = rng.randrange(len(skill))
+            skill = skill[:i] + skill[i + 1:]
+        tokens[rng.randrange(words)] = skill.title() + rng.choice(["", ",", "."])
+    return " ".join(tokens)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, 3000)
+
+    print(f"{args.resumes} resumes x {args.words} words")
+    print(f"{'skills':>8} {'legacy ms':>12} {'ratio ms':>10} {'trigram ms':>11} {'ratio x':>8} {'trigram x':>10} {'trigram agree':>14}")
+    for n_skills in (5, 20, 50):
+        skills = make_vocabulary(rng, n_skills)
+        resumes = [make_resume(rng, vocabulary, skills, args.words) for _ in range(args.resumes)]
+
+        start = time.perf_counter()
+        legacy = [[legacy_fuzzy_match(s, r.lower()) for s in skills] for r in resumes]
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ratio = []
+        for r in resumes:
+            index = FuzzyIndex(r)
+            ratio.append([index.contains(s, method="ratio") for s in skills])
+        ratio_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        trigram = []
+        for r in resumes:
+            index = FuzzyIndex(r)
+            trigram.append([index.contains(s, method="trigram") for s in skills])
+        trigram_time = time.perf_counter() - start
+
+        assert legacy == ratio, "ratio method disagrees with the legacy fuzzy_match"
+        cells = sum(len(row) for row in legacy)
+        agree = sum(a == b for la, ta in zip(legacy, trigram) for a, b in zip(la, ta)) / cells
+        print(f"{n_skills:>8} {legacy_time * 1000:>12.1f} {ratio_time * 1000:>10.1f} {trigram_time * 1000:>11.1f} "
+              f"{legacy_time / ratio_time:>7.1f}x {legacy_time / trigram_time:>9.1f}x {agree:>13.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Benchmark: peak memory when extracting a batch of large uploads.
+# Holds every file in memory, as Streamlit does for uploads, and streams them
+# through ExtractionPool and a skill matcher the way app.py does.  Each
+# setting runs in a fresh process and reports the parent's peak RSS plus the
+# largest worker's, with spooling to temp files on and off.
+#
+#   python benchmarks/bench_large_uploads.py [--files 40] [--size-mb 8] [--workers 4]
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import resume_text
+from suite import peak_rss_mb
+
+def write_large_pdf(path, index, size_mb):
+    # A real resume text plus an incompressible image to pad it to size.
+    import fitz
+    rng = random.Random(index)
+    side = int((size_mb * 1024 * 1024 / 3) ** 0.5)
+    noise = fitz.Pixmap(fitz.csRGB, side, side, rng.randbytes(side * side * 3), 0)
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(40, 40, 572, 400), resume_text(index, words=200), fontsize=8)
+    page.insert_image(fitz.Rect(40, 420, 300, 680), pixmap=noise)
+    doc.save(path)
+    doc.close()
+
+def workers_peak_mb():
+    # Largest VmHWM among this process's live children (Linux only).
+    # ru_maxrss can't be used: spawned workers inherit it from the parent.
+    peaks = []
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                status = dict(line.split(":", 1) for line in f if ":" in line)
+        except OSError:
+            continue
+        if int(status.get("PPid", "0")) == os.getpid() and "VmHWM" in status:
+            peaks.append(int(status["VmHWM"].split()[0]) / 1024)
+    return max(peaks, default=None)
+
+def run_cell(directory, workers):
+    # Runs in a fresh process; RESUME_SPOOL_THRESHOLD_MB is set by the caller.
+    from extraction import PDF_TYPE, SPOOL_THRESHOLD, ExtractionPool
+    from pipeline import iter_pipeline
+    from skill_matcher import SkillMatcher
+
+    uploads = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), "rb") as f:
+            uploads.append(f.read())
+    rss_before = peak_rss_mb()
+    matcher = SkillMatcher(["Python", "SQL", "Docker", "Kubernetes", "AWS"])
+    pool = ExtractionPool(workers)
+
+    def extract(record):
+        record["Text"] = pool.extract(PDF_TYPE, uploads[record["Index"]])
+
+    def match(record):
+        record["Found"] = matcher.matched(record.pop("Text"))
+
+    start = time.perf_counter()
+    try:
+        records = ({"Index": i, "Error": None} for i in range(len(uploads)))
+        done = list(iter_pipeline(records, [(extract, pool.workers), (match, 1)], queue_size=2 * pool.workers))
+        worker_peak = workers_peak_mb()
+    finally:
+        pool.close()
+    return {
+        "spool_threshold_mb": SPOOL_THRESHOLD / (1024 * 1024),
+        "files": len(done),
+        "errors": sum(r["Error"] is not None for r in done),
+        "seconds": round(time.perf_counter() - start, 2),
+        "uploads_mb": round(sum(map(len, uploads)) / (1024 * 1024), 1),
+        "parent_before_mb": round(rss_before, 1),
+        "parent_peak_mb": round(peak_rss_mb(), 1),
+        "worker_peak_mb": worker_peak and round(worker_peak, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of extracting large uploads, spooled vs in-memory.")
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--size-mb", type=float, default=8.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cell", nargs=2, metavar=("DIR", "WORKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cell:
+        print(json.dumps(run_cell(args.cell[0], int(args.cell[1]))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.files):
+            write_large_pdf(os.path.join(tmp, f"portfolio_{i:04d}.pdf"), i, args.size_mb)
+        # A threshold above every file turns spooling off.
+        for label, threshold in (("in-memory", args.size_mb * 10), ("spooled", args.size_mb / 2)):
+            env = dict(os.environ, RESUME_SPOOL_THRESHOLD_MB=str(threshold),
+                       RESUME_TEXT_CACHE_PATH=os.path.join(tmp, f"cache-{label}.sqlite3"))
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--cell", tmp, str(args.workers)],
+                                 env=env, capture_output=True, text=True, check=True).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(f"{label:<10} {result['files']} files ({result['uploads_mb']} MB held)  {result['seconds']:>6.2f}s  "
+                  f"parent peak {result['parent_peak_mb']} MB (+{result['parent_peak_mb'] - result['parent_before_mb']:.1f})  "
+                  f"largest worker {result['worker_peak_mb']} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Benchmark: time to first result and total time for the streaming
+# extract -> match pipeline vs the all-at-once extract_texts_parallel, on a
+# cold text cache.
+#
+#   python benchmarks/bench_pipeline.py [--resumes 1000] [--workers 4]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_app_rerun import SKILLS, make_resumes
+from extraction import PDF_TYPE, ExtractionPool, extract_texts_parallel
+from pipeline import iter_pipeline
+from skill_matcher import SkillMatcher
+from text_cache import TextCache
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_resumes(tmp, args.resumes)
+        items = []
+        for name in sorted(os.listdir(tmp)):
+            with open(os.path.join(tmp, name), "rb") as f:
+                items.append((PDF_TYPE, f.read()))
+        matcher = SkillMatcher(SKILLS)
+
+        start = time.perf_counter()
+        texts, errors = extract_texts_parallel(items, args.workers, cache=TextCache(os.path.join(tmp, "a.sqlite3")))
+        [matcher.matched(text) for text in texts]
+        batch_total = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = None
+        with ExtractionPool(args.workers, cache=TextCache(os.path.join(tmp, "b.sqlite3"))) as pool:
+            def extract(record):
+                record["Text"] = pool.extract(*items[record["Index"]])
+
+            def match(record):
+                record["Found"] = matcher.matched(record["Text"])
+
+            records = ({"Index": i, "Error": None} for i in range(len(items)))
+            done = 0
+            for record in iter_pipeline(records, [(extract, pool.workers), (match, 1)]):
+                done += 1
+                if first is None:
+                    first = time.perf_counter() - start
+        stream_total = time.perf_counter() - start
+        assert done == len(items)
+
+    print(f"{args.resumes} resumes, {args.workers} workers, cold cache")
+    print(f"{'':>10} {'first result s':>15} {'total s':>9}")
+    print(f"{'batch':>10} {batch_total:>15.2f} {batch_total:>9.2f}")
+    print(f"{'pipeline':>10} {first:>15.2f} {stream_total:>9.2f}")
+
+if __name__ == "__main__":
+    main()
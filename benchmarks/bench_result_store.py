@@ -0,0 +1,95 @@
+# Benchmark: holding and exporting results for a large pool.
+# Builds the same results two ways: one dict per candidate with a
+# {skill: "🟢"/"🔴"} table, as batch.py used to keep them, and a ResultStore.
+# Reports the memory each holds (tracemalloc) and how long writing the whole
+# pool to CSV takes.
+#
+#   python benchmarks/bench_result_store.py [--candidates 50000] [--skills 200]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from results import ResultStore
+from scoring import color_match_level, skill_table, weighted_skill_score
+
+def build_dicts(paths, hits, essential, preferred):
+    rows = []
+    for path, row in zip(paths, hits):
+        score, essential_hit, preferred_hit = weighted_skill_score(row, len(essential), len(preferred))
+        rows.append({
+            "Candidate": os.path.basename(path),
+            "Path": path,
+            "Skill Match %": score,
+            "JD Similarity %": None,
+            "Match Level": color_match_level(score),
+            "Essential Skills": f"{essential_hit}/{len(essential)}",
+            "Preferred Skills": f"{preferred_hit}/{len(preferred)}",
+            "Skills Table": skill_table(row, essential + preferred),
+            "AI Summary": None,
+            "Duplicate Of": None,
+            "Error": None,
+        })
+    return rows
+
+def build_store(paths, hits, essential, preferred):
+    store = ResultStore(essential, preferred)
+    for path, row in zip(paths, hits):
+        store.append(path, row, weighted_skill_score(row, len(essential), len(preferred))[0])
+    return store
+
+def measure(build, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, held / 1024 ** 2, elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=50_000)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--density", type=float, default=0.3, help="fraction of skills each candidate has")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    skills = [f"Skill {j}" for j in range(args.skills)]
+    essential, preferred = skills[:args.skills // 2], skills[args.skills // 2:]
+    hits = (rng.random((args.candidates, args.skills)) < args.density).astype(np.uint8)
+    # Both are fed the same rows; only the containers are measured.
+    paths = [f"/data/resumes/candidate_{i:06d}.pdf" for i in range(args.candidates)]
+    rows = list(hits)
+
+    dicts, dict_mb, dict_build = measure(build_dicts, paths, rows, essential, preferred)
+    store, store_mb, store_build = measure(build_store, paths, rows, essential, preferred)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        df = pd.DataFrame(dicts)
+        df["Skills Table"] = df["Skills Table"].map(lambda m: json.dumps(m, ensure_ascii=False))
+        df.to_csv(os.path.join(tmp, "dicts.csv"), index=False)
+        dict_csv = time.perf_counter() - start
+        start = time.perf_counter()
+        store.to_frame(skills_table="json").to_csv(os.path.join(tmp, "store.csv"), index=False)
+        store_csv = time.perf_counter() - start
+        same = open(os.path.join(tmp, "dicts.csv"), "rb").read() == open(os.path.join(tmp, "store.csv"), "rb").read()
+
+    print(f"{args.candidates} candidates x {args.skills} skills")
+    print(f"{'':<12} {'held MB':>9} {'build s':>8} {'CSV s':>7}")
+    print(f"{'dict rows':<12} {dict_mb:>9.1f} {dict_build:>8.2f} {dict_csv:>7.2f}")
+    print(f"{'ResultStore':<12} {store_mb:>9.1f} {store_build:>8.2f} {store_csv:>7.2f}  (arrays {store.nbytes / 1024 ** 2:.1f} MB)")
+    print(f"identical CSV: {same}")
+
+if __name__ == "__main__":
+    main()
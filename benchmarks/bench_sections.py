@@ -0,0 +1,118 @@
+# Benchmark: JD similarity and AI prompts on the relevant resume sections.
+# Takes the synthetic corpus resumes (Summary/Experience/Projects/Skills/
+# Education) and appends the boilerplate real resumes carry: a contact block,
+# references, hobbies and a declaration, with random names and places.  The
+# clean resumes are the reference: the closer a pool's similarity scores and
+# ranking stay to theirs, the less the boilerplate is drowning the signal.
+# Also reports the TF-IDF vocabulary, fit time, segmentation time and how
+# much of each section an AI summary prompt gets to see.
+#
+#   python benchmarks/bench_sections.py [--resumes 1000] [--words 600]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import resume_text, skill_vocabulary
+from sections import excerpt, find_sections, relevant_text
+from similarity import calculate_similarities
+
+JD = ("Senior data engineer: Python, SQL, Spark, Airflow and Kafka pipelines on AWS, "
+      "Docker and Kubernetes deployments, monitoring and reliability for data platforms.")
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+def _word(rng):
+    return "".join(rng.choices(LETTERS, k=rng.randint(4, 9))).capitalize()
+
+def boilerplate(rng):
+    # Sections that say nothing about the candidate's work, at the sizes
+    # resumes tend to have them.
+    people = [f"{_word(rng)} {_word(rng)}, {rng.choice(['Manager', 'Director', 'Lead'])} at {_word(rng)} Ltd, "
+              f"{_word(rng).lower()}@{_word(rng).lower()}.com, +44 7{rng.randint(100000000, 999999999)}"
+              for _ in range(rng.randint(2, 3))]
+    hobbies = ", ".join(rng.choice(["football", "chess", "hiking", "photography", "cooking", "travel",
+                                    "reading", "volunteering", "cycling", "music"]) for _ in range(5))
+    return "\n".join([
+        "Personal Details",
+        f"Date of birth: {rng.randint(1, 28)}/{rng.randint(1, 12)}/{rng.randint(1975, 2000)}",
+        f"Address: {rng.randint(1, 200)} {_word(rng)} Road, {_word(rng)}, {_word(rng)}shire",
+        f"Nationality: {_word(rng)}   Languages: English, {_word(rng)}",
+        "Interests",
+        f"{hobbies}; member of the {_word(rng)} {_word(rng)} club and the {_word(rng)} society.",
+        "References",
+        *people,
+        "Declaration",
+        "I hereby declare that the information furnished above is true to the best of my knowledge "
+        "and belief, and I bear the responsibility for the correctness of the above mentioned particulars.",
+        f"Place: {_word(rng)}   Date: {rng.randint(1, 28)}.{rng.randint(1, 12)}.2024",
+    ])
+
+def ranks(scores):
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores))
+    ranks[order] = np.arange(len(scores))
+    return ranks
+
+def spearman(a, b):
+    return float(np.corrcoef(ranks(a), ranks(b))[0, 1])
+
+def vocabulary(texts):
+    return len(TfidfVectorizer(stop_words="english").fit([JD, *texts]).vocabulary_)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--density", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    vocab = skill_vocabulary(60)
+    clean = [resume_text(i, args.seed, args.words, args.density, vocab) for i in range(args.resumes)]
+    noisy = [text + "\n" + boilerplate(rng) for text in clean]
+
+    import sections
+    sections.ENABLED = False
+    reference = np.array(calculate_similarities(JD, clean))
+    whole, whole_time = timed(lambda: np.array(calculate_similarities(JD, noisy)))
+    sections.ENABLED = True
+    kept, kept_time = timed(lambda: np.array(calculate_similarities(JD, noisy)))
+    _, segment_time = timed(lambda: [find_sections(text) for text in noisy])
+
+    print(f"{args.resumes} resumes x {args.words} words + boilerplate "
+          f"({np.mean([len(n) - len(c) for c, n in zip(clean, noisy)]):.0f} chars each)")
+    print(f"{'':24}{'whole text':>12}{'sections':>12}")
+    print(f"{'TF-IDF vocabulary':24}{vocabulary(noisy):>12}{vocabulary([relevant_text(t) for t in noisy]):>12}")
+    print(f"{'similarity time (ms)':24}{whole_time * 1000:>12.1f}{kept_time * 1000:>12.1f}")
+    print(f"{'mean |score - clean| pp':24}{np.mean(np.abs(whole - reference)):>12.4f}"
+          f"{np.mean(np.abs(kept - reference)):>12.4f}")
+    print(f"{'rank corr. with clean':24}{spearman(whole, reference):>12.4f}{spearman(kept, reference):>12.4f}")
+    top = max(1, args.resumes // 10)
+    best = set(np.argsort(-reference)[:top])
+    print(f"{'top-10% overlap':24}{len(best & set(np.argsort(-whole)[:top])) / top:>12.1%}"
+          f"{len(best & set(np.argsort(-kept)[:top])) / top:>12.1%}")
+    print(f"segmentation: {segment_time / len(noisy) * 1000:.3f} ms/resume")
+
+    # A long resume, to show what a 4000-character prompt covers.
+    long_resume = resume_text(0, args.seed, 3000, args.density, vocab) + "\n" + boilerplate(rng)
+    start = {kind: s for kind, s, _ in find_sections(long_resume)}
+    for label, prompt in [("whole text", long_resume[:4000]), ("sections", excerpt(long_resume, 4000))]:
+        seen = [kind for kind in ("summary", "experience", "projects", "skills", "education")
+                if long_resume[start[kind]:start[kind] + 40].split("\n", 1)[1][:30] in prompt]
+        print(f"prompt from {label:11} {len(prompt)} chars, sections seen: {', '.join(seen) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Benchmark: service.py under concurrent /rank calls for the same job.
+# Starts the service in-process and has --clients threads post --requests
+# /rank calls each.  Every call sends --resumes resumes drawn from a shared
+# applicant pool of --pool, as pre-extracted text so parsing is out of the
+# picture.  Reports throughput and latency with request batching on and off.
+#
+#   python benchmarks/bench_service.py [--clients 16] [--requests 20] [--resumes 50] [--pool 200]
+
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import resume_text
+from metrics import REGISTRY
+from service import serve_in_thread
+
+SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "AWS", "React", "Machine Learning", "Spark"]
+
+def run(clients, requests, job, pool, resumes, batch_window, max_batch):
+    REGISTRY.reset()
+    service, address, stop = serve_in_thread(workers=1, batch_window=batch_window, max_batch=max_batch)
+
+    def client(index):
+        rng = random.Random(index)
+        conn = http.client.HTTPConnection(*address, timeout=300)
+        latencies = []
+        for _ in range(requests):
+            payload = json.dumps(dict(job, resumes=rng.sample(pool, resumes)))
+            start = time.perf_counter()
+            conn.request("POST", "/rank", body=payload, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"/rank answered {response.status}")
+            latencies.append(time.perf_counter() - start)
+        conn.close()
+        return latencies
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as executor:
+            latencies = [t for result in executor.map(client, range(clients)) for t in result]
+        elapsed = time.perf_counter() - start
+    finally:
+        stop()
+    batches = REGISTRY.snapshot()["stages"]["service_score"]["calls"]
+    return len(latencies) / elapsed, statistics.median(latencies), max(latencies), batches
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--resumes", type=int, default=50, help="resumes per request")
+    parser.add_argument("--pool", type=int, default=200, help="applicant pool the resumes are drawn from")
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--batch-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    job = {"jd": resume_text(10_000, words=200), "essential": SKILLS[:4], "preferred": SKILLS[4:]}
+    pool = [{"name": f"r{i}", "text": resume_text(i, words=args.words)} for i in range(max(args.pool, args.resumes))]
+    total = args.clients * args.requests
+    print(f"{args.clients} clients x {args.requests} /rank calls, {args.resumes} of {len(pool)} resumes "
+          f"x {args.words} words each")
+    print(f"{'batching':<18} {'req/s':>8} {'median ms':>10} {'max ms':>9} {'batches':>8}")
+    for label, window, max_batch in (("off", 0.0, 1), (f"{args.batch_ms:g} ms window", args.batch_ms / 1000, 64)):
+        throughput, median, worst, batches = run(args.clients, args.requests, job, pool, args.resumes, window, max_batch)
+        print(f"{label:<18} {throughput:>8.1f} {median * 1000:>10.1f} {worst * 1000:>9.1f} {batches:>5}/{total}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Benchmark: compiled SkillMatcher vs the original per-skill substring loop
+# in calculate_match, at 50/500/5000 skills.
+#
+#   python benchmarks/bench_skill_matcher.py [--resumes 50] [--words 1500]
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher, calculate_match
+
+def legacy_calculate_match(resume_text, essential_skills, preferred_skills, skill_experience_map):
+    # Original implementation from app.py, kept here as the baseline.
+    resume_text_lower = resume_text.lower()
+    total_essential = len(essential_skills)
+    total_preferred = len(preferred_skills)
+
+    essential_score = 0
+    preferred_score = 0
+
+    for skill in essential_skills:
+        if skill.lower() in resume_text_lower:
+            weight = 1 + 0.1 * skill_experience_map.get(skill, 0)
+            essential_score += weight
+
+    for skill in preferred_skills:
+        if skill.lower() in resume_text_lower:
+            weight = 1 + 0.1 * skill_experience_map.get(skill, 0)
+            preferred_score += weight
+
+    max_essential_score = total_essential * 2
+    max_preferred_score = total_preferred * 2
+
+    essential_percent = (essential_score / max_essential_score * 100) if total_essential else 0
+    preferred_percent = (preferred_score / max_preferred_score * 100) if total_preferred else 0
+
+    total_score = (0.7 * essential_percent + 0.3 * preferred_percent)
+    return round(total_score, 2)
+
+def make_skills(rng, n):
+    # Fixed-length random words never occur inside each other on word
+    # boundaries, so both implementations must agree on every score.
+    skills = set()
+    while len(skills) < n:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(9))
+        skills.add(word if rng.random() < 0.8 else word + " " + word[::-1])
+    return sorted(skills)
+
+def make_resume(rng, skills, words):
+    filler = ["worked", "on", "team", "delivered", "projects", "using", "and", "with", "the"]
+    tokens = [rng.choice(filler) for _ in range(words)]
+    for skill in rng.sample(skills, max(1, len(skills) // 10)):
+        tokens[rng.randrange(words)] = skill.title()
+    return " ".join(tokens)
+
+def bench(n_skills, n_resumes, words, rng):
+    skills = make_skills(rng, n_skills)
+    essential, preferred = skills[: n_skills // 2], skills[n_skills // 2 :]
+    years = {s: rng.randint(0, 10) for s in skills}
+    resumes = [make_resume(rng, skills, words) for _ in range(n_resumes)]
+
+    start = time.perf_counter()
+    legacy = [legacy_calculate_match(r, essential, preferred, years) for r in resumes]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(essential + preferred)
+    build_time = time.perf_counter() - start
+    compiled = [calculate_match(r, essential, preferred, years, matcher) for r in resumes]
+    compiled_time = time.perf_counter() - start
+
+    assert legacy == compiled, "compiled matcher disagrees with the legacy loop"
+    return legacy_time, build_time, compiled_time
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{args.resumes} resumes x {args.words} words")
+    print(f"{'skills':>8} {'legacy ms':>12} {'build ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    for n_skills in (50, 500, 5000):
+        legacy_time, build_time, compiled_time = bench(n_skills, args.resumes, args.words, rng)
+        print(f"{n_skills:>8} {legacy_time * 1000:>12.1f} {build_time * 1000:>10.1f} "
+              f"{compiled_time * 1000:>12.1f} {legacy_time / compiled_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
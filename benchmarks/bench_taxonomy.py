@@ -0,0 +1,81 @@
+# Benchmark: evaluate_skills with the skill taxonomy (canonical-ID matching)
+# vs the fuzzy-only scoring it replaced, on resumes that name half of their
+# skills by an alias ("k8s", "Postgres", "sklearn", ...).  Reports time per
+# resume and how many of the skills each resume really has were found.
+#
+#   python benchmarks/bench_taxonomy.py [--resumes 200] [--words 600] [--skills 5,20,50]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import FILLER
+from fuzzy_matcher import FuzzyIndex
+from scoring import evaluate_skills
+from taxonomy import get_default_taxonomy
+
+def legacy_evaluate_skills(resume_text, essential_skills, preferred_skills):
+    # Fuzzy lookup for every skill, as before the taxonomy; scores only.
+    index = FuzzyIndex(resume_text)
+    return {skill: index.contains(skill, method="ratio") for skill in essential_skills + preferred_skills}
+
+def make_resume(rng, taxonomy, skills, words):
+    # Returns (text, skills it contains); each skill is written as its name
+    # or, half the time, one of its aliases.
+    present = rng.sample(skills, max(1, len(skills) // 2))
+    tokens = rng.choices(FILLER, k=words)
+    for skill in present:
+        forms = taxonomy.surface_forms(skill)
+        form = forms[0] if len(forms) == 1 or rng.random() < 0.5 else rng.choice(forms[1:])
+        tokens.insert(rng.randrange(len(tokens) + 1), form)
+    return " ".join(tokens), set(present)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--skills", default="5,20,50")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    taxonomy = get_default_taxonomy()
+    names = sorted(taxonomy.names.values())
+
+    print(f"{args.resumes} resumes x {args.words} words, {len(taxonomy)}-skill taxonomy")
+    print(f"{'skills':>7} {'fuzzy ms':>10} {'taxonomy ms':>12} {'speedup':>8} {'fuzzy recall':>13} {'taxonomy recall':>16} "
+          f"{'fuzzy false +':>14} {'taxonomy false +':>17}")
+    for n_skills in [int(n) for n in args.skills.split(",") if n.strip()]:
+        skills = rng.sample(names, min(n_skills, len(names)))
+        essential, preferred = skills[: len(skills) // 2], skills[len(skills) // 2:]
+        resumes = [make_resume(rng, taxonomy, skills, args.words) for _ in range(args.resumes)]
+
+        start = time.perf_counter()
+        fuzzy = [legacy_evaluate_skills(text, essential, preferred) for text, _ in resumes]
+        fuzzy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = [{skill: mark == "🟢" for skill, mark in evaluate_skills(text, essential, preferred)[0].items()}
+                    for text, _ in resumes]
+        compiled_time = time.perf_counter() - start
+
+        def rates(results):
+            truth = [(skill in present, found) for (_, present), result in zip(resumes, results)
+                     for skill, found in result.items()]
+            positives = sum(real for real, _ in truth) or 1
+            negatives = sum(not real for real, _ in truth) or 1
+            return (sum(real and found for real, found in truth) / positives,
+                    sum(found and not real for real, found in truth) / negatives)
+
+        fuzzy_recall, fuzzy_fp = rates(fuzzy)
+        compiled_recall, compiled_fp = rates(compiled)
+        print(f"{len(skills):>7} {fuzzy_time / len(resumes) * 1000:>10.3f} {compiled_time / len(resumes) * 1000:>12.3f} "
+              f"{fuzzy_time / compiled_time:>7.1f}x {fuzzy_recall:>13.1%} {compiled_recall:>16.1%} "
+              f"{fuzzy_fp:>14.1%} {compiled_fp:>17.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Synthetic resume corpus for the benchmarks.
+# Every resume is generated deterministically from (seed, index), so a corpus
+# can be regenerated or extended and every run sees the same documents.
+# Size is controlled by words per resume, skill density by the fraction of
+# the skill vocabulary each resume mentions.
+#
+#   python benchmarks/corpus.py OUT_DIR [--count 100] [--formats pdf,docx]
+#       [--words 600] [--density 0.05]
+
+import argparse
+import os
+import random
+
+BASE_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#", "Ruby", "PHP", "Scala", "Kotlin",
+    "Swift", "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Kafka", "Spark", "Hadoop",
+    "Airflow", "dbt", "Snowflake", "BigQuery", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform",
+    "Ansible", "Jenkins", "GitHub Actions", "Linux", "Bash", "React", "Angular", "Vue", "Node.js", "Django",
+    "Flask", "FastAPI", "Spring Boot", "GraphQL", "REST APIs", "gRPC", "Machine Learning", "Deep Learning",
+    "PyTorch", "TensorFlow", "scikit-learn", "Pandas", "NumPy", "NLP", "Computer Vision", "Tableau",
+    "Power BI", "Excel",
+]
+
+FILLER = (
+    "designed built maintained delivered improved owned led migrated automated scaled optimised reviewed "
+    "services platform pipelines customers reliability performance latency throughput teams engineers "
+    "product roadmap stakeholders requirements releases incidents monitoring dashboards reporting data "
+    "systems features architecture testing quality deployments infrastructure budget partners across "
+    "within while using with for the and of to in on a an by"
+).split()
+
+SECTIONS = ["Summary", "Experience", "Projects", "Skills", "Education"]
+
+def skill_vocabulary(size=500):
+    # Real skill names first, then synthetic ones to reach `size`.
+    extra = [f"Tool{i:03d}" for i in range(max(0, size - len(BASE_SKILLS)))]
+    return (BASE_SKILLS + extra)[:size]
+
+def resume_text(index, seed=0, words=600, skill_density=0.05, vocabulary=None):
+    rng = random.Random(f"{seed}:{index}")
+    vocabulary = vocabulary or skill_vocabulary()
+    skills = rng.sample(vocabulary, max(1, round(len(vocabulary) * skill_density)))
+    tokens = rng.choices(FILLER, k=words)
+    for skill in skills:
+        phrase = f"{rng.randint(1, 12)} years of {skill}" if rng.random() < 0.3 else skill
+        tokens.insert(rng.randrange(len(tokens) + 1), phrase)
+    lines = [f"Candidate {index:05d}"]
+    per_section = max(1, len(tokens) // len(SECTIONS))
+    for n, section in enumerate(SECTIONS):
+        lines.append(section)
+        chunk = tokens[n * per_section:(n + 1) * per_section if n < len(SECTIONS) - 1 else None]
+        lines += [" ".join(chunk[i:i + 12]) for i in range(0, len(chunk), 12)]
+    return "\n".join(lines)
+
+def write_pdf(path, text, lines_per_page=45):
+    import fitz
+    lines = text.split("\n")
+    doc = fitz.open()
+    try:
+        for start in range(0, len(lines), lines_per_page):
+            page = doc.new_page()
+            overflow = page.insert_textbox(fitz.Rect(40, 40, 572, 800), "\n".join(lines[start:start + lines_per_page]),
+                                           fontsize=9)
+            if overflow < 0:
+                raise ValueError(f"page text does not fit ({overflow:.0f}pt over); lower lines_per_page")
+        doc.save(path)
+    finally:
+        doc.close()
+
+def write_docx(path, text):
+    import docx
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx}
+
+def corpus_path(directory, index, fmt):
+    return os.path.join(directory, f"resume_{index:05d}.{fmt}")
+
+def generate_corpus(directory, count, formats=("pdf", "docx"), seed=0, words=600, skill_density=0.05):
+    # Writes resume_NNNNN.{pdf,docx} for indexes [0, count), skipping files
+    # that already exist so a corpus can be grown in place.  Returns the
+    # paths per format.
+    os.makedirs(directory, exist_ok=True)
+    vocabulary = skill_vocabulary()
+    paths = {fmt: [] for fmt in formats}
+    for index in range(count):
+        text = None
+        for fmt in formats:
+            path = corpus_path(directory, index, fmt)
+            if not os.path.exists(path):
+                text = text or resume_text(index, seed, words, skill_density, vocabulary)
+                WRITERS[fmt](path + ".tmp", text)
+                os.replace(path + ".tmp", path)
+            paths[fmt].append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic PDF/DOCX resume corpus.")
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--formats", default="pdf,docx", help="comma-separated: pdf, docx")
+    parser.add_argument("--words", type=int, default=600, help="filler words per resume")
+    parser.add_argument("--density", type=float, default=0.05, help="fraction of the 500-skill vocabulary per resume")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    paths = generate_corpus(args.directory, args.count, formats, args.seed, args.words, args.density)
+    print(f"{args.count} resumes x {len(paths)} formats in {args.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# Benchmark suite: times every pipeline stage over a synthetic corpus at
+# several pool sizes and skill counts, and writes machine-readable JSON so
+# runs from different versions can be compared.
+#
+#   python benchmarks/suite.py [--sizes 10,100,1000,10000] [--skills 5,50,500]
+#       [--stages extract_pdf,calculate_match,...] [--budget 30]
+#       [--output results.json] [--baseline previous.json]
+#
+# Each (stage, resumes, skills) cell runs in a fresh process, so its peak RSS
+# is its own.  A cell stops timing items once it has used --budget seconds
+# and reports how many it measured.  Stages that don't depend on the skill
+# list run once per size with "skills": null.
+
+import argparse
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import corpus_path, generate_corpus, resume_text, skill_vocabulary
+
+JD_TEXT = ("We are hiring a senior engineer to design and scale data pipelines and services. "
+           "Python, SQL, AWS, Docker and Kubernetes experience required; Spark and React a plus.")
+
+# stage -> (input kind, depends on skills)
+STAGES = {
+    "extract_pdf": ("pdf", False),
+    "extract_pdf_pypdf2": ("pdf", False),
+    "extract_docx": ("docx", False),
+    "calculate_match": ("text", True),
+    "calculate_matches": ("text", True),
+    "evaluate_skills": ("text", True),
+    "calculate_similarity": ("text", False),
+    "calculate_similarities": ("text", False),
+}
+
+def peak_rss_mb():
+    # Linux keeps ru_maxrss across exec, so a spawned cell would inherit the
+    # parent's peak; VmHWM belongs to the new address space.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def job_spec(n_skills, seed=0):
+    rng = random.Random(seed)
+    skills = skill_vocabulary(max(n_skills, 1))[:n_skills]
+    essential = skills[: (n_skills + 1) // 2]
+    preferred = skills[(n_skills + 1) // 2:]
+    return essential, preferred, {skill: rng.randint(0, 10) for skill in skills}
+
+def per_item(fn, items, budget):
+    # Times fn(item) for each item until the budget is spent.
+    latencies = []
+    deadline = time.perf_counter() + budget
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+        if start > deadline:
+            break
+    return latencies
+
+def stage_runner(stage, n_skills):
+    # Returns (setup, fn, batched).  setup() is timed separately; batched
+    # stages are a single call over all items.
+    essential, preferred, experience = job_spec(n_skills or 0)
+
+    if stage == "extract_pdf":
+        from extraction import PDF_TYPE, extract_text
+        return None, lambda data: extract_text(PDF_TYPE, data), False
+    if stage == "extract_pdf_pypdf2":
+        from extraction import iter_pdf_pages_pypdf2, join_pages
+        return None, lambda data: join_pages(iter_pdf_pages_pypdf2(io.BytesIO(data))), False
+    if stage == "extract_docx":
+        from extraction import DOCX_TYPE, extract_text
+        return None, lambda data: extract_text(DOCX_TYPE, data), False
+    if stage == "calculate_match":
+        from skill_matcher import SkillMatcher, calculate_match
+        state = {}
+
+        def setup():
+            state["matcher"] = SkillMatcher(essential + preferred)
+        return setup, lambda text: calculate_match(text, essential, preferred, experience, state["matcher"]), False
+    if stage == "calculate_matches":
+        from skill_matcher import calculate_matches
+        return None, lambda texts: calculate_matches(texts, essential, preferred, experience), True
+    if stage == "evaluate_skills":
+        from scoring import evaluate_skills
+        return None, lambda text: evaluate_skills(text, essential, preferred), False
+    if stage == "calculate_similarity":
+        from similarity import calculate_similarity
+        return None, lambda text: calculate_similarity(text, JD_TEXT), False
+    if stage == "calculate_similarities":
+        from similarity import calculate_similarities
+        return None, lambda texts: calculate_similarities(JD_TEXT, texts), True
+    raise ValueError(f"unknown stage {stage!r}")
+
+def run_cell(stage, count, n_skills, corpus_dir, corpus_options, budget):
+    # Runs in a fresh spawned process.
+    kind, _ = STAGES[stage]
+    setup, fn, batched = stage_runner(stage, n_skills)
+    if kind == "text":
+        vocabulary = skill_vocabulary()
+        items = [resume_text(i, corpus_options["seed"], corpus_options["words"], corpus_options["skill_density"],
+                             vocabulary) for i in range(count)]
+    else:
+        items = []
+        for i in range(count):
+            with open(corpus_path(corpus_dir, i, kind), "rb") as f:
+                items.append(f.read())
+    rss_before = peak_rss_mb()
+
+    setup_seconds = 0.0
+    if setup is not None:
+        start = time.perf_counter()
+        setup()
+        setup_seconds = time.perf_counter() - start
+    # One untimed call first: libraries are imported on first use, and that
+    # cost belongs to bench_cold_start.py, not to the stage's latencies.
+    if items:
+        fn(items[:1] if batched else items[0])
+    if batched:
+        start = time.perf_counter()
+        fn(items)
+        latencies = [time.perf_counter() - start]
+        measured = count
+    else:
+        latencies = per_item(fn, items, budget)
+        measured = len(latencies)
+
+    import numpy as np
+    total = sum(latencies)
+    return {
+        "stage": stage,
+        "resumes": count,
+        "skills": n_skills,
+        "measured": measured,
+        "batched": batched,
+        "seconds": round(total, 6),
+        "setup_ms": round(setup_seconds * 1000, 3),
+        "throughput_per_s": round(measured / total, 2) if total else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 4),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 4),
+        "rss_before_mb": round(rss_before, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def compare(results, baseline):
+    # Prints throughput ratios against a previous run; >10% slower is flagged.
+    old = {(r["stage"], r["resumes"], r["skills"]): r for r in baseline["results"]}
+    print(f"{'stage':<24} {'resumes':>8} {'skills':>7} {'old/s':>11} {'new/s':>11} {'ratio':>7}")
+    for r in results:
+        prev = old.get((r["stage"], r["resumes"], r["skills"]))
+        if not prev or not prev["throughput_per_s"] or not r["throughput_per_s"]:
+            continue
+        ratio = r["throughput_per_s"] / prev["throughput_per_s"]
+        flag = "  <-- slower" if ratio < 0.9 else ""
+        print(f"{r['stage']:<24} {r['resumes']:>8} {str(r['skills']):>7} {prev['throughput_per_s']:>11.1f} "
+              f"{r['throughput_per_s']:>11.1f} {ratio:>6.2f}x{flag}")
+
+def parse_ints(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every resume-matching stage over a synthetic corpus.")
+    parser.add_argument("--sizes", type=parse_ints, default=[10, 100, 1000, 10000])
+    parser.add_argument("--skills", type=parse_ints, default=[5, 50, 500])
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of: " + ", ".join(STAGES))
+    parser.add_argument("--budget", type=float, default=30.0, help="seconds of per-item timing per cell")
+    parser.add_argument("--words", type=int, default=600, help="filler words per resume")
+    parser.add_argument("--density", type=float, default=0.05, help="fraction of the skill vocabulary per resume")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus-dir", help="where generated resumes are kept between runs")
+    parser.add_argument("--output", help="write JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="previous JSON output to compare throughput against")
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    corpus_options = {"seed": args.seed, "words": args.words, "skill_density": args.density}
+    corpus_dir = args.corpus_dir or os.path.join(
+        tempfile.gettempdir(), "resume_matcher_bench", f"w{args.words}-d{args.density}-s{args.seed}")
+    formats = sorted({STAGES[s][0] for s in stages} - {"text"})
+    if formats:
+        print(f"Generating corpus in {corpus_dir} ...", file=sys.stderr)
+        generate_corpus(corpus_dir, max(args.sizes), formats, args.seed, args.words, args.density)
+
+    cells = []
+    for stage in stages:
+        for count in args.sizes:
+            for n_skills in (args.skills if STAGES[stage][1] else [None]):
+                cells.append((stage, count, n_skills))
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for stage, count, n_skills in cells:
+        with ctx.Pool(1) as pool:
+            result = pool.apply(run_cell, (stage, count, n_skills, corpus_dir, corpus_options, args.budget))
+        results.append(result)
+        print(f"{stage:<24} {count:>6} resumes {str(n_skills):>5} skills  {result['throughput_per_s']:>10}/s  "
+              f"p50 {result['p50_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms  peak {result['peak_rss_mb']} MB",
+              file=sys.stderr)
+
+    report = {"environment": environment(), "corpus": dict(corpus_options, directory=corpus_dir),
+              "budget_s": args.budget, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+# Persistent resume corpus index.
+# Keeps every indexed resume's extracted text in SQLite together with its
+# skill tokens and TF-IDF term counts, so a new job description can be scored
+# against all past candidates without re-uploading or re-parsing anything.
+#
+# On open, the stored term vectors are loaded into in-memory sparse matrices:
+# a token -> resume postings matrix for skill lookups and an L2-normalised
+# TF-IDF matrix for JD similarity.  Each resume also stores hashes of its
+# runs of two and three adjacent tokens (with the whitespace between them),
+# so multi-word skill names ("apache spark", "node.js", "amazon web
+# services") are settled from postings too.  Only names of four or more
+# tokens are confirmed against the stored text, on the rows that contain
+# every three-token run of the name.  Adds and deletes are written through to
+# SQLite immediately; the matrices are rebuilt lazily before the next query.
+#
+#   python corpus_index.py add ./resumes
+#   python corpus_index.py query --jd job.txt --essential "Python,SQL" -k 20
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from fuzzy_matcher import DEFAULT_METHOD, FuzzyIndex
+from sections import relevant_text
+from skill_matcher import SkillMatcher, _TOKEN_RE, score_hit_matrix
+from taxonomy import get_default_taxonomy
+from text_cache import file_digest
+
+DEFAULT_PATH = os.getenv(
+    "RESUME_INDEX_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_matcher", "corpus_index.sqlite3"),
+)
+
+# Same analyzer and section filter as calculate_similarities, so scores are
+# comparable.  sklearn is only imported once something is indexed or queried.
+@lru_cache(maxsize=1)
+def _analyzer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(stop_words='english').build_analyzer()
+
+def _skill_tokens(text):
+    return set(_TOKEN_RE.split(text.lower())[1::2])
+
+# Longest token run stored per resume.
+MAX_GRAM = 3
+
+def _gram_hash(parts):
+    # parts: tokens with the exact gaps between them, as SkillMatcher
+    # matches a multi-word name.  Stable across processes, unlike hash(),
+    # since it is stored.
+    key = "\x00".join(parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little", signed=True)
+
+def _gram_hashes(text):
+    # Sorted distinct hashes of every run of 2..MAX_GRAM tokens in text.
+    parts = _TOKEN_RE.split(text.lower())
+    grams = {tuple(parts[i:i + 2 * n - 1]) for n in range(2, MAX_GRAM + 1)
+             for i in range(1, len(parts) - 2 * n + 2, 2)}
+    return np.unique(np.fromiter(map(_gram_hash, grams), dtype=np.int64, count=len(grams)))
+
+def _term_counts(text):
+    counts = {}
+    for term in _analyzer()(text):
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+class ResumeIndex:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " id INTEGER PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " digest TEXT UNIQUE,"
+            " text TEXT NOT NULL,"
+            " token_ids BLOB NOT NULL,"
+            " term_ids BLOB NOT NULL,"
+            " term_counts BLOB NOT NULL,"
+            " added REAL NOT NULL,"
+            " gram_hashes BLOB);"
+            "CREATE TABLE IF NOT EXISTS tokens (id INTEGER PRIMARY KEY, token TEXT UNIQUE NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT UNIQUE NOT NULL);"
+        )
+        # Indexes created before token runs were stored: their rows have NULL
+        # and fall back to reading the text for multi-word names.
+        if "gram_hashes" not in {row[1] for row in self._conn.execute("PRAGMA table_info(resumes)")}:
+            self._conn.execute("ALTER TABLE resumes ADD COLUMN gram_hashes BLOB")
+        self._tokens = {t: i for i, t in self._conn.execute("SELECT id, token FROM tokens")}
+        self._terms = {t: i for i, t in self._conn.execute("SELECT id, term FROM terms")}
+        self._rows = {}
+        for rid, name, token_ids, term_ids, term_counts, gram_hashes in self._conn.execute(
+                "SELECT id, name, token_ids, term_ids, term_counts, gram_hashes FROM resumes"):
+            self._rows[rid] = (name, np.frombuffer(token_ids, np.int32),
+                               np.frombuffer(term_ids, np.int32), np.frombuffer(term_counts, np.float32),
+                               None if gram_hashes is None else np.frombuffer(gram_hashes, np.int64))
+        self._dirty = True
+        self._fuzzy = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    # -------------------- Writes -------------------- #
+    def _intern(self, table, vocab, values):
+        missing = [v for v in values if v not in vocab]
+        if missing:
+            self._conn.executemany(f"INSERT OR IGNORE INTO {table} ({table[:-1]}) VALUES (?)", [(v,) for v in missing])
+            for value in missing:
+                vocab[value] = self._conn.execute(
+                    f"SELECT id FROM {table} WHERE {table[:-1]} = ?", (value,)).fetchone()[0]
+        return np.array(sorted(vocab[v] for v in values), dtype=np.int32)
+
+    def add(self, name, text, digest=None, commit=True):
+        # Returns the resume id; re-adding the same digest returns the
+        # existing entry instead of creating a duplicate.  Pass commit=False
+        # when adding many resumes and call commit() once at the end.
+        with self._lock:
+            if digest is not None:
+                row = self._conn.execute("SELECT id FROM resumes WHERE digest = ?", (digest,)).fetchone()
+                if row:
+                    return row[0]
+            token_ids = self._intern("tokens", self._tokens, _skill_tokens(text))
+            counts = _term_counts(relevant_text(text))
+            term_ids = self._intern("terms", self._terms, counts)
+            id_to_term = {self._terms[t]: t for t in counts}
+            term_counts = np.array([counts[id_to_term[i]] for i in term_ids], dtype=np.float32)
+            gram_hashes = _gram_hashes(text)
+            cursor = self._conn.execute(
+                "INSERT INTO resumes (name, digest, text, token_ids, term_ids, term_counts, added, gram_hashes)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, digest, text, token_ids.tobytes(), term_ids.tobytes(), term_counts.tobytes(), time.time(),
+                 gram_hashes.tobytes()),
+            )
+            if commit:
+                self._conn.commit()
+            self._rows[cursor.lastrowid] = (name, token_ids, term_ids, term_counts, gram_hashes)
+            self._dirty = True
+            return cursor.lastrowid
+
+    def add_file(self, name, data, text, commit=True):
+        return self.add(name, text, file_digest(data), commit)
+
+    def upgrade(self):
+        # Stores token runs for rows indexed before they existed, so their
+        # multi-word skills stop falling back to the text.  Returns the
+        # number of rows updated.
+        with self._lock:
+            missing = [rid for rid, row in self._rows.items() if row[4] is None]
+            for resume_id, text in self.get_texts(missing):
+                gram_hashes = _gram_hashes(text)
+                self._conn.execute("UPDATE resumes SET gram_hashes = ? WHERE id = ?",
+                                   (gram_hashes.tobytes(), resume_id))
+                self._rows[resume_id] = self._rows[resume_id][:4] + (gram_hashes,)
+            self._conn.commit()
+            self._dirty = self._dirty or bool(missing)
+            return len(missing)
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def delete(self, resume_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+            self._conn.commit()
+            if self._rows.pop(resume_id, None) is not None:
+                self._dirty = True
+
+    def get_text(self, resume_id):
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_texts(self, resume_ids, batch=500):
+        # Yields (id, text) for the ids that exist, a few queries in all.
+        resume_ids = list(resume_ids)
+        with self._lock:
+            for i in range(0, len(resume_ids), batch):
+                chunk = resume_ids[i:i + batch]
+                yield from self._conn.execute(
+                    f"SELECT id, text FROM resumes WHERE id IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+
+    # -------------------- In-memory matrices -------------------- #
+    def _refresh(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            from scipy import sparse
+
+            self._ids = np.fromiter(self._rows, dtype=np.int64, count=len(self._rows))
+            self._names = [self._rows[rid][0] for rid in self._ids]
+            rows = [self._rows[rid] for rid in self._ids]
+            n = len(rows)
+
+            # Token postings: CSC, so each token's column is its posting list.
+            lengths = [len(r[1]) for r in rows]
+            self._postings = sparse.csc_matrix(
+                (np.ones(sum(lengths), dtype=bool),
+                 (np.repeat(np.arange(n), lengths), np.concatenate([r[1] for r in rows]) if rows else [])),
+                shape=(n, max(self._tokens.values(), default=0) + 1),
+            )
+
+            # TF-IDF with sklearn's smooth IDF, rows L2-normalised.
+            lengths = [len(r[2]) for r in rows]
+            tf = sparse.csr_matrix(
+                (np.concatenate([r[3] for r in rows]) if rows else [],
+                 (np.repeat(np.arange(n), lengths), np.concatenate([r[2] for r in rows]) if rows else [])),
+                shape=(n, max(self._terms.values(), default=0) + 1),
+            )
+            df = np.bincount(tf.indices, minlength=tf.shape[1])
+            self._idf = np.log((1 + n) / (1 + df)) + 1
+            tfidf = tf.multiply(self._idf).tocsr()
+            norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            self._tfidf = sparse.csc_matrix(sparse.diags(1 / norms) @ tfidf)
+
+            # Token-run postings: every (hash, row), sorted by hash, so a
+            # run's rows are one searchsorted slice.  Rows stored without
+            # runs are flagged and checked against their text instead.
+            grams = [r[4] if r[4] is not None else np.zeros(0, np.int64) for r in rows]
+            hashes = np.concatenate(grams) if rows else np.zeros(0, np.int64)
+            order = np.argsort(hashes, kind="stable")
+            self._gram_keys = hashes[order]
+            self._gram_rows = np.repeat(np.arange(n), [len(g) for g in grams])[order]
+            self._no_grams = np.array([r[4] is None for r in rows], dtype=bool)
+            self._fuzzy = None
+            self._dirty = False
+
+    # -------------------- Queries -------------------- #
+    def _token_rows(self, token):
+        token_id = self._tokens.get(token)
+        if token_id is None or token_id >= self._postings.shape[1]:
+            return np.zeros(0, dtype=np.int64)
+        col = self._postings.indptr[token_id], self._postings.indptr[token_id + 1]
+        return self._postings.indices[col[0]:col[1]]
+
+    def _gram_rows_of(self, parts):
+        key = _gram_hash(parts)
+        lo = np.searchsorted(self._gram_keys, key, side="left")
+        hi = np.searchsorted(self._gram_keys, key, side="right")
+        return np.sort(self._gram_rows[lo:hi])
+
+    def skill_hits(self, skills):
+        # {skill: bool array over rows}, word-boundary semantics of
+        # SkillMatcher: a row hits when any of the skill's taxonomy names
+        # occurs in it.  Rows a name can't be settled for from postings are
+        # read back in one batch and scanned with one matcher for all of the
+        # skill's names, skipping rows another name already hit.
+        self._refresh()
+        taxonomy = get_default_taxonomy()
+        hits = {}
+        for skill in dict.fromkeys(skills):
+            mask = np.zeros(len(self._ids), dtype=bool)
+            unsettled = []
+            for form in dict.fromkeys(f.lower() for f in taxonomy.surface_forms(skill)):
+                rows, check = self._phrase_rows(form)
+                mask[rows] = True
+                unsettled.append(check)
+            check = np.unique(np.concatenate(unsettled)) if unsettled else []
+            check = [r for r in check if not mask[r]]
+            if check:
+                matcher = SkillMatcher([skill], taxonomy)
+                row_of = {int(self._ids[r]): r for r in check}
+                for resume_id, text in self.get_texts(row_of):
+                    if matcher.matched(text):
+                        mask[row_of[resume_id]] = True
+            hits[skill] = mask
+        return hits
+
+    def _phrase_rows(self, phrase):
+        # (rows known to contain phrase, rows that may and need their text
+        # read).  Names of up to MAX_GRAM tokens are exact from postings,
+        # except on rows stored without token runs.
+        parts = _TOKEN_RE.split(phrase)[1:-1]
+        tokens = parts[0::2]
+        empty = np.zeros(0, dtype=np.int64)
+        if not tokens:
+            return empty, empty
+        rows = self._token_rows(tokens[0])
+        for token in tokens[1:]:
+            rows = np.intersect1d(rows, self._token_rows(token), assume_unique=True)
+        if len(tokens) == 1 or not len(rows):
+            return rows, empty
+        unindexed = rows[self._no_grams[rows]]
+        rows = rows[~self._no_grams[rows]]
+        width = 2 * min(len(tokens), MAX_GRAM) - 1
+        for i in range(0, len(parts) - width + 1, 2):
+            rows = np.intersect1d(rows, self._gram_rows_of(tuple(parts[i:i + width])), assume_unique=True)
+        if len(tokens) <= MAX_GRAM:
+            return rows, unindexed
+        return empty, np.concatenate([rows, unindexed])
+
+    def fuzzy_skill_hits(self, skills, method=DEFAULT_METHOD):
+        # evaluate_skills-style hits: the fuzzy lookup runs once against the
+        # corpus vocabulary, then matching words' postings are unioned.
+        self._refresh()
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(vocabulary=self._tokens)
+        hits = {}
+        for skill in dict.fromkeys(skills):
+            mask = np.zeros(len(self._ids), dtype=bool)
+            words = self._fuzzy.matches(skill, method=method)
+            if skill.lower() in self._tokens:
+                words.append(skill.lower())
+            for word in words:
+                mask[self._token_rows(word)] = True
+            hits[skill] = mask
+        return hits
+
+    def match_scores(self, essential_skills, preferred_skills, skill_experience_map=None):
+        # calculate_match over the whole corpus.
+        skills = list(dict.fromkeys(essential_skills + preferred_skills))
+        hits = self.skill_hits(skills)
+        matrix = np.zeros((len(self._ids), len(skills)), dtype=bool, order="F")
+        for j, skill in enumerate(skills):
+            matrix[:, j] = hits[skill]
+        return score_hit_matrix(matrix, skills, essential_skills, preferred_skills, skill_experience_map or {})
+
+    def skill_scores(self, essential_skills, preferred_skills, method=DEFAULT_METHOD):
+        # evaluate_skills' 70/30 weighted score over the whole corpus:
+        # taxonomy skills by name or alias, the rest fuzzily.
+        taxonomy = get_default_taxonomy()
+        skills = essential_skills + preferred_skills
+        hits = self.skill_hits([s for s in skills if taxonomy.known(s)])
+        hits.update(self.fuzzy_skill_hits([s for s in skills if not taxonomy.known(s)], method))
+        essential = sum((hits[s] for s in essential_skills), np.zeros(len(self._ids)))
+        preferred = sum((hits[s] for s in preferred_skills), np.zeros(len(self._ids)))
+        essential_score = essential / len(essential_skills) * 70 if essential_skills else 0
+        preferred_score = preferred / len(preferred_skills) * 30 if preferred_skills else 0
+        return np.round(essential_score + preferred_score + np.zeros(len(self._ids)), 2)
+
+    def similarity(self, jd_text):
+        # Cosine similarity (x100) of the JD against every resume, touching
+        # only the columns of terms that occur in the JD.
+        self._refresh()
+        counts = _term_counts(jd_text)
+        if not counts or not len(self._ids):
+            return np.zeros(len(self._ids))
+        n = len(self._ids)
+        cols, weights, norm = [], [], 0.0
+        for term, count in counts.items():
+            term_id = self._terms.get(term)
+            idf = self._idf[term_id] if term_id is not None and term_id < len(self._idf) else np.log(1 + n) + 1
+            weight = count * idf
+            norm += weight * weight
+            if term_id is not None and term_id < self._tfidf.shape[1]:
+                cols.append(term_id)
+                weights.append(weight)
+        if not cols:
+            return np.zeros(n)
+        scores = self._tfidf[:, cols] @ np.array(weights)
+        return np.asarray(scores).ravel() / np.sqrt(norm) * 100
+
+    def top_k(self, k=20, jd_text=None, essential_skills=(), preferred_skills=(),
+              skill_experience_map=None, mode="match"):
+        # Returns the k best candidates as result dicts.  mode picks the
+        # ranking score: "match" (calculate_match), "skills" (evaluate_skills)
+        # or "similarity" (JD similarity).
+        essential_skills, preferred_skills = list(essential_skills), list(preferred_skills)
+        with self._lock:
+            return self._top_k(k, jd_text, essential_skills, preferred_skills, skill_experience_map, mode)
+
+    def _top_k(self, k, jd_text, essential_skills, preferred_skills, skill_experience_map, mode):
+        self._refresh()
+        if mode == "match":
+            scores = self.match_scores(essential_skills, preferred_skills, skill_experience_map)
+        elif mode == "skills":
+            scores = self.skill_scores(essential_skills, preferred_skills)
+        elif mode == "similarity":
+            scores = self.similarity(jd_text or "")
+        else:
+            raise ValueError(f"Unknown ranking mode: {mode!r}")
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        similarity = self.similarity(jd_text) if jd_text and mode != "similarity" else None
+        results = []
+        for row in top:
+            result = {"Candidate": self._names[row], "Resume ID": int(self._ids[row]), "Score": float(scores[row])}
+            if similarity is not None:
+                result["JD Similarity %"] = round(float(similarity[row]), 2)
+            results.append(result)
+        return results
+
+    def close(self):
+        self._conn.close()
+
+_default_index = None
+
+def get_default_index():
+    global _default_index
+    if _default_index is None:
+        _default_index = ResumeIndex()
+    return _default_index
+
+# -------------------- CLI -------------------- #
+def main(argv=None):
+    from batch import iter_resume_paths, parse_skills, FILE_TYPES
+    from extraction import extract_text
+
+    parser = argparse.ArgumentParser(description="Manage and query the persistent resume index.")
+    parser.add_argument("--index", default=DEFAULT_PATH, help="index database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="parse and index resumes")
+    add.add_argument("resumes", help="directory or glob of PDF/DOCX resumes")
+    delete = commands.add_parser("delete", help="remove resumes by id")
+    delete.add_argument("ids", type=int, nargs="+")
+    commands.add_parser("upgrade", help="store token runs for resumes indexed by an older version")
+    query = commands.add_parser("query", help="rank indexed resumes")
+    query.add_argument("--jd", help="job description text file")
+    query.add_argument("--essential", default="")
+    query.add_argument("--preferred", default="")
+    query.add_argument("--mode", choices=["match", "skills", "similarity"], default="match")
+    query.add_argument("-k", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = ResumeIndex(args.index)
+    if args.command == "add":
+        added = 0
+        for path in iter_resume_paths(args.resumes):
+            with open(path, "rb") as f:
+                data = f.read()
+            file_type = FILE_TYPES[os.path.splitext(path)[1].lower()]
+            index.add_file(os.path.basename(path), data, extract_text(file_type, data), commit=False)
+            added += 1
+        index.commit()
+        print(f"Indexed {added} resumes ({len(index)} total)", file=sys.stderr)
+    elif args.command == "delete":
+        for resume_id in args.ids:
+            index.delete(resume_id)
+    elif args.command == "upgrade":
+        print(f"Upgraded {index.upgrade()} of {len(index)} resumes", file=sys.stderr)
+    else:
+        jd_text = open(args.jd, encoding="utf-8").read() if args.jd else None
+        start = time.perf_counter()
+        results = index.top_k(args.k, jd_text, parse_skills(args.essential), parse_skills(args.preferred), mode=args.mode)
+        elapsed = time.perf_counter() - start
+        for rank, res in enumerate(results, 1):
+            extra = f"  similarity {res['JD Similarity %']:.2f}" if "JD Similarity %" in res else ""
+            print(f"{rank:>3}. {res['Score']:>7.2f}  {res['Candidate']} (#{res['Resume ID']}){extra}")
+        print(f"{len(index)} resumes searched in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    index.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# Near-duplicate resume detection.
+# The same CV often arrives several times: re-submitted, sent by more than one
+# agency, or re-exported to PDF with different spacing.  Each extracted text
+# gets a MinHash signature over its word 5-grams, and an LSH index (the
+# signature cut into bands, one hash bucket per band) turns "which earlier
+# resume is this one almost identical to?" into a few dict lookups, so a
+# whole pool is deduplicated in near-linear time.  Candidates from the
+# buckets are confirmed by their estimated Jaccard similarity.
+#
+# Only the first copy of each resume is indexed; later copies are reported as
+# duplicates of it so callers can skip scoring, JD similarity and summaries
+# for them.  RESUME_DEDUP_THRESHOLD sets the similarity that counts as a
+# duplicate (default 0.85); 0 turns detection off.
+
+import os
+import re
+import zlib
+
+import numpy as np
+
+DEFAULT_THRESHOLD = float(os.getenv("RESUME_DEDUP_THRESHOLD", "0.85"))
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs at 0.85 similarity share a bucket >99% of the
+# time, pairs below 0.5 almost never do.
+BANDS = 16
+
+_WORD_RE = re.compile(r"\w+")
+# Fixed permutations, so signatures agree across processes and runs.  Each
+# is x -> a * x + b (mod 2**32) with odd a, a bijection on 32-bit hashes.
+_rng = np.random.RandomState(20240501)
+_A = _rng.randint(0, 1 << 32, NUM_PERM, dtype=np.uint64).astype(np.uint32) | np.uint32(1)
+_B = _rng.randint(0, 1 << 32, NUM_PERM, dtype=np.uint64).astype(np.uint32)
+# Per-position multipliers that combine word hashes into a shingle hash.
+_POSITION = np.array([0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F, 0x165667B1], dtype=np.uint32)
+
+def shingle_hashes(text):
+    # uint32 hash of every word 5-gram, lowercased, so spacing, line breaks
+    # and case don't matter.  Words are hashed once and combined per
+    # position, rather than hashing each joined 5-gram string.
+    words = _WORD_RE.findall(text.lower())
+    words = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint32, count=len(words))
+    n = max(1, len(words) - SHINGLE_WORDS + 1) if len(words) else 0
+    hashes = np.zeros(n, dtype=np.uint32)
+    for k in range(min(SHINGLE_WORDS, len(words))):
+        hashes ^= words[k:k + n] * _POSITION[k]
+    return hashes
+
+def minhash(text):
+    # uint32 signature of text's word 5-grams, or None for text without words.
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    return (np.multiply.outer(hashes, _A) + _B).min(axis=0)
+
+def similarity(a, b):
+    # Estimated Jaccard similarity of the texts behind two signatures.
+    return np.count_nonzero(a == b) / len(a)
+
+class DuplicateIndex:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets = {}
+        self._signatures = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def add(self, key, signature):
+        # Returns the key of the indexed resume this one duplicates, or None
+        # after indexing it under key as a new original.
+        if signature is None or not self.threshold:
+            return None
+        bands = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                 for band in range(self.bands)]
+        checked = set()
+        for bucket in bands:
+            for other in self._buckets.get(bucket, ()):
+                if other not in checked:
+                    checked.add(other)
+                    if similarity(signature, self._signatures[other]) >= self.threshold:
+                        return other
+        self._signatures[key] = signature
+        for bucket in bands:
+            self._buckets.setdefault(bucket, []).append(key)
+        return None
+
+def find_duplicates(signatures, threshold=DEFAULT_THRESHOLD):
+    # One entry per signature: None for the first copy of a resume, else the
+    # position of that first copy.
+    index = DuplicateIndex(threshold)
+    return [index.add(i, signature) for i, signature in enumerate(signatures)]
@@ -0,0 +1,176 @@
+# Years of experience stated in a resume, per skill.
+# A single compiled regex finds, in one pass over the lowercased text:
+#   "5 years of Python", "3+ yrs experience with AWS"   years, then skills
+#   "Python (5 yrs)", "Kubernetes - 2 years"            a skill, then years
+#   "Jan 2018 - Mar 2021", "2016 to present"            a date range, credited
+#                                                       to every skill in the
+#                                                       entry it heads
+# Mentions are attached to the skill occurrences SkillMatcher.find() reports.
+# Both come out in text order, so pairing them is a merge and the whole
+# extraction stays linear in the length of the resume.  The mentions don't
+# depend on the skill list, so callers can keep them (stated_mentions) and
+# re-pair them with another list's occurrences (credit_years) without the
+# text.
+
+import bisect
+import datetime
+import re
+
+MAX_YEARS = 50
+# How far after "N years of" a skill may start, and how far a date range's
+# entry runs at most, in characters.
+FORWARD_WINDOW = 80
+ENTRY_WINDOW = 1000
+
+_NUMBER = r"\d{1,2}(?:\.\d)?"
+_YEARS = r"\s*\+?\s*(?:years?|yrs?)\b"
+_MONTH = (r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?")
+_MENTION_RE = re.compile(
+    # "5 years of experience in", "3+ yrs", "2 years using"
+    rf"\b(?P<forward>{_NUMBER}){_YEARS}\.?(?:\s+of)?(?:\s+(?:professional|industry|commercial|hands-on))?"
+    r"(?:\s+(?:experience|exp)\b\.?)?(?:\s+(?:in|with|of|using|on|across))?"
+    # "(5 yrs)", ": 4 years", "- 2 years"
+    rf"|[(\[:\-–—]\s*(?P<backward>{_NUMBER}){_YEARS}"
+    # "jan 2018 - mar 2021", "03/2019 – present", "2016 to 2019"
+    rf"|\b(?:(?P<m1>{_MONTH})\.?\s*|(?P<n1>\d{{1,2}})[/.])?(?P<y1>(?:19|20)\d{{2}})\b"
+    r"\s*(?:-|–|—|to|till|until)\s*"
+    rf"(?:(?:(?P<m2>{_MONTH})\.?\s*|(?P<n2>\d{{1,2}})[/.])?(?P<y2>(?:19|20)\d{{2}})\b"
+    r"|(?P<now>present|current|now|today|date)\b)"
+)
+_BREAK_RE = re.compile(r"[.;\n•]")
+_MONTHS = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+def _month(name, number):
+    if name:
+        return _MONTHS[name[:3]]
+    if number and 1 <= int(number) <= 12:
+        return int(number)
+    return 1
+
+def _range_months(match, today):
+    # (start, end) as months since year 0, or None for an implausible range.
+    start = int(match.group("y1")) * 12 + _month(match.group("m1"), match.group("n1")) - 1
+    if match.group("now"):
+        end = today.year * 12 + today.month - 1
+    else:
+        end = int(match.group("y2")) * 12 + _month(match.group("m2"), match.group("n2")) - 1
+    if end <= start or end - start > MAX_YEARS * 12:
+        return None
+    return start, end
+
+def stated_mentions(text, today=None):
+    # Every duration text states, located but not yet tied to any skill, as
+    # (following, backward, entries):
+    #   following  [(start, until, years)]: credits skills starting in
+    #              [start, until]
+    #   backward   [(position, content_end, following)]: credits the skills
+    #              ending in [content_end, position], i.e. right before the
+    #              bracket, else reads on as `following` does
+    #   entries    [(start, end, months)]: a date range's entry
+    text = text.lower()
+    today = today or datetime.date.today()
+    breaks = [match.start() for match in _BREAK_RE.finditer(text)]
+    following, backward, ranges = [], [], []
+
+    def reads_on(position, years):
+        # Skills starting within FORWARD_WINDOW and before the next break.
+        k = bisect.bisect_left(breaks, position)
+        until = position + FORWARD_WINDOW
+        if k < len(breaks):
+            until = min(until, breaks[k])
+        return position, until, years
+
+    for match in _MENTION_RE.finditer(text):
+        if match.group("forward"):
+            following.append(reads_on(match.end(), float(match.group("forward"))))
+        elif match.group("backward"):
+            years = float(match.group("backward"))
+            content_end = match.start()
+            while content_end and text[content_end - 1].isspace():
+                content_end -= 1
+            backward.append((match.start(), content_end, reads_on(match.end(), years)))
+        else:
+            months = _range_months(match, today)
+            if months is not None:
+                ranges.append((match.start(), match.end(), months))
+
+    entries = []
+    for i, (start, end, months) in enumerate(ranges):
+        # An entry runs from the start of the range's line (or the end of
+        # the previous range) to the start of the next range's entry.
+        entry_start = max(text.rfind("\n", 0, start) + 1, ranges[i - 1][1] if i else 0)
+        entry_end = end + ENTRY_WINDOW
+        if i + 1 < len(ranges):
+            next_start = ranges[i + 1][0]
+            next_line = text.rfind("\n", 0, next_start) + 1
+            entry_end = min(entry_end, next_line if next_line > end else next_start)
+        entries.append((entry_start, entry_end, months))
+    return following, backward, entries
+
+def experience_years(text, spans, today=None):
+    # spans: SkillMatcher.find(text).  Returns {skill: years} for the skills
+    # with a stated duration, rounded to 0.1: the largest explicit "N years"
+    # or, if more, the total time covered by the date ranges of the entries
+    # the skill appears in (overlapping ranges are counted once).
+    if not any(spans.values()):
+        return {}
+    return credit_years(stated_mentions(text, today), spans)
+
+def credit_years(mentions, spans):
+    # experience_years from stated_mentions(), so a resume's years can be
+    # re-derived for another skill list without reading its text again.
+    occurrences = sorted((start, end, skill) for skill, places in spans.items() for start, end in places)
+    if not occurrences:
+        return {}
+    following, backward, entries = mentions
+    starts = [start for start, _, _ in occurrences]
+    by_end = sorted((end, skill) for _, end, skill in occurrences)
+    ends = [end for end, _ in by_end]
+    explicit = {}
+
+    def credit(skill, years):
+        if years <= MAX_YEARS and years > explicit.get(skill, 0):
+            explicit[skill] = years
+
+    def credit_following(position, until, years):
+        for k in range(bisect.bisect_left(starts, position), len(occurrences)):
+            start, _, skill = occurrences[k]
+            if start > until:
+                break
+            credit(skill, years)
+
+    for mention in following:
+        credit_following(*mention)
+    for position, content_end, mention in backward:
+        # The skill(s) ending right before the bracket, dash or colon; with
+        # none ("Summary: 5 years of Python") it reads forwards.
+        k = bisect.bisect_right(ends, position) - 1
+        if k >= 0 and ends[k] >= content_end:
+            end = ends[k]
+            while k >= 0 and ends[k] == end:
+                credit(by_end[k][1], mention[2])
+                k -= 1
+        else:
+            credit_following(*mention)
+
+    intervals = {}
+    for entry_start, entry_end, months in entries:
+        for k in range(bisect.bisect_left(starts, entry_start), len(occurrences)):
+            if occurrences[k][0] >= entry_end:
+                break
+            intervals.setdefault(occurrences[k][2], []).append(months)
+
+    years = dict(explicit)
+    for skill, periods in intervals.items():
+        total = 0
+        covered_to = None
+        for start, end in sorted(periods):
+            if covered_to is not None and start < covered_to:
+                start = covered_to
+            if end > start:
+                total += end - start
+                covered_to = end
+        years[skill] = max(years.get(skill, 0), total / 12)
+    return {skill: round(value, 1) for skill, value in years.items() if value > 0}
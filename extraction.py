@@ -0,0 +1,394 @@
+# Resume text extraction shared by the Streamlit apps and batch scripts.
+# Lives in its own module so process-pool workers can import it without
+# re-running any Streamlit UI code.  The parsers (PyMuPDF, PyPDF2,
+# python-docx) are imported by the backend that first needs them, and
+# their versions for the cache tags come from package metadata, so a run
+# served from the text cache never loads them at all.
+
+import hashlib
+import io
+import mmap
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version as package_version
+
+from metrics import REGISTRY, counted, track
+from skill_matcher import compiled_matcher
+from taxonomy import get_default_taxonomy
+from text_cache import file_digest
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+DEFAULT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+DEFAULT_TIMEOUT = float(os.getenv("RESUME_EXTRACT_TIMEOUT", "60"))
+# Optional read budgets; 0 means no limit.
+DEFAULT_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "0")) or None
+DEFAULT_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "0")) or None
+
+# Uploads at least this large are written to a temp file and handed to
+# workers by path instead of being pickled through the pool; 0 spools all.
+SPOOL_THRESHOLD = int(float(os.getenv("RESUME_SPOOL_THRESHOLD_MB", "2")) * 1024 * 1024)
+
+# Backends tried for each document type, fastest first; later ones are only
+# used when earlier output is empty or garbled.
+PDF_BACKENDS = [b.strip() for b in os.getenv("RESUME_PDF_BACKENDS", "pymupdf,pypdf2").split(",") if b.strip()]
+DOCX_BACKENDS = ["python-docx"]
+
+# -------------------- Sources -------------------- #
+# Extractors take a "source": the file's bytes, or the path of a file holding
+# them (see spooled()).  Paths are opened directly, so a large upload is
+# never copied into the worker process.
+
+def is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+def source_size(source):
+    return os.path.getsize(source) if is_path(source) else len(source)
+
+def source_digest(source):
+    if not is_path(source):
+        return file_digest(source)
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+@contextmanager
+def spooled(data, threshold=SPOOL_THRESHOLD):
+    # Yields data itself when it is small, otherwise the path of a temp file
+    # holding it, removed on exit.
+    if is_path(data) or len(data) < threshold:
+        yield data
+        return
+    fd, path = tempfile.mkstemp(prefix="resume-", suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# -------------------- Extractors -------------------- #
+def iter_pdf_pages(source):
+    import fitz  # PyMuPDF
+
+    # MuPDF reads a file path on demand rather than loading it up front.
+    doc = fitz.open(source, filetype="pdf") if is_path(source) else fitz.open(stream=source, filetype="pdf")
+    with doc:
+        for page in doc:
+            yield page.get_text()
+
+def iter_pdf_pages_pypdf2(file):
+    from PyPDF2 import PdfReader
+
+    pdf_reader = PdfReader(file)
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
+
+def iter_pdf_source_pypdf2(source):
+    # PdfReader(path) would read the whole file into a BytesIO; a read-only
+    # memory map lets the OS page it in instead.
+    if not is_path(source):
+        yield from iter_pdf_pages_pypdf2(io.BytesIO(source))
+        return
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        yield from iter_pdf_pages_pypdf2(view)
+
+def iter_docx_paragraphs(source):
+    import docx
+
+    doc = docx.Document(source if is_path(source) else io.BytesIO(source))
+    for para in doc.paragraphs:
+        yield para.text
+
+def join_pages(pages, sep="", max_pages=None, max_chars=None, stop_skills=None):
+    # Pulls pages lazily and stops as soon as a budget is reached or, with
+    # stop_skills, once every skill has been seen.  Stopping on skills is only
+    # safe for skill scoring: the returned text is no longer the full document.
+    matcher = compiled_matcher(tuple(stop_skills)) if stop_skills else None
+    remaining = set(matcher.skills) if matcher else None
+    chunks = []
+    size = 0
+    try:
+        for i, page in enumerate(pages):
+            if max_pages and i >= max_pages:
+                break
+            chunks.append(page)
+            size += len(page) + len(sep)
+            if max_chars and size >= max_chars:
+                break
+            if remaining is not None:
+                remaining -= matcher.matched(page)
+                if not remaining:
+                    break
+    finally:
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+    text = sep.join(chunks)
+    return text[:max_chars] if max_chars else text
+
+# -------------------- Backends -------------------- #
+# iter_pages(source) yields page (or paragraph) texts, joined with sep;
+# package is the distribution whose version goes into the cache tag.  A
+# backend's tag changes whenever its output does, so cached text from the
+# old format is never served.
+class Backend(namedtuple("Backend", "file_type tag package iter_pages sep")):
+    @property
+    def version(self):
+        return f"{self.tag}-{_package_version(self.package)}"
+
+@lru_cache(maxsize=None)
+def _package_version(package):
+    try:
+        return package_version(package)
+    except PackageNotFoundError:
+        return "unknown"
+
+BACKENDS = {
+    "pymupdf": Backend(PDF_TYPE, "pymupdf", "PyMuPDF", iter_pdf_pages, ""),
+    "pypdf2": Backend(PDF_TYPE, "pypdf2", "PyPDF2", iter_pdf_source_pypdf2, ""),
+    # One paragraph per line, so section headings stay on lines of their own
+    # (see sections.py).
+    "python-docx": Backend(DOCX_TYPE, "python-docx-lines", "python-docx", iter_docx_paragraphs, "\n"),
+}
+
+for _name in PDF_BACKENDS:
+    if _name not in BACKENDS or BACKENDS[_name].file_type != PDF_TYPE:
+        raise ValueError(f"Unknown PDF backend {_name!r} in RESUME_PDF_BACKENDS")
+
+# Cache version tags: they name every backend in the chain, so changing the
+# order or upgrading a library never serves stale text from the text cache.
+@lru_cache(maxsize=None)
+def chain_version(backends):
+    return "auto:" + ",".join(BACKENDS[name].version for name in backends)
+
+# Characters that don't occur in readable text: controls, private-use glyphs,
+# replacement characters and pdfminer-style "(cid:NN)" placeholders.
+_GARBLED_RE = re.compile(r"\(cid:\d+\)|[\x00-\x08\x0b\x0e-\x1f\ue000-\uf8ff\ufffd]")
+MAX_GARBLED_FRACTION = 0.1
+
+def garbled_fraction(text):
+    return len(_GARBLED_RE.findall(text)) / len(text) if text else 0.0
+
+def is_usable(text):
+    return bool(text.strip()) and garbled_fraction(text) <= MAX_GARBLED_FRACTION
+
+def backends_for(file_type):
+    if file_type == PDF_TYPE:
+        return PDF_BACKENDS
+    elif file_type == DOCX_TYPE:
+        return DOCX_BACKENDS
+    return []
+
+def extract_text_detailed(file_type, data, max_pages=None, max_chars=None, stop_skills=None, backends=None):
+    # data is a source: bytes or a file path.  Returns (text, backend name).  Backends are tried in order until one
+    # gives usable text; if none does, the least garbled non-empty output
+    # wins, and if every backend raised, the first error is re-raised.
+    best = None
+    first_error = None
+    for name in backends or backends_for(file_type):
+        backend = BACKENDS[name]
+        try:
+            with track(f"backend:{name}", bytes=source_size(data)) as span:
+                text = join_pages(counted(backend.iter_pages(data), span, "pages"), backend.sep,
+                                  max_pages if backend.file_type == PDF_TYPE else None, max_chars, stop_skills)
+                span.add(chars=len(text))
+        except Exception as e:
+            REGISTRY.inc("extraction_fallbacks", backend=name, reason="error")
+            first_error = first_error or e
+            continue
+        if is_usable(text):
+            REGISTRY.inc("extraction_backend", backend=name)
+            return text, name
+        REGISTRY.inc("extraction_fallbacks", backend=name, reason="garbled" if text.strip() else "empty")
+        if text.strip() and (best is None or garbled_fraction(text) < garbled_fraction(best[0])):
+            best = (text, name)
+    if best is not None:
+        REGISTRY.inc("extraction_backend", backend=best[1])
+        return best
+    if first_error is not None:
+        raise first_error
+    return "", None
+
+def extract_text_from_pdf_bytes(data, max_pages=None, max_chars=None, stop_skills=None):
+    with track("extract_text_from_pdf", bytes=source_size(data)):
+        return extract_text_detailed(PDF_TYPE, data, max_pages, max_chars, stop_skills)[0]
+
+def extract_text_from_docx_bytes(data, max_chars=None, stop_skills=None):
+    with track("extract_text_from_docx", bytes=source_size(data)):
+        return extract_text_detailed(DOCX_TYPE, data, None, max_chars, stop_skills)[0]
+
+def extract_text(file_type, data, max_pages=None, max_chars=None, stop_skills=None):
+    if file_type == PDF_TYPE:
+        return extract_text_from_pdf_bytes(data, max_pages, max_chars, stop_skills)
+    elif file_type == DOCX_TYPE:
+        return extract_text_from_docx_bytes(data, max_chars, stop_skills)
+    else:
+        return ""
+
+def budget_tag(max_pages=None, max_chars=None, stop_skills=None):
+    # Partial extractions are cached under their own version so they are
+    # never served where the full text is expected.
+    tag = ""
+    if max_pages:
+        tag += f"+pages:{max_pages}"
+    if max_chars:
+        tag += f"+chars:{max_chars}"
+    if stop_skills:
+        # Hash every spelling the skills match, so a taxonomy change also
+        # changes where extraction stops.
+        taxonomy = get_default_taxonomy()
+        skills = "\n".join(sorted({form.lower() for s in stop_skills for form in taxonomy.surface_forms(s)}))
+        tag += "+stop:" + hashlib.sha1(skills.encode("utf-8")).hexdigest()[:16]
+    return tag
+
+def extractor_version(file_type, max_pages=None, max_chars=None, stop_skills=None):
+    if file_type == PDF_TYPE:
+        return chain_version(tuple(PDF_BACKENDS)) + budget_tag(max_pages, max_chars, stop_skills)
+    elif file_type == DOCX_TYPE:
+        return chain_version(tuple(DOCX_BACKENDS)) + budget_tag(None, max_chars, stop_skills)
+    else:
+        return "none"
+
+def extract_text_cached(file_type, data, cache, max_pages=None, max_chars=None, stop_skills=None):
+    with track("parse_resume", bytes=source_size(data)):
+        digest = source_digest(data)
+        version = extractor_version(file_type, max_pages, max_chars, stop_skills)
+        text = cache.get(digest, version)
+        if text is None:
+            text = extract_text(file_type, data, max_pages, max_chars, stop_skills)
+            cache.put(digest, version, text)
+        return text
+
+# -------------------- Parallel Extraction -------------------- #
+def extract_texts_parallel(items, max_workers=None, timeout=None, cache=None,
+                           max_pages=None, max_chars=None, stop_skills=None):
+    # items: list of (file_type, data) pairs.
+    # Returns (texts, errors): texts in the same order as items, with "" for
+    # files that failed or timed out, and errors mapping index -> message.
+    # With a cache, only files whose bytes haven't been seen before are parsed.
+    # Files go through an ExtractionPool, one calling thread per worker, so
+    # each gets its full timeout from when it starts and a stuck file is
+    # killed without taking the files behind it down too.
+    items = list(items)
+    texts = [""] * len(items)
+    errors = {}
+    with track("extract_texts_parallel", items=len(items), bytes=sum(source_size(data) for _, data in items)):
+        with ExtractionPool(min(max_workers or DEFAULT_WORKERS, len(items) or 1), timeout, cache,
+                            max_pages, max_chars, stop_skills) as pool, ThreadPoolExecutor(pool.workers) as threads:
+            futures = [threads.submit(pool.extract, file_type, data) for file_type, data in items]
+            for i, future in enumerate(futures):
+                try:
+                    texts[i] = future.result()
+                except Exception as e:
+                    errors[i] = str(e)
+    return texts, errors
+
+class ExtractionPool:
+    # A process pool that pipeline threads share, one file per call.  With
+    # no more calling threads than workers, every file starts as soon as it
+    # is submitted, so `timeout` is a true per-file limit.  Every file is
+    # parsed in a worker, so a hanging or crashing parser never takes the
+    # calling process with it.  A timeout restarts the pool, freeing the
+    # stuck worker; files other threads had in flight are resubmitted with a
+    # fresh window.  extractor is the function run in the workers.
+    POLL = 0.1
+
+    def __init__(self, max_workers=None, timeout=None, cache=None,
+                 max_pages=None, max_chars=None, stop_skills=None, extractor=None):
+        self.workers = max(1, max_workers or DEFAULT_WORKERS)
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.cache = cache
+        self.budget = (max_pages, max_chars, list(stop_skills) if stop_skills else None)
+        self.extractor = extractor or extract_text_detailed
+        self._pool = None
+        self._generation = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def extract(self, file_type, data):
+        # Raises on failure; a timeout is reported as RuntimeError.
+        with track("parse_resume", bytes=source_size(data)):
+            return self._extract(file_type, data)
+
+    def _extract(self, file_type, data):
+        if self.cache is not None:
+            key = (source_digest(data), extractor_version(file_type, *self.budget))
+            text = self.cache.get(*key)
+            if text is not None:
+                return text
+        with spooled(data) as source:
+            text, backend = self._run((file_type, source) + self.budget)
+        if backend:
+            REGISTRY.inc("extraction_backend", backend=backend)
+        if self.cache is not None:
+            self.cache.put(*key, text)
+        return text
+
+    def _run(self, args):
+        while True:
+            pool, generation = self._get_pool()
+            result = pool.apply_async(self.extractor, args)
+            deadline = time.monotonic() + self.timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    return result.get(min(self.POLL, max(remaining, 0)))
+                except multiprocessing.TimeoutError:
+                    if self._generation != generation:
+                        break  # another file's timeout restarted the pool
+                    if remaining <= 0:
+                        self._restart(generation)
+                        raise RuntimeError(f"timed out after {self.timeout:g}s")
+
+    def _get_pool(self):
+        # Started on the first cache miss, so fully cached batches never
+        # pay for spawning workers.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("extraction pool is closed")
+            if self._pool is None:
+                self._pool = multiprocessing.get_context("spawn").Pool(processes=self.workers)
+            return self._pool, self._generation
+
+    def _restart(self, generation):
+        # Kills every worker, including the stuck one; the next call starts
+        # a fresh pool.  A no-op if another thread already restarted it.
+        with self._lock:
+            if self._generation != generation or self._pool is None:
+                return
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._generation += 1
+
+    def close(self):
+        # Threads with a file in flight see the generation change on their
+        # next poll and fail with "closed" instead of waiting out the timeout.
+        with self._lock:
+            self._closed = True
+            self._generation += 1
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,103 @@
+# Fuzzy skill lookup over a resume's vocabulary.
+# The resume is split into words once and deduplicated; each skill is then
+# checked against that vocabulary instead of re-running difflib over every
+# word of the text for every skill.
+#
+# Two methods are available:
+#   "ratio"   - exactly the original fuzzy_match semantics (difflib
+#               SequenceMatcher ratio >= threshold against any word), with
+#               length and quick_ratio pruning so most words are never
+#               compared in full.
+#   "trigram" - Dice similarity of padded character trigrams, answered from
+#               an inverted trigram index so only words sharing a trigram
+#               with the skill are looked at.
+
+import difflib
+import os
+from collections import defaultdict
+
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_METHOD = os.getenv("RESUME_FUZZY_METHOD", "ratio")
+
+def trigrams(word):
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _length_window(n, threshold):
+    # 2 * min(a, b) / (a + b) bounds both difflib's ratio and the Dice
+    # coefficient, so only lengths within this window can reach threshold.
+    if threshold <= 0:
+        return 0, float("inf")
+    lo = threshold * n / (2 - threshold)
+    hi = (2 - threshold) * n / threshold
+    # Widen slightly so float rounding never drops a word exactly on the edge.
+    return lo - 1e-9, hi + 1e-9
+
+class FuzzyIndex:
+    def __init__(self, text=None, vocabulary=None):
+        self.vocabulary = set(vocabulary) if vocabulary is not None else set(text.lower().split())
+        self._by_length = defaultdict(list)
+        for word in self.vocabulary:
+            self._by_length[len(word)].append(word)
+        self._trigram_index = None
+        self._memo = {}
+
+    def _build_trigram_index(self):
+        self._trigram_sizes = {}
+        self._trigram_index = defaultdict(list)
+        for word in self.vocabulary:
+            grams = trigrams(word)
+            self._trigram_sizes[word] = len(grams)
+            for gram in grams:
+                self._trigram_index[gram].append(word)
+
+    def contains(self, term, threshold=DEFAULT_THRESHOLD, method=DEFAULT_METHOD):
+        term = term.lower()
+        key = (term, threshold, method)
+        if key not in self._memo:
+            if term in self.vocabulary and threshold <= 1:
+                self._memo[key] = True
+            else:
+                self._memo[key] = next(self._iter_matches(term, threshold, method), None) is not None
+        return self._memo[key]
+
+    def matches(self, term, threshold=DEFAULT_THRESHOLD, method=DEFAULT_METHOD):
+        # All vocabulary words that fuzzy-match term.
+        return list(self._iter_matches(term.lower(), threshold, method))
+
+    def _iter_matches(self, term, threshold, method):
+        if method == "ratio":
+            return self._iter_ratio(term, threshold)
+        elif method == "trigram":
+            return self._iter_trigram(term, threshold)
+        else:
+            raise ValueError(f"Unknown fuzzy match method: {method!r}")
+
+    def _iter_ratio(self, term, threshold):
+        lo, hi = _length_window(len(term), threshold)
+        # The skill is always seq2 so difflib caches its index once.
+        matcher = difflib.SequenceMatcher(None, "", term)
+        for length, words in self._by_length.items():
+            if length < lo or length > hi:
+                continue
+            for word in words:
+                matcher.set_seq1(word)
+                if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
+                    yield word
+
+    def _iter_trigram(self, term, threshold):
+        if self._trigram_index is None:
+            self._build_trigram_index()
+        grams = trigrams(term)
+        lo, hi = _length_window(len(grams), threshold)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for word in self._trigram_index.get(gram, ()):
+                overlap[word] += 1
+        for word, shared in overlap.items():
+            size = self._trigram_sizes[word]
+            if lo <= size <= hi and 2 * shared / (size + len(grams)) >= threshold:
+                yield word
+
+def fuzzy_match(term, text, threshold=DEFAULT_THRESHOLD, method=DEFAULT_METHOD):
+    return FuzzyIndex(text).contains(term, threshold, method)
@@ -0,0 +1,241 @@
+# In-process metrics for the hot paths: parsing, extraction, skill scoring,
+# JD similarity and AI summaries.
+# Each stage records per-call wall time (as a histogram), the bytes/pages/
+# characters it processed and errors; caches count hits and misses.  The
+# registry can be dumped as JSON, served in Prometheus text format, or shown
+# in the apps' diagnostics panel.
+#
+# Metrics are per process: work done inside extraction pool workers shows up
+# as the caller's wall time, not as worker-side stages.  Set RESUME_METRICS=0
+# to turn recording off.
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.getenv("RESUME_METRICS", "1") != "0"
+DEFAULT_PORT = int(os.getenv("RESUME_METRICS_PORT", "0")) or None
+PREFIX = "resume_matcher"
+
+# Upper bounds (seconds) of the latency histogram buckets.
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class StageStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.amounts = {}
+
+    def observe(self, seconds, error, amounts):
+        self.calls += 1
+        self.errors += bool(error)
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        for unit, value in amounts.items():
+            if value:
+                self.amounts[unit] = self.amounts.get(unit, 0) + value
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 6),
+            "mean_ms": round(self.seconds / self.calls * 1000, 3) if self.calls else None,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "buckets": {str(bound): n for bound, n in zip(BUCKETS, self.buckets)},
+            **self.amounts,
+        }
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+
+    def observe(self, stage, seconds, error=False, **amounts):
+        # amounts: e.g. bytes=, pages=, chars=, items= processed by the call.
+        if not ENABLED:
+            return
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.observe(seconds, error, amounts)
+
+    def inc(self, name, value=1, **labels):
+        if not ENABLED:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def cache_result(self, cache, hit):
+        self.inc("cache_requests", cache=cache, result="hit" if hit else "miss")
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "stages": {stage: stats.as_dict() for stage, stats in sorted(self._stages.items())},
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+            }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            stages = sorted(self._stages.items())
+            counters = sorted(self._counters.items())
+        name = f"{PREFIX}_stage_seconds"
+        lines += [f"# HELP {name} Wall time per call of each instrumented stage.", f"# TYPE {name} histogram"]
+        for stage, stats in stages:
+            cumulative = 0
+            for bound, n in zip(BUCKETS, stats.buckets):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {stats.calls}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats.seconds!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats.calls}')
+        name = f"{PREFIX}_stage_errors_total"
+        lines += [f"# HELP {name} Calls that raised.", f"# TYPE {name} counter"]
+        lines += [f'{name}{{stage="{stage}"}} {stats.errors}' for stage, stats in stages]
+        units = sorted({unit for _, stats in stages for unit in stats.amounts})
+        for unit in units:
+            name = f"{PREFIX}_stage_{unit}_total"
+            lines += [f"# HELP {name} {unit.capitalize()} processed by each stage.", f"# TYPE {name} counter"]
+            lines += [f'{name}{{stage="{stage}"}} {stats.amounts[unit]}'
+                      for stage, stats in stages if unit in stats.amounts]
+        seen = set()
+        for (counter, labels), value in counters:
+            name = f"{PREFIX}_{counter}_total"
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+class Span:
+    # Handed out by track(); add() amounts as they become known.
+    def __init__(self, amounts):
+        self.amounts = dict(amounts)
+        self.error = False
+
+    def add(self, **amounts):
+        for unit, value in amounts.items():
+            self.amounts[unit] = self.amounts.get(unit, 0) + value
+
+@contextmanager
+def track(stage, registry=None, **amounts):
+    span = Span(amounts)
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException:
+        span.error = True
+        raise
+    finally:
+        (registry or REGISTRY).observe(stage, time.perf_counter() - start, span.error, **span.amounts)
+
+def counted(iterable, span, unit):
+    # Passes items through, adding one `unit` to the span per item.
+    for item in iterable:
+        span.add(**{unit: 1})
+        yield item
+
+# -------------------- Export -------------------- #
+def dump(path, registry=None):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write((registry or REGISTRY).to_json(indent=2))
+
+def _make_handler(registry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") in ("", "/metrics"):
+                body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = registry.to_json(indent=2), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+    return MetricsHandler
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_http_server(port=None, host="127.0.0.1", registry=None):
+    # Serves /metrics (Prometheus text) and /metrics.json on a background
+    # thread.  Idempotent, since Streamlit re-runs the calling script.
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port or DEFAULT_PORT or 0), _make_handler(registry or REGISTRY))
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
+
+def serve_from_env():
+    # Starts the endpoint when RESUME_METRICS_PORT is set.
+    if DEFAULT_PORT:
+        return start_http_server(DEFAULT_PORT)
+    return None
+
+# -------------------- Streamlit -------------------- #
+def render_diagnostics_panel(registry=None):
+    # Optional panel for the apps; call inside a sidebar expander.  pandas
+    # is imported once there is a table to show, so an empty panel doesn't
+    # add it to a cold start.
+    import streamlit as st
+
+    registry = registry or REGISTRY
+    snapshot = registry.snapshot()
+    if not snapshot["stages"]:
+        st.caption("No instrumented calls yet.")
+    else:
+        import pandas as pd
+
+        rows = [{"Stage": stage, **{k: v for k, v in stats.items() if k != "buckets"}}
+                for stage, stats in snapshot["stages"].items()]
+        st.dataframe(pd.DataFrame(rows))
+    caches = [c for c in snapshot["counters"] if c["name"] == "cache_requests"]
+    if caches:
+        import pandas as pd
+
+        hits = {}
+        for c in caches:
+            hits.setdefault(c["labels"]["cache"], {"hit": 0, "miss": 0})[c["labels"]["result"]] = c["value"]
+        st.dataframe(pd.DataFrame([{"Cache": cache, "Hits": n["hit"], "Misses": n["miss"]}
+                                   for cache, n in sorted(hits.items())]))
+    st.download_button("Download metrics (JSON)", registry.to_json(indent=2), file_name="metrics.json",
+                       mime="application/json")
+    if st.button("Reset metrics"):
+        registry.reset()
@@ -0,0 +1,108 @@
+# Threaded producer/consumer pipeline for the Streamlit apps.
+# Every stage runs in its own worker threads and passes records to the next
+# through a bounded queue, so extraction, scoring and summarising overlap and
+# the caller gets each record as soon as it has cleared every stage, instead
+# of waiting for the whole batch.  The bounded queues also cap how far a fast
+# stage can run ahead of a slow one.
+
+import queue
+import threading
+import time
+
+_DONE = object()
+
+def iter_pipeline(records, stages, queue_size=32):
+    # records: iterable of dicts; stages: list of (fn, workers).  fn(record)
+    # runs in a worker thread and updates the record in place.  An exception
+    # is stored in record["Error"] and the record skips the remaining stages.
+    # Yields records in completion order.  Closing the generator early (e.g.
+    # a Streamlit rerun) stops the workers.
+    stop = threading.Event()
+    lock = threading.Lock()
+    queues = [queue.Queue(queue_size) for _ in range(len(stages) + 1)]
+    remaining = [workers for _, workers in stages]
+
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def feed():
+        try:
+            for record in records:
+                if not put(queues[0], record):
+                    return
+        finally:
+            for _ in range(stages[0][1]):
+                put(queues[0], _DONE)
+
+    def work(k, fn):
+        while True:
+            record = get(queues[k])
+            if record is _DONE:
+                break
+            if record.get("Error") is None:
+                try:
+                    fn(record)
+                except Exception as e:
+                    record["Error"] = str(e)
+            if not put(queues[k + 1], record):
+                return
+        # The last worker out of a stage tells the next stage to finish.
+        with lock:
+            remaining[k] -= 1
+            last = remaining[k] == 0
+        if last:
+            for _ in range(stages[k + 1][1] if k + 1 < len(stages) else 1):
+                put(queues[k + 1], _DONE)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for k, (fn, workers) in enumerate(stages):
+        threads += [threading.Thread(target=work, args=(k, fn), daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            record = get(queues[-1])
+            if record is _DONE:
+                break
+            yield record
+    finally:
+        stop.set()
+
+class Throughput:
+    # Progress readout for a stream of `total` records.
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+        self.first = None
+
+    def update(self, n=1):
+        self.done += n
+        if self.first is None:
+            self.first = time.perf_counter() - self.start
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 1.0
+
+    def __str__(self):
+        elapsed = time.perf_counter() - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        text = f"{self.done}/{self.total} resumes · {rate:.1f}/s"
+        if self.first is not None:
+            text += f" · first result after {self.first * 1000:.0f} ms"
+        return text
@@ -0,0 +1,48 @@
+# Top-K candidate ranking.
+# Scores stream into a bounded min-heap, so only the best K results are ever
+# kept and ordering them costs O(n log K) instead of sorting the whole pool.
+
+import heapq
+import itertools
+import math
+
+class TopK:
+    def __init__(self, k):
+        self.k = k
+        self.seen = 0
+        self._heap = []
+        self._counter = itertools.count()
+
+    def push(self, score, item):
+        # Among equal scores the earlier item wins, like a stable sort.
+        self.seen += 1
+        if self.k <= 0:
+            return
+        entry = (score, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def items(self):
+        # Best first.
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+def top_k(scored, k):
+    # scored: iterable of (score, item) pairs.
+    ranking = TopK(k)
+    for score, item in scored:
+        ranking.push(score, item)
+    return ranking.items()
+
+def page_count(total, page_size):
+    return max(1, math.ceil(total / page_size))
+
+def paginate(items, page, page_size):
+    # page is 1-based; out-of-range pages are clamped.
+    page = min(max(1, page), page_count(len(items), page_size))
+    start = (page - 1) * page_size
+    return items[start:start + page_size]
@@ -0,0 +1,162 @@
+# Columnar result store for large candidate pools.
+# Instead of a dict per candidate holding a {skill: "🟢"/"🔴"} table, results
+# are kept as arrays: a uint8 hit matrix (candidates x skills), float32 score
+# columns and the candidate's path as its ID.  Errors, duplicates and AI
+# summaries are sparse maps, since most candidates have none of them.  Tables,
+# match levels and emoji are rendered from the arrays only when a frame is
+# built for display or export, and a whole store is written with one
+# DataFrame.to_csv / to_json call; pandas is only imported for that.
+#
+# At 50k candidates x 200 skills the hit matrix is 10 MB, where the per-row
+# dicts it replaces took millions of objects.
+
+import json
+import os
+
+import numpy as np
+
+from scoring import MATCH_MARKS
+
+COLUMNS = ["Candidate", "Path", "Skill Match %", "JD Similarity %", "Match Level", "Essential Skills",
+           "Preferred Skills", "Skills Table", "AI Summary", "Duplicate Of", "Error"]
+
+class ResultStore:
+    def __init__(self, essential_skills, preferred_skills, capacity=64):
+        self.essential_skills = list(essential_skills)
+        self.preferred_skills = list(preferred_skills)
+        self.skills = self.essential_skills + self.preferred_skills
+        self.paths = []
+        self.errors = {}
+        self.duplicate_of = {}  # row -> path of the original
+        self.summaries = {}
+        capacity = max(1, capacity)
+        self._hits = np.zeros((capacity, len(self.skills)), dtype=np.uint8)
+        self._skill_match = np.full(capacity, np.nan, dtype=np.float32)
+        self._similarity = np.full(capacity, np.nan, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def hits(self):
+        return self._hits[:len(self)]
+
+    @property
+    def skill_match(self):
+        return self._skill_match[:len(self)]
+
+    @property
+    def similarity(self):
+        return self._similarity[:len(self)]
+
+    @property
+    def nbytes(self):
+        # Array storage only; the paths and sparse maps come on top.
+        return self._hits.nbytes + self._skill_match.nbytes + self._similarity.nbytes
+
+    def _grow(self, rows):
+        if rows <= len(self._skill_match):
+            return
+        capacity = max(rows, 2 * len(self._skill_match))
+        hits = np.zeros((capacity, len(self.skills)), dtype=np.uint8)
+        hits[:len(self)] = self.hits
+        self._hits = hits
+        for name in ("_skill_match", "_similarity"):
+            column = np.full(capacity, np.nan, dtype=np.float32)
+            column[:len(self)] = getattr(self, name)[:len(self)]
+            setattr(self, name, column)
+
+    def append(self, path, hits=None, skill_match=None, error=None):
+        # Returns the new row.  A failed candidate has an error and no hits.
+        row = len(self)
+        self._grow(row + 1)
+        self.paths.append(path)
+        if hits is not None:
+            self._hits[row] = hits
+        if skill_match is not None:
+            self._skill_match[row] = skill_match
+        if error is not None:
+            self.errors[row] = error
+        return row
+
+    def extend(self, other):
+        # Appends another store's rows (e.g. a finished chunk).
+        offset = len(self)
+        self._grow(offset + len(other))
+        self.paths.extend(other.paths)
+        self._hits[offset:len(self)] = other.hits
+        self._skill_match[offset:len(self)] = other.skill_match
+        self._similarity[offset:len(self)] = other.similarity
+        for name in ("errors", "duplicate_of", "summaries"):
+            getattr(self, name).update((offset + row, value) for row, value in getattr(other, name).items())
+
+    def ok_rows(self):
+        # Rows that were scored and aren't a duplicate of another candidate.
+        return [row for row in range(len(self)) if row not in self.errors and row not in self.duplicate_of]
+
+    def skills_table(self, row):
+        # {skill: "🟢"/"🔴"} for one candidate, for display.
+        return {skill: MATCH_MARKS[hit] for skill, hit in zip(self.skills, self._hits[row].tolist())}
+
+    def _skills_json(self, rows):
+        # The skills table of each row as a JSON object, assembled from one
+        # pre-encoded fragment per skill and mark.  A skill listed twice
+        # appears once, as in evaluate_skills' dict.
+        first = {}
+        for j, skill in enumerate(self.skills):
+            first.setdefault(skill, j)
+        fragments = np.array([[json.dumps(skill, ensure_ascii=False) + ": " + json.dumps(mark, ensure_ascii=False)
+                               for mark in MATCH_MARKS] for skill in first], dtype=object).reshape(len(first), 2)
+        picked = fragments[np.arange(len(first)), self._hits[rows][:, list(first.values())]]
+        return ["{" + ", ".join(parts) + "}" for parts in picked.tolist()]
+
+    def to_frame(self, skills_table=None, collapse_duplicates=False):
+        # The batch output columns, rendered from the arrays.  skills_table:
+        # None leaves the column out, "json" renders JSON strings, "dict"
+        # dicts.  collapse_duplicates drops duplicate rows and counts them in
+        # a "Duplicates" column of their original instead.
+        import pandas as pd
+
+        n = len(self)
+        failed = np.zeros(n, dtype=bool)
+        failed[list(self.errors)] = True
+        rows = np.arange(n)
+        if collapse_duplicates:
+            rows = rows[~np.isin(rows, list(self.duplicate_of))]
+        scores = np.round(self.skill_match.astype(np.float64), 2)
+        similarity = np.round(self.similarity.astype(np.float64), 2)
+        total_essential = len(self.essential_skills)
+        essential_hits = self.hits[:, :total_essential].sum(axis=1)
+        preferred_hits = self.hits[:, total_essential:].sum(axis=1)
+        levels = np.select([scores >= 80, scores >= 60], ["🟢 High", "🟡 Medium"], "🔴 Low").astype(object)
+        levels[failed] = None
+
+        def fraction(counts, total):
+            column = pd.Series(counts).astype(str) + f"/{total}"
+            return column.where(~failed, None)
+
+        frame = pd.DataFrame({
+            "Candidate": [os.path.basename(path) for path in self.paths],
+            "Path": self.paths,
+            "Skill Match %": scores,
+            "JD Similarity %": similarity,
+            "Match Level": levels,
+            "Essential Skills": fraction(essential_hits, total_essential),
+            "Preferred Skills": fraction(preferred_hits, len(self.preferred_skills)),
+            "AI Summary": pd.Series(self.summaries, index=range(n), dtype=object) if self.summaries else None,
+            "Duplicate Of": pd.Series(self.duplicate_of, index=range(n), dtype=object) if self.duplicate_of else None,
+            "Error": pd.Series(self.errors, index=range(n), dtype=object) if self.errors else None,
+        }).iloc[rows]
+        if skills_table is not None:
+            scored = [row for row in rows.tolist() if not failed[row]]
+            tables = pd.Series(None, index=rows, dtype=object)
+            if skills_table == "json":
+                tables[scored] = self._skills_json(scored)
+            else:
+                tables[scored] = [self.skills_table(row) for row in scored]
+            frame.insert(COLUMNS.index("Skills Table"), "Skills Table", tables)
+        if collapse_duplicates:
+            counts = pd.Series(list(self.duplicate_of.values()), dtype=object).value_counts()
+            frame = frame.drop(columns="Duplicate Of")
+            frame["Duplicates"] = frame["Path"].map(counts).fillna(0).astype(int)
+        return frame.reset_index(drop=True)
@@ -1,99 +1,167 @@
 # Resume Match and Ranking Script with Authentication
 
-import pandas as pd
-from PyPDF2 import PdfReader
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 import streamlit as st
-import openai
 import os
-import io
-import difflib
+import threading
+import time
 
-# Verify and set OpenAI API Key
-api_key = st.secrets["OPENAI_API_KEY"] if "OPENAI_API_KEY" in st.secrets else os.getenv("OPENAI_API_KEY")
-if not api_key:
-    st.error("❌ Missing OpenAI API Key. Please set OPENAI_API_KEY in environment variables or .streamlit/secrets.toml")
-openai.api_key = api_key
+from ai_summary import DEFAULT_CONCURRENCY, DEFAULT_RATE_PER_MINUTE, TokenBucket, generate_ai_summaries
+from dedup import DuplicateIndex, minhash
+from extraction import (
+    DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, DEFAULT_WORKERS, PDF_TYPE, ExtractionPool, extract_text,
+    extract_text_cached,
+)
+from metrics import render_diagnostics_panel, serve_from_env
+from pipeline import Throughput, iter_pipeline
+from ranking import TopK, page_count, paginate
+from scoring import color_match_level, evaluate_skills, skill_hits, weighted_skill_score
+from similarity import calculate_similarities
+from text_cache import file_digest, get_default_cache
+
+# pandas is imported where a table is built and the OpenAI key is looked up
+# when a summary is asked for, so the login page renders without either.
+def get_api_key():
+    api_key = st.secrets["OPENAI_API_KEY"] if "OPENAI_API_KEY" in st.secrets else os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        st.error("❌ Missing OpenAI API Key. Please set OPENAI_API_KEY in environment variables or .streamlit/secrets.toml")
+    return api_key
+
+TABLE_COLUMNS = ["Candidate", "Skill Match %", "JD Similarity %", "Essential Skills", "Preferred Skills",
+                 "Match Level", "Duplicates"]
 
 # ---------------------------
 # UTILITY FUNCTIONS
 # ---------------------------
 
+# PyMuPDF first, falling back to PyPDF2 only when its output is empty or
+# garbled (see extraction.extract_text_detailed).
 def extract_text_from_pdf(uploaded_file):
-    pdf_reader = PdfReader(uploaded_file)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text() or ""
-    return text
-
-def calculate_similarity(text, jd_text):
-    vectorizer = TfidfVectorizer(stop_words='english')
-    vectors = vectorizer.fit_transform([jd_text, text])
-    return cosine_similarity(vectors[0:1], vectors[1:2])[0][0] * 100
-
-def generate_ai_summary(text):
-    prompt = f"""
-    Analyze the following resume content:
-
-    {text[:4000]}
-
-    Provide a summary with:
-    - Key strengths
-    - Weaknesses
-    - Technologies used
-    - Project experience
-    Keep it clear and concise.
-    """
+    return extract_text(PDF_TYPE, uploaded_file.getvalue(), DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS)
+
+def extract_text_from_pdf_cached(uploaded_file):
+    return extract_text_cached(PDF_TYPE, uploaded_file.getvalue(), get_default_cache(),
+                               DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS)
+
+def iter_evaluated_resumes(resume_files, essential_skills, preferred_skills, summaries=False, known=None):
+    # Streams one record per resume, in completion order, as it clears the
+    # extract -> score (-> summarise) stages.  Each text is dropped once the
+    # last stage is done with it; JD similarity reads them back from the text
+    # cache.  A near-duplicate of an earlier upload skips scoring and
+    # summarising and comes out with "_duplicate_of" set to that upload's
+    # "_index".  Extraction threads add resumes to the duplicate index in
+    # upload order, whichever finishes first, so the same uploads always
+    # keep the same originals.  Files are parsed in an ExtractionPool, one
+    # thread per worker process, so a file that hangs the parser is skipped
+    # after RESUME_EXTRACT_TIMEOUT instead of stalling the run.
+    # known maps upload digest -> {"signature", "hits": {skill: 0/1}} from
+    # earlier runs and is filled in as resumes are scored, so a rerun with an
+    # edited skill list only evaluates the new skills, and a resume needing
+    # none is never read again.
+    bucket = TokenBucket(DEFAULT_RATE_PER_MINUTE)
+    pool = ExtractionPool(min(DEFAULT_WORKERS, len(resume_files) or 1), cache=get_default_cache(),
+                          max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS)
+    duplicates = DuplicateIndex()
+    known = {} if known is None else known
+    all_skills = list(dict.fromkeys(essential_skills + preferred_skills))
+
+    # Index of the next upload to add to the duplicate index.  Uploads are
+    # taken off the queue in order, so every earlier one is already held by
+    # an extraction thread and the wait always ends.
+    turn = threading.Condition()
+    next_index = [0]
+
+    def read(record):
+        resume = record.pop("_resume")
+        record["_digest"] = digest = file_digest(resume.getvalue())
+        memo = known.setdefault(digest, {"hits": {}})
+        if summaries or "signature" not in memo or any(skill not in memo["hits"] for skill in all_skills):
+            record["_text"] = pool.extract(PDF_TYPE, resume.getvalue())
+        if "signature" not in memo:
+            memo["signature"] = minhash(record["_text"])
+        return memo["signature"]
+
+    def extract(record):
+        signature = None
+        try:
+            signature = read(record)
+        finally:
+            # A failed upload still takes its turn, with nothing to index.
+            with turn:
+                turn.wait_for(lambda: next_index[0] == record["_index"])
+                original = duplicates.add(record["_index"], signature)
+                next_index[0] += 1
+                turn.notify_all()
+        if original is not None:
+            record["_duplicate_of"] = original
+            record.pop("_text", None)
+
+    def score(record):
+        if "_duplicate_of" in record:
+            return
+        text = record["_text"] if summaries else record.pop("_text", None)
+        memo = known[record["_digest"]]["hits"]
+        missing = [skill for skill in all_skills if skill not in memo]
+        if missing:
+            memo.update(zip(missing, skill_hits(text, missing).tolist()))
+        hits = np.array([memo[skill] for skill in essential_skills + preferred_skills], dtype=np.uint8)
+        weighted_score, essential_hit, preferred_hit = weighted_skill_score(
+            hits, len(essential_skills), len(preferred_skills))
+        record.update({
+            "Skill Match %": weighted_score,
+            "Match Level": color_match_level(weighted_score),
+            "Essential Skills": f"{essential_hit}/{len(essential_skills)}",
+            "Preferred Skills": f"{preferred_hit}/{len(preferred_skills)}",
+        })
+
+    def summarize(record):
+        if "_duplicate_of" in record:
+            return
+        record["AI Summary"] = generate_ai_summaries(
+            [record.pop("_text")], api_key=api_key, concurrency=1, bucket=bucket)[0]
+
+    stages = [(extract, pool.workers), (score, 1)]
+    if summaries:
+        api_key = get_api_key()
+        stages.append((summarize, DEFAULT_CONCURRENCY))
+    records = ({
+        "Candidate": resume.name,
+        "Skill Match %": None,
+        "JD Similarity %": None,
+        "Match Level": None,
+        "Essential Skills": None,
+        "Preferred Skills": None,
+        "Duplicates": 0,
+        "Error": None,
+        "_index": i,
+        "_resume": resume,
+    } for i, resume in enumerate(resume_files))
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a professional technical recruiter."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message['content'].strip()
-    except Exception as e:
-        return f"AI Summary failed: {e}"
-
-def fuzzy_match(term, text, threshold=0.6):
-    words = text.split()
-    matches = [word for word in words if difflib.SequenceMatcher(None, word.lower(), term.lower()).ratio() >= threshold]
-    return bool(matches)
-
-def evaluate_skills(resume_text, essential_skills, preferred_skills):
-    all_skills = essential_skills + preferred_skills
-    resume_lower = resume_text.lower()
-    skill_results = {}
-    for skill in all_skills:
-        match_found = fuzzy_match(skill, resume_lower)
-        skill_results[skill] = "🟢" if match_found else "🔴"
-    essential_match = sum(skill_results[k] == "🟢" for k in essential_skills)
-    preferred_match = sum(skill_results[k] == "🟢" for k in preferred_skills)
-    total_skills = len(essential_skills) + len(preferred_skills)
-
-    # Weighted match: 70% essential, 30% preferred
-    essential_score = (essential_match / len(essential_skills)) * 70 if essential_skills else 0
-    preferred_score = (preferred_match / len(preferred_skills)) * 30 if preferred_skills else 0
-    weighted_score = round(essential_score + preferred_score, 2)
-
-    return skill_results, weighted_score, essential_match, preferred_match
-
-def color_match_level(score):
-    if score >= 80:
-        return "🟢 High"
-    elif score >= 60:
-        return "🟡 Medium"
-    else:
-        return "🔴 Low"
+        yield from iter_pipeline(records, stages, queue_size=2 * pool.workers)
+    finally:
+        pool.close()
 
 # ---------------------------
 # STREAMLIT INTERFACE
 # ---------------------------
 
+def show_candidate_details(resume, essential_skills, preferred_skills):
+    # Computed only when a candidate is expanded; text and summary both come
+    # from their caches after the first time.
+    text = extract_text_from_pdf_cached(resume)
+    import pandas as pd
+
+    skill_map, _, _, _ = evaluate_skills(text, essential_skills, preferred_skills)
+    st.markdown("**Skill Match Table:**")
+    skill_df = pd.DataFrame(list(skill_map.items()), columns=["Skill", "Match"])
+    st.dataframe(skill_df)
+    st.markdown("**🤖 AI-Generated Summary:**")
+    with st.spinner("Generating AI summary..."):
+        st.markdown(generate_ai_summaries([text], api_key=get_api_key())[0])
+
 def main():
     st.set_page_config(page_title="Secure Resume Matcher", layout="centered")
+    serve_from_env()
     st.title("🔒 Secure Resume Matcher")
 
     # Authentication logic
@@ -102,80 +170,153 @@ def main():
         password = st.text_input("Enter Password", type="password")
         submitted = st.form_submit_button("🔐 Login")
 
+    # Login and results live in session state so pagination and expanding
+    # candidates (which rerun the script) don't throw them away.
     if submitted:
-        if username == "Virat" and password == "KleisTech@123":
-            st.success("✅ Access granted. Welcome Virat!")
-
-            st.title("📄 Resume Matcher with AI Insights & Skill Scoring")
-
-            with st.sidebar:
-                st.info("Paste a Job Description and upload multiple PDF resumes.")
-                jd_text_input = st.text_area("Paste Job Description Below", height=200)
-                resume_files = st.file_uploader("Resume PDFs", type="pdf", accept_multiple_files=True)
-
-                st.markdown("---")
-                essential_input = st.text_area("Essential Skills (comma-separated, editable)", "")
-                preferred_input = st.text_area("Preferred Skills (comma-separated, editable)", "")
-
-                run_eval = st.button("🔁 Run Evaluation")
-                reset_inputs = st.button("🧹 Reset All Inputs")
-
-            if reset_inputs:
-                st.experimental_rerun()
-
-            if jd_text_input and resume_files and run_eval:
-                essential_skills = [s.strip() for s in essential_input.split(",") if s.strip()]
-                preferred_skills = [s.strip() for s in preferred_input.split(",") if s.strip()]
-
-                jd_text = jd_text_input
-                results = []
-
-                with st.spinner("Processing resumes..."):
-                    for resume in resume_files:
-                        try:
-                            text = extract_text_from_pdf(resume)
-                            ai_summary = generate_ai_summary(text)
-                            skill_map, weighted_score, essential_hit, preferred_hit = evaluate_skills(
-                                text, essential_skills, preferred_skills)
-
-                            results.append({
-                                "Candidate": resume.name,
-                                "Skill Match %": weighted_score,
-                                "Match Level": color_match_level(weighted_score),
-                                "Essential Skills": f"{essential_hit}/{len(essential_skills)}",
-                                "Preferred Skills": f"{preferred_hit}/{len(preferred_skills)}",
-                                "Skills Table": skill_map,
-                                "AI Summary": ai_summary
-                            })
-                        except Exception as e:
-                            st.error(f"Error processing {resume.name}: {e}")
-
-                if results:
-                    df = pd.DataFrame(results)
-                    st.subheader("📊 Match Summary Table")
-                    st.dataframe(df[["Candidate", "Skill Match %", "Essential Skills", "Preferred Skills", "Match Level"]].sort_values(by="Skill Match %", ascending=False))
-
-                    csv = df.drop(columns=["Skills Table", "AI Summary"]).to_csv(index=False).encode('utf-8')
-                    st.download_button(
-                        label="⬇️ Download CSV Report",
-                        data=csv,
-                        file_name="resume_match_results.csv",
-                        mime='text/csv'
-                    )
-
-                    st.subheader("🧠 Matched Skills Breakdown")
-                    for res in results:
-                        st.markdown(f"### {res['Candidate']}")
-                        st.markdown("**Skill Match Table:**")
-                        skill_df = pd.DataFrame(list(res['Skills Table'].items()), columns=["Skill", "Match"])
-                        st.dataframe(skill_df)
-
-                    st.subheader("🤖 AI-Generated Summaries")
-                    for res in results:
-                        st.markdown(f"### {res['Candidate']}")
-                        st.markdown(res['AI Summary'])
-        else:
+        st.session_state["authenticated"] = username == "Virat" and password == "KleisTech@123"
+        if not st.session_state["authenticated"]:
             st.error("❌ Access denied. Please check your credentials.")
 
+    if st.session_state.get("authenticated"):
+        st.success("✅ Access granted. Welcome Virat!")
+
+        st.title("📄 Resume Matcher with AI Insights & Skill Scoring")
+
+        with st.sidebar:
+            st.info("Paste a Job Description and upload multiple PDF resumes.")
+            jd_text_input = st.text_area("Paste Job Description Below", height=200)
+            resume_files = st.file_uploader("Resume PDFs", type="pdf", accept_multiple_files=True)
+
+            st.markdown("---")
+            essential_input = st.text_area("Essential Skills (comma-separated, editable)", "")
+            preferred_input = st.text_area("Preferred Skills (comma-separated, editable)", "")
+            top_k = st.number_input("Candidates to keep (top K)", min_value=1, max_value=100000, value=100, step=50)
+            eager_summaries = st.checkbox("Generate AI summaries during evaluation", value=False)
+
+            run_eval = st.button("🔁 Run Evaluation")
+            reset_inputs = st.button("🧹 Reset All Inputs")
+
+        if reset_inputs:
+            st.session_state.pop("ranking", None)
+            st.session_state.pop("jd_similarity", None)
+            st.experimental_rerun()
+
+        if jd_text_input and resume_files and run_eval:
+            import pandas as pd
+
+            essential_skills = [s.strip() for s in essential_input.split(",") if s.strip()]
+            preferred_skills = [s.strip() for s in preferred_input.split(",") if s.strip()]
+
+            jd_text = jd_text_input
+            # Scores stream into one TopK, which is all the table renders.
+            # The rows of every scored candidate (no texts) are kept too, for
+            # JD similarity and the CSV export.
+            ranking = TopK(top_k)
+            records = []
+            duplicate_counts = {}
+            digests = {}
+            # Per-resume skill hits from earlier runs; see iter_evaluated_resumes.
+            known = st.session_state.setdefault("resume_hits", {})
+
+            # Candidates appear in a live table as they finish; JD similarity
+            # is fitted over the whole pool once the stream is done.
+            progress = st.progress(0.0, text="Processing resumes...")
+            live = st.empty()
+            meter = Throughput(len(resume_files))
+            drawn = 0.0
+            for res in iter_evaluated_resumes(resume_files, essential_skills, preferred_skills, eager_summaries,
+                                              known):
+                meter.update()
+                error = res.pop("Error")
+                res.pop("_text", None)
+                res.pop("_resume", None)
+                digests[res["_index"]] = res.pop("_digest", None)
+                if error is not None:
+                    st.error(f"Error processing {res['Candidate']}: {error}")
+                elif "_duplicate_of" in res:
+                    original = res.pop("_duplicate_of")
+                    duplicate_counts[original] = duplicate_counts.get(original, 0) + 1
+                else:
+                    records.append(res)
+                    # Ties go to the earlier upload, as they would in a
+                    # stable sort, whatever order resumes finish in.
+                    ranking.push((res["Skill Match %"], -res["_index"]), res)
+                now = time.perf_counter()
+                if now - drawn > 0.25 or meter.done == meter.total:
+                    progress.progress(meter.fraction, text=str(meter))
+                    live.dataframe(pd.DataFrame(ranking.items()[:50], columns=TABLE_COLUMNS))
+                    drawn = now
+
+            # Back to upload order for the similarity fit and the export.
+            records.sort(key=lambda res: res["_index"])
+            for res in records:
+                res["Duplicates"] = duplicate_counts.get(res["_index"], 0)
+            indexes = [res["_index"] for res in records]
+            for digest in set(known) - set(digests.values()):
+                del known[digest]
+            # JD similarity doesn't depend on the skills, so a rerun that only
+            # edited them reuses the last fit.
+            similarity_key = (jd_text, tuple(digests[i] for i in indexes))
+            cached = st.session_state.get("jd_similarity")
+            if cached is None or cached[0] != similarity_key:
+                texts = (extract_text_from_pdf_cached(resume_files[i]) for i in indexes)
+                with st.spinner("Scoring JD similarity..."):
+                    similarities = [round(float(similarity), 2) for similarity in calculate_similarities(jd_text, texts)]
+                cached = st.session_state["jd_similarity"] = (similarity_key, similarities)
+            for res, similarity in zip(records, cached[1]):
+                res["JD Similarity %"] = similarity
+            progress.empty()
+            live.empty()
+
+            st.session_state["ranking"] = {
+                "results": ranking.items(),
+                "total": ranking.seen,
+                "csv": pd.DataFrame(records, columns=TABLE_COLUMNS + ["AI Summary"] * eager_summaries)
+                         .to_csv(index=False).encode("utf-8"),
+                "duplicates": sum(duplicate_counts.values()),
+                "essential": essential_skills,
+                "preferred": preferred_skills,
+            }
+
+        ranking = st.session_state.get("ranking")
+        if ranking and ranking["results"]:
+            import pandas as pd
+
+            results = ranking["results"]
+            st.subheader("📊 Match Summary Table")
+            caption = f"Top {len(results)} of {ranking['total']} candidates"
+            if ranking.get("duplicates"):
+                caption += f" ({ranking['duplicates']} duplicate resumes collapsed)"
+            st.caption(caption)
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+            page = st.number_input("Page", min_value=1, max_value=page_count(len(results), page_size), value=1, step=1)
+            page_results = paginate(results, page, page_size)
+            st.dataframe(pd.DataFrame(page_results, columns=TABLE_COLUMNS))
+
+            # Every scored candidate, not just the top K, in upload order.
+            st.download_button(
+                label="⬇️ Download CSV Report",
+                data=ranking["csv"],
+                file_name="resume_match_results.csv",
+                mime='text/csv'
+            )
+
+            st.subheader("🧠 Candidate Details")
+            # By upload position: two uploads can share a file name.
+            uploads = list(resume_files or [])
+            start_rank = (min(page, page_count(len(results), page_size)) - 1) * page_size
+            for rank, res in enumerate(page_results, start_rank + 1):
+                with st.expander(f"{rank}. {res['Candidate']} — {res['Skill Match %']}%"):
+                    i = res["_index"]
+                    resume = uploads[i] if i < len(uploads) and uploads[i].name == res["Candidate"] else None
+                    if resume is None:
+                        st.info("Upload this resume again to see its details.")
+                    elif st.checkbox("Show skill breakdown and AI summary", key=f"details-{i}"):
+                        show_candidate_details(resume, ranking["essential"], ranking["preferred"])
+
+        # Rendered last so it includes this run's timings.
+        with st.sidebar.expander("Diagnostics"):
+            render_diagnostics_panel()
+
 if __name__ == "__main__":
     main()
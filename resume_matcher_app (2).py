@@ -1,30 +1,13 @@
 # resume_matcher_app/app.py
 import streamlit as st
-import pandas as pd
-import fitz  # PyMuPDF
-import docx
 import os
 import re
 
-# -------------------- Helper Functions -------------------- #
-def extract_text_from_pdf(file):
-    text = ""
-    with fitz.open(stream=file.read(), filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
-
-def extract_text_from_docx(file):
-    doc = docx.Document(file)
-    return " ".join([para.text for para in doc.paragraphs])
+from extraction import extract_text
 
+# -------------------- Helper Functions -------------------- #
 def parse_resume(file):
-    if file.type == "application/pdf":
-        return extract_text_from_pdf(file)
-    elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(file)
-    else:
-        return ""
+    return extract_text(file.type, file.getvalue())
 
 def calculate_match(resume_text, essential_skills, preferred_skills, skill_experience_map):
     resume_text_lower = resume_text.lower()
@@ -85,6 +68,8 @@ if essential_input or preferred_input:
 
 # -------------------- Processing -------------------- #
 if st.button("Match Resumes") and resume_files:
+    import pandas as pd
+
     essential_skills = [s.strip() for s in essential_input.split(',') if s.strip()]
     preferred_skills = [s.strip() for s in preferred_input.split(',') if s.strip()]
 
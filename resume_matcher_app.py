@@ -1,30 +1,14 @@
 # resume_matcher_app/app.py
 import streamlit as st
-import pandas as pd
-import fitz  # PyMuPDF
-import docx
 import os
 import re
 
-# -------------------- Helper Functions -------------------- #
-def extract_text_from_pdf(file):
-    text = ""
-    with fitz.open(stream=file.read(), filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
-
-def extract_text_from_docx(file):
-    doc = docx.Document(file)
-    return " ".join([para.text for para in doc.paragraphs])
+from extraction import extract_text_cached
+from text_cache import get_default_cache
 
+# -------------------- Helper Functions -------------------- #
 def parse_resume(file):
-    if file.type == "application/pdf":
-        return extract_text_from_pdf(file)
-    elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(file)
-    else:
-        return ""
+    return extract_text_cached(file.type, file.getvalue(), get_default_cache())
 
 def calculate_match(resume_text, essential_skills, preferred_skills, skill_experience_map):
     resume_text_lower = resume_text.lower()
@@ -85,6 +69,8 @@ if essential_input or preferred_input:
 
 # -------------------- Processing -------------------- #
 if st.button("Match Resumes") and resume_files:
+    import pandas as pd
+
     essential_skills = [s.strip() for s in essential_input.split(',') if s.strip()]
     preferred_skills = [s.strip() for s in preferred_input.split(',') if s.strip()]
 
@@ -111,53 +97,53 @@ if st.button("Match Resumes") and resume_files:
 # Save this as requirements.txt in the same folder as app.py
 
 # streamlit and its dependencies
-streamlit
+# streamlit
 
 # resume parsing and document support
-pandas
-PyMuPDF
-python-docx
+# pandas
+# PyMuPDF
+# python-docx
 
 # -------------------- .streamlit/config.toml -------------------- #
 # Optional UI settings (create a .streamlit folder and save this as config.toml)
-[server]
-headless = true
-enableCORS = false
+# [server]
+# headless = true
+# enableCORS = false
 
-[theme]
-primaryColor = "#4CAF50"
-backgroundColor = "#FFFFFF"
-secondaryBackgroundColor = "#F0F2F6"
-textColor = "#262730"
-font = "sans serif"
+# [theme]
+# primaryColor = "#4CAF50"
+# backgroundColor = "#FFFFFF"
+# secondaryBackgroundColor = "#F0F2F6"
+# textColor = "#262730"
+# font = "sans serif"
 
 # -------------------- README.md -------------------- #
 # Save this as README.md in the root folder
 
 # 📄 Resume Matcher App
-This web app allows recruiters to match multiple resumes to a job description using essential and preferred skills, with weighting and experience adjustment.
+# This web app allows recruiters to match multiple resumes to a job description using essential and preferred skills, with weighting and experience adjustment.
 
 ## Features
-- Upload multiple PDF/DOCX resumes
-- Input essential and preferred skills
-- Provide years of experience per skill
-- See match % and color-coded scores
+# - Upload multiple PDF/DOCX resumes
+# - Input essential and preferred skills
+# - Provide years of experience per skill
+# - See match % and color-coded scores
 
 ## How to Run
-1. Clone the repo:
-```bash
-git clone https://github.com/yourusername/resume-matcher-app
-cd resume-matcher-app
-```
-
-2. Install dependencies:
-```bash
-pip install -r requirements.txt
-```
-
-3. Run the app:
-```bash
-streamlit run app.py
-```
-
-Or deploy directly on [Streamlit Cloud](https://streamlit.io/cloud).
+# 1. Clone the repo:
+# ```bash
+# git clone https://github.com/yourusername/resume-matcher-app
+# cd resume-matcher-app
+# ```
+
+# 2. Install dependencies:
+# ```bash
+# pip install -r requirements.txt
+# ```
+
+# 3. Run the app:
+# ```bash
+# streamlit run app.py
+# ```
+
+# Or deploy directly on [Streamlit Cloud](https://streamlit.io/cloud).
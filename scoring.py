@@ -0,0 +1,66 @@
+# Skill scoring shared by the ranking scripts and the batch CLI.
+# Skills in the taxonomy are matched by canonical ID, so aliases count and
+# there is no fuzzy comparison; only skills it doesn't know fall back to the
+# fuzzy lookup.
+
+import numpy as np
+
+from fuzzy_matcher import DEFAULT_METHOD, FuzzyIndex
+from metrics import track
+from skill_matcher import compiled_matcher
+
+MATCH_MARKS = ("🔴", "🟢")
+
+def evaluate_skills(resume_text, essential_skills, preferred_skills, fuzzy_method=DEFAULT_METHOD):
+    with track("evaluate_skills", chars=len(resume_text), skills=len(essential_skills) + len(preferred_skills)):
+        return _evaluate_skills(resume_text, essential_skills, preferred_skills, fuzzy_method)
+
+def _evaluate_skills(resume_text, essential_skills, preferred_skills, fuzzy_method):
+    hits = _skill_hits(resume_text, essential_skills + preferred_skills, fuzzy_method)
+    skill_results = skill_table(hits, essential_skills + preferred_skills)
+    weighted_score, essential_match, preferred_match = weighted_skill_score(hits, len(essential_skills), len(preferred_skills))
+    return skill_results, weighted_score, essential_match, preferred_match
+
+def skill_hits(resume_text, skills, fuzzy_method=DEFAULT_METHOD):
+    # uint8 vector, 1 where the resume has skills[j]: the compact form of
+    # evaluate_skills' table, for callers that keep many candidates.
+    with track("evaluate_skills", chars=len(resume_text), skills=len(skills)):
+        return _skill_hits(resume_text, skills, fuzzy_method)
+
+def _skill_hits(resume_text, skills, fuzzy_method):
+    matcher = compiled_matcher(tuple(skills))
+    matched = matcher.matched(resume_text)
+    resume_index = None
+    hits = np.zeros(len(skills), dtype=np.uint8)
+    for j, skill in enumerate(skills):
+        if matcher.taxonomy.known(skill):
+            hits[j] = skill in matched
+        else:
+            if resume_index is None:
+                resume_index = FuzzyIndex(resume_text)
+            hits[j] = resume_index.contains(skill, method=fuzzy_method)
+    return hits
+
+def weighted_skill_score(hits, total_essential, total_preferred):
+    # hits over essential + preferred skills, in that order.  Returns
+    # (weighted score, essential hits, preferred hits).
+    essential_match = int(hits[:total_essential].sum())
+    preferred_match = int(hits[total_essential:total_essential + total_preferred].sum())
+
+    # Weighted match: 70% essential, 30% preferred
+    essential_score = (essential_match / total_essential) * 70 if total_essential else 0
+    preferred_score = (preferred_match / total_preferred) * 30 if total_preferred else 0
+    weighted_score = round(essential_score + preferred_score, 2)
+    return weighted_score, essential_match, preferred_match
+
+def skill_table(hits, skills):
+    # {skill: "🟢"/"🔴"}, for display.
+    return {skill: MATCH_MARKS[hit] for skill, hit in zip(skills, hits.tolist())}
+
+def color_match_level(score):
+    if score >= 80:
+        return "🟢 High"
+    elif score >= 60:
+        return "🟡 Medium"
+    else:
+        return "🔴 Low"
@@ -0,0 +1,111 @@
+# Resume section segmentation.
+# A heading is a line of its own naming a known section ("WORK EXPERIENCE",
+# "Technical Skills:", "Education & Training"), optionally followed by a
+# colon and the section's first line.  One compiled regex finds every heading
+# in a single pass, so segmenting stays linear in the length of the resume.
+#
+# JD similarity, AI summaries and the candidate index read a resume through
+# relevant_text(), which leaves out the sections that carry no signal about
+# the candidate's work: references, contact and personal details, hobbies,
+# declarations, and the name/address block above the first heading when it
+# is short.  Everything else is kept, including text under headings the
+# segmenter doesn't know, so an unusual layout loses nothing.  A resume with
+# no recognised heading is used whole.  RESUME_SECTIONS=0 turns this off.
+
+import os
+import re
+
+ENABLED = os.getenv("RESUME_SECTIONS", "1") != "0"
+
+HEADINGS = {
+    "summary": ["summary", "professional summary", "career summary", "profile", "professional profile",
+                "personal profile", "objective", "career objective", "about me", "overview"],
+    "experience": ["experience", "work experience", "professional experience", "relevant experience",
+                   "employment", "employment history", "work history", "career history"],
+    "skills": ["skills", "technical skills", "key skills", "core skills", "skills and tools",
+               "core competencies", "competencies", "technologies", "tech stack"],
+    "education": ["education", "education and training", "academic background", "qualifications",
+                  "academic qualifications", "certifications", "certificates", "training"],
+    "projects": ["projects", "key projects", "selected projects", "personal projects", "academic projects",
+                 "side projects", "portfolio"],
+    "references": ["references", "referees"],
+    "contact": ["contact", "contact details", "contact information", "personal details",
+                "personal information", "address"],
+    "interests": ["interests", "hobbies", "hobbies and interests", "extracurricular activities"],
+    "declaration": ["declaration"],
+}
+RELEVANT = ("summary", "experience", "skills", "education", "projects")
+BOILERPLATE = ("references", "contact", "interests", "declaration")
+# Text above the first heading longer than this is kept: it is probably an
+# unlabelled summary rather than a name and address.
+HEADER_CHARS = 400
+
+_KINDS = {name: kind for kind, names in HEADINGS.items() for name in names}
+
+def _pattern(name):
+    return r"[ \t]+".join(r"(?:&|and)" if word == "and" else re.escape(word) for word in name.split())
+
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:[#*•▪■\-–][ \t]*)?(?P<name>"
+    + "|".join(_pattern(name) for name in sorted(_KINDS, key=len, reverse=True))
+    + r")[ \t]*(?::|$)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+def _kind(heading):
+    return _KINDS[" ".join(heading.lower().replace("&", "and").split())]
+
+def find_sections(text):
+    # [(kind, start, end)] in text order, covering the whole text.  The part
+    # before the first heading is ("header", 0, start); a heading belongs to
+    # the section it opens.
+    sections = []
+    start, kind = 0, "header"
+    for match in _HEADING_RE.finditer(text):
+        if match.start() > start or kind != "header":
+            sections.append((kind, start, match.start()))
+        start, kind = match.start(), _kind(match.group("name"))
+    sections.append((kind, start, len(text)))
+    return sections
+
+def relevant_text(text, enabled=None):
+    # text without its boilerplate sections (see above), or text itself when
+    # no heading is recognised or filtering is off.
+    if not (ENABLED if enabled is None else enabled):
+        return text
+    sections = find_sections(text)
+    if len(sections) == 1:
+        return text
+    kept = [text[start:end] for kind, start, end in sections
+            if kind not in BOILERPLATE and not (kind == "header" and end - start <= HEADER_CHARS)]
+    return "".join(kept)
+
+def section_texts(text):
+    # {kind: text} for the RELEVANT kinds that occur, plus a "header" that
+    # relevant_text would keep, each kind's sections joined in order; {}
+    # when no heading is recognised.
+    sections = find_sections(text)
+    if len(sections) == 1:
+        return {}
+    texts = {}
+    for kind, start, end in sections:
+        if kind in RELEVANT or (kind == "header" and end - start > HEADER_CHARS):
+            texts[kind] = texts.get(kind, "") + text[start:end]
+    return texts
+
+def excerpt(text, limit, order=("header", "summary", "experience", "projects", "skills", "education")):
+    # At most limit characters of text for a prompt: its relevant sections
+    # in `order`, each given an equal share of the budget and short ones
+    # leaving the rest to the others, or text[:limit] without headings.
+    texts = section_texts(text) if ENABLED else {}
+    if not texts:
+        return text[:limit]
+    parts = [texts[kind].strip() for kind in order if kind in texts and texts[kind].strip()]
+    if not parts:
+        return text[:limit]
+    shares = {}
+    remaining = limit - 2 * (len(parts) - 1)
+    for k, i in enumerate(sorted(range(len(parts)), key=lambda i: len(parts[i]))):
+        shares[i] = min(len(parts[i]), max(0, remaining) // (len(parts) - k))
+        remaining -= shares[i]
+    return "\n\n".join(part[:shares[i]] for i, part in enumerate(parts))
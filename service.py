@@ -0,0 +1,461 @@
+# Headless HTTP service for the ATS and other integrations (no Streamlit):
+#
+#   python service.py --port 8080 [--workers 4] [--batch-ms 10]
+#
+#   POST /extract  {"resumes": [{"name": "a.pdf", "content": "<base64>"}]}
+#   POST /score    {"resumes": [...], "essential": [...], "preferred": [...],
+#                   "years": {"Python": 3}, "years_from_text": false}
+#   POST /rank     as /score, plus "jd": "..." and optionally "top_k": 100
+#   GET  /health, GET /metrics
+#
+# A resume is {"name", "content"} (base64 file bytes, typed by "type" or the
+# name's extension) or {"name", "text"} for text that is already extracted.
+# Skills may be a list or a comma-separated string.
+#
+# Requests are served by one asyncio loop.  Files are parsed by a shared
+# ExtractionPool (worker processes, text cache, per-file timeout), so the
+# loop never blocks on a parser.  Scoring goes through a batcher: calls with
+# the same skills (and, for /rank, the same JD) that arrive within the
+# batching window are scored together on a single scoring thread, sharing
+# one skill automaton, one match per distinct resume and one TF-IDF fit over
+# their combined resumes.
+
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from extraction import (
+    DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, DEFAULT_TIMEOUT, DEFAULT_WORKERS, DOCX_TYPE, PDF_TYPE, ExtractionPool,
+)
+from experience import experience_years
+from metrics import REGISTRY, track
+from ranking import TopK
+from similarity import calculate_similarities
+from skill_matcher import compiled_matcher, found_hit_matrix, score_hit_matrix, skill_years_matrix
+from text_cache import get_default_cache
+
+BATCH_WINDOW = float(os.getenv("RESUME_SERVICE_BATCH_MS", "10")) / 1000
+MAX_BATCH = int(os.getenv("RESUME_SERVICE_MAX_BATCH", "64"))
+MAX_BODY = int(float(os.getenv("RESUME_SERVICE_MAX_MB", "64")) * 1024 * 1024)
+
+FILE_TYPES = {".pdf": PDF_TYPE, ".docx": DOCX_TYPE}
+TYPE_NAMES = {"pdf": PDF_TYPE, "docx": DOCX_TYPE, PDF_TYPE: PDF_TYPE, DOCX_TYPE: DOCX_TYPE}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# -------------------- Request bodies -------------------- #
+def parse_skills(value):
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple)):
+        raise HTTPError(400, "skills must be a list or a comma-separated string")
+    return list(dict.fromkeys(s.strip() for s in map(str, value) if s.strip()))
+
+def parse_resume(entry, position):
+    # Returns (name, file_type, data) for a file, or (name, None, text).
+    if not isinstance(entry, dict):
+        raise HTTPError(400, f"resumes[{position}] must be an object")
+    name = str(entry.get("name") or f"resume_{position}")
+    if "text" in entry:
+        return name, None, str(entry["text"])
+    if "content" not in entry:
+        raise HTTPError(400, f"resumes[{position}] needs 'content' (base64) or 'text'")
+    file_type = TYPE_NAMES.get(str(entry.get("type", "")).lower()) or FILE_TYPES.get(os.path.splitext(name)[1].lower())
+    if file_type is None:
+        raise HTTPError(400, f"resumes[{position}]: unknown file type; set 'type' to 'pdf' or 'docx'")
+    try:
+        data = base64.b64decode(entry["content"], validate=True)
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPError(400, f"resumes[{position}]: 'content' is not valid base64")
+    return name, file_type, data
+
+def parse_job(body, endpoint):
+    # The skill/JD part of a /score or /rank body.
+    job = {
+        "essential": parse_skills(body.get("essential", [])),
+        "preferred": parse_skills(body.get("preferred", [])),
+        "years_from_text": bool(body.get("years_from_text", False)),
+    }
+    if not job["essential"] and not job["preferred"]:
+        raise HTTPError(400, "give at least one essential or preferred skill")
+    years = body.get("years") or {}
+    if not isinstance(years, dict):
+        raise HTTPError(400, "'years' must map skills to numbers")
+    try:
+        job["years"] = {str(skill): float(value) for skill, value in years.items()}
+    except (TypeError, ValueError):
+        raise HTTPError(400, "'years' must map skills to numbers")
+    if endpoint == "rank":
+        job["jd"] = str(body.get("jd") or "")
+        if not job["jd"].strip():
+            raise HTTPError(400, "/rank needs a 'jd'")
+        top_k = body.get("top_k")
+        # bool is an int subclass, but JSON true/false is not a count.
+        if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+            raise HTTPError(400, "'top_k' must be a positive integer")
+        job["top_k"] = top_k
+    return job
+
+# -------------------- Batching -------------------- #
+class Batcher:
+    # Groups submitted items by key and hands each group to `run` (on
+    # `executor`) as one batch; run(items) returns one result per item.  A
+    # group is due `window` seconds after its first item, or as soon as it
+    # holds `max_size` items.  While a batch is running, due groups keep
+    # collecting and go next, so under load batches grow to match the
+    # arrival rate instead of queueing one call at a time.
+    def __init__(self, run, executor, window=BATCH_WINDOW, max_size=MAX_BATCH):
+        self.run = run
+        self.executor = executor
+        self.window = window
+        self.max_size = max(1, max_size)
+        self._groups = {}
+        self._due = {}
+        self._queue = deque()
+        self._running = False
+
+    async def submit(self, key, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = []
+            loop.call_later(self.window, self._expire, key, group)
+        group.append((item, future))
+        if len(group) >= self.max_size:
+            self._close(key, group)
+        return await future
+
+    def _expire(self, key, group):
+        if self._groups.get(key) is not group:
+            return
+        if self._running:
+            self._due[key] = group
+        else:
+            self._close(key, group)
+
+    def _close(self, key, group):
+        del self._groups[key]
+        self._due.pop(key, None)
+        self._queue.append(group)
+        self._dispatch()
+
+    def _dispatch(self):
+        if self._running or not self._queue:
+            return
+        group = self._queue.popleft()
+        self._running = True
+        task = asyncio.get_running_loop().run_in_executor(self.executor, self.run, [item for item, _ in group])
+        task.add_done_callback(lambda done: self._finished(group, done))
+
+    def _finished(self, group, done):
+        self._running = False
+        error = done.exception()
+        results = done.result() if error is None else [None] * len(group)
+        for (_, future), result in zip(group, results):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        for key, due in list(self._due.items()):
+            if self._groups.get(key) is due:
+                self._close(key, due)
+        self._due.clear()
+        self._dispatch()
+
+# -------------------- Scoring -------------------- #
+def score_jobs(jobs):
+    # jobs share a skill set; each is {"texts": [...], "essential", "preferred",
+    # "years", "years_from_text"} with None for texts that failed to extract.
+    # Returns, per job, one {"match", "found", "missing", ...} per text.
+    # Concurrent calls for one job tend to resend the same resumes, so each
+    # distinct text is matched (and its years read) once per batch.
+    skills = tuple(jobs[0]["essential"] + jobs[0]["preferred"])
+    matcher = compiled_matcher(skills)
+    seen = {}
+
+    def analyse(text, with_years):
+        entry = seen.get(text)
+        if entry is None:
+            spans = matcher.find(text)
+            entry = seen[text] = [set(spans), spans, None]
+        if with_years and entry[2] is None:
+            entry[2] = experience_years(text, entry[1])
+        return entry[0], entry[2] if with_years else {}
+
+    results = []
+    with track("service_score", items=sum(len(job["texts"]) for job in jobs), requests=len(jobs)) as span:
+        for job in jobs:
+            ok = [i for i, text in enumerate(job["texts"]) if text is not None]
+            found, stated = [], []
+            for i in ok:
+                matched, years = analyse(job["texts"][i], job["years_from_text"])
+                found.append(matched)
+                stated.append(years)
+            hits, hit_skills = found_hit_matrix(found, skills)
+            scores = score_hit_matrix(hits, hit_skills, job["essential"], job["preferred"], job["years"],
+                                      resume_years=skill_years_matrix(stated, hit_skills) if job["years_from_text"] else None)
+            job_skills = list(dict.fromkeys(job["essential"] + job["preferred"]))
+            rows = [None] * len(job["texts"])
+            for i, matched, years, score in zip(ok, found, stated, scores.tolist()):
+                rows[i] = {
+                    "match": score,
+                    "found": [s for s in job_skills if s in matched],
+                    "missing": [s for s in job_skills if s not in matched],
+                }
+                if job["years_from_text"]:
+                    rows[i]["years"] = years
+            results.append(rows)
+        span.add(distinct=len(seen))
+    return results
+
+def rank_jobs(jobs):
+    # As score_jobs for jobs that also share a JD.  One TF-IDF fit over the
+    # distinct resumes of the batch gives every row its "jd_similarity"; a
+    # resume sent twice counts once towards IDF, as if sent once.
+    results = score_jobs(jobs)
+    texts = list(dict.fromkeys(text for job in jobs for text in job["texts"] if text is not None))
+    similarities = dict(zip(texts, calculate_similarities(jobs[0]["jd"], texts).tolist()))
+    for job, rows in zip(jobs, results):
+        for text, row in zip(job["texts"], rows):
+            if text is not None:
+                row["jd_similarity"] = round(similarities[text], 2)
+    return results
+
+# -------------------- Service -------------------- #
+class ResumeService:
+    def __init__(self, workers=None, timeout=None, cache=None, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH,
+                 max_body=MAX_BODY):
+        self.pool = ExtractionPool(workers or DEFAULT_WORKERS, timeout or DEFAULT_TIMEOUT,
+                                   cache if cache is not None else get_default_cache(),
+                                   DEFAULT_MAX_PAGES, DEFAULT_MAX_CHARS)
+        self.max_body = max_body
+        # One thread per worker process keeps every file's timeout a true
+        # per-file limit (see ExtractionPool); scoring has a thread to itself.
+        self._extract_threads = ThreadPoolExecutor(self.pool.workers, thread_name_prefix="service-extract")
+        self._score_thread = ThreadPoolExecutor(1, thread_name_prefix="service-score")
+        self._connections = set()
+        self._score_batcher = Batcher(score_jobs, self._score_thread, batch_window, max_batch)
+        self._rank_batcher = Batcher(rank_jobs, self._score_thread, batch_window, max_batch)
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+            ("POST", "/extract"): self.extract,
+            ("POST", "/score"): self.score,
+            ("POST", "/rank"): self.rank,
+        }
+
+    async def handle(self, method, path, body):
+        # Returns (status, payload); payload is a dict sent as JSON or a str.
+        route = self.routes.get((method, path.split("?", 1)[0].rstrip("/") or "/"))
+        if route is None:
+            known = any(p == path.rstrip("/") for _, p in self.routes)
+            status = 405 if known else 404
+            return status, {"error": HTTPStatus(status).phrase}
+        try:
+            if method == "POST":
+                try:
+                    body = json.loads(body or b"{}")
+                except ValueError:
+                    raise HTTPError(400, "request body is not valid JSON")
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "request body must be a JSON object")
+            return 200, await route(body)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def health(self, body):
+        return {"status": "ok", "workers": self.pool.workers}
+
+    async def metrics(self, body):
+        return REGISTRY.to_prometheus()
+
+    async def _texts(self, body):
+        # Returns (names, texts, errors) for the body's resumes, extracting
+        # files concurrently; a failed file has text None and an error.
+        resumes = body.get("resumes")
+        if not isinstance(resumes, list) or not resumes:
+            raise HTTPError(400, "'resumes' must be a non-empty list")
+        parsed = [parse_resume(entry, i) for i, entry in enumerate(resumes)]
+        loop = asyncio.get_running_loop()
+
+        async def extract(file_type, data):
+            if file_type is None:
+                return data, None
+            try:
+                return await loop.run_in_executor(self._extract_threads, self.pool.extract, file_type, data), None
+            except Exception as e:
+                return None, str(e)
+
+        done = await asyncio.gather(*(extract(file_type, data) for _, file_type, data in parsed))
+        return [name for name, _, _ in parsed], [text for text, _ in done], [error for _, error in done]
+
+    async def extract(self, body):
+        names, texts, errors = await self._texts(body)
+        return {"results": [{"name": name, "text": text, "error": error}
+                            for name, text, error in zip(names, texts, errors)]}
+
+    async def score(self, body):
+        job = parse_job(body, "score")
+        names, job["texts"], errors = await self._texts(body)
+        key = tuple(sorted(job["essential"] + job["preferred"]))
+        rows = await self._score_batcher.submit(key, job)
+        return {"results": [{"name": name, **(row or {"match": None}), "error": error}
+                            for name, row, error in zip(names, rows, errors)]}
+
+    async def rank(self, body):
+        job = parse_job(body, "rank")
+        names, job["texts"], errors = await self._texts(body)
+        key = (job["jd"], tuple(sorted(job["essential"] + job["preferred"])))
+        rows = await self._rank_batcher.submit(key, job)
+        # Best skill match first, JD similarity breaking ties, then input order.
+        ranking = TopK(job["top_k"] or len(names))
+        for name, row in zip(names, rows):
+            if row is not None:
+                ranking.push((row["match"], row["jd_similarity"]), {"name": name, **row})
+        return {
+            "total": ranking.seen,
+            "ranked": [{"rank": rank, **item} for rank, item in enumerate(ranking.items(), 1)],
+            "errors": [{"name": name, "error": error} for name, error in zip(names, errors) if error],
+        }
+
+    # -------------------- HTTP -------------------- #
+    async def _connection(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive")
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    await self._respond(writer, 411, {"error": "send a Content-Length"}, False)
+                    break
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                if length > self.max_body:
+                    await self._respond(writer, 413, {"error": f"body larger than {self.max_body} bytes"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                endpoint = target.split("?", 1)[0]
+                with track("service_request", bytes=length):
+                    status, payload = await self.handle(method.upper(), target, body)
+                REGISTRY.inc("service_requests", endpoint=endpoint, status=status)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+        head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        # Returns the asyncio server; port 0 picks a free port.
+        return await asyncio.start_server(self._connection, host, port)
+
+    def disconnect(self):
+        # Closes open connections, ending their idle keep-alive reads.
+        for writer in list(self._connections):
+            writer.close()
+
+    def close(self):
+        self._extract_threads.shutdown(wait=False, cancel_futures=True)
+        self._score_thread.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
+
+def serve_in_thread(host="127.0.0.1", port=0, **kwargs):
+    # Runs a service on a background event loop, for tests and benchmarks.
+    # Returns (service, (host, port), stop).
+    loop = asyncio.new_event_loop()
+    service = ResumeService(**kwargs)
+    server = loop.run_until_complete(service.start(host, port))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def shutdown():
+        server.close()
+        service.disconnect()
+        await asyncio.gather(*(asyncio.all_tasks() - {asyncio.current_task()}), return_exceptions=True)
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        service.close()
+
+    return service, server.sockets[0].getsockname()[:2], stop
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP service for resume extraction, scoring and ranking.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per file")
+    parser.add_argument("--batch-ms", type=float, default=BATCH_WINDOW * 1000,
+                        help="how long scoring waits to batch concurrent requests (0 = no wait)")
+    args = parser.parse_args()
+
+    async def run():
+        service = ResumeService(args.workers, args.timeout, batch_window=args.batch_ms / 1000)
+        server = await service.start(args.host, args.port)
+        print(f"Serving on http://{args.host}:{server.sockets[0].getsockname()[1]}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
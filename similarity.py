@@ -0,0 +1,48 @@
+# Job description similarity for a whole resume pool.
+# The TF-IDF vectorizer is fitted once on the JD plus every resume, so IDF
+# reflects the real candidate pool, and all cosine scores come out of a single
+# sparse matrix-vector product.  Resumes are compared without their
+# boilerplate sections (references, contact details, hobbies; see
+# sections.py).  sklearn is imported on the first call, not with the module.
+
+import numpy as np
+
+from metrics import track
+from sections import relevant_text
+
+def calculate_similarities(jd_text, texts):
+    # texts may be any iterable, e.g. a generator reading each resume back
+    # from the text cache: it is consumed in one pass and never held as a
+    # list, so only the sparse TF-IDF matrix has to fit in memory.
+    with track("calculate_similarity") as span:
+        def measured():
+            for text in texts:
+                span.add(items=1, chars=len(text))
+                yield text
+        return _calculate_similarities(jd_text, measured())
+
+def _calculate_similarities(jd_text, texts):
+    count = 0
+
+    def documents():
+        nonlocal count
+        yield jd_text
+        for text in texts:
+            count += 1
+            yield relevant_text(text)
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(stop_words='english')
+    try:
+        vectors = vectorizer.fit_transform(documents())
+    except ValueError:
+        # Empty vocabulary: nothing but stop words (or nothing at all).
+        return np.zeros(count)
+    # Rows are L2-normalised by TfidfVectorizer, so cosine similarity is a
+    # plain dot product with the JD row.
+    scores = vectors[1:] @ vectors[0].T
+    return scores.toarray().ravel() * 100
+
+def calculate_similarity(text, jd_text):
+    return calculate_similarities(jd_text, [text])[0]
@@ -0,0 +1,366 @@
+# Compiled multi-skill matcher.
+# Builds an Aho-Corasick automaton over all requested skills once per job
+# spec, then finds every skill in a resume in a single pass.  The automaton
+# runs over word/punctuation tokens instead of characters, so a skill only
+# matches on word boundaries ("java" no longer hits "javascript", "r" no
+# longer hits every word containing an r).
+#
+# Skills are matched by canonical ID (see taxonomy.py): each requested skill
+# is compiled together with its aliases, the scan reports the IDs present in
+# the text, and a skill matches when its ID is among them.
+
+import re
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+from experience import credit_years, experience_years, stated_mentions
+from taxonomy import get_default_taxonomy
+
+# Word runs and single punctuation characters; whitespace is kept as the gap
+# between tokens so multi-word skills only match with the same spacing.
+_TOKEN_RE = re.compile(r"(\w+|[^\w\s])")
+
+def tokenize(text):
+    # Returns [(gap, token), ...] where gap is the whitespace preceding token.
+    parts = _TOKEN_RE.split(text)
+    return list(zip(parts[0::2], parts[1::2]))
+
+class SkillMatcher:
+    def __init__(self, skills, taxonomy=None):
+        # taxonomy defaults to the shared one; pass taxonomy.EMPTY to match
+        # skills literally.
+        self.skills = list(dict.fromkeys(s for s in skills if s and s.strip()))
+        self.taxonomy = taxonomy if taxonomy is not None else get_default_taxonomy()
+        self.skill_ids = {skill: self.taxonomy.canonical_id(skill) for skill in self.skills}
+        self._skills_by_id = {}
+        for skill, skill_id in self.skill_ids.items():
+            self._skills_by_id.setdefault(skill_id, []).append(skill)
+        # Node 0 is the root.  Root edges are keyed by token alone (whatever
+        # precedes a skill doesn't matter); deeper edges by (gap, token).
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for skill_id, skills in self._skills_by_id.items():
+            forms = dict.fromkeys(form.lower() for skill in skills for form in self.taxonomy.surface_forms(skill))
+            for form in forms:
+                self._add(form, skill_id)
+        self._build_failure_links()
+
+    def _add(self, form, skill_id):
+        tokens = tokenize(form.lower())
+        if not tokens:
+            return
+        node = 0
+        for i, (gap, token) in enumerate(tokens):
+            key = token if i == 0 else (gap, token)
+            nxt = self._goto[node].get(key)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][key] = nxt
+            node = nxt
+        if (skill_id, len(tokens)) not in self._out[node]:
+            self._out[node].append((skill_id, len(tokens)))
+
+    def _step(self, node, gap, token):
+        while True:
+            nxt = self._goto[node].get(token if node == 0 else (gap, token))
+            if nxt is not None:
+                return nxt
+            if node == 0:
+                return 0
+            node = self._fail[node]
+
+    def _build_failure_links(self):
+        queue = deque()
+        for child in self._goto[0].values():
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for key, child in self._goto[node].items():
+                gap, token = key
+                self._fail[child] = self._step(self._fail[node], gap, token)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    def _scan(self, parts):
+        # parts is _TOKEN_RE.split() output: gaps at even, tokens at odd
+        # indexes.  Yields (part_index, node) for every token that completes
+        # a skill.
+        goto = self._goto
+        root = goto[0]
+        fail = self._fail
+        out = self._out
+        node = 0
+        for i in range(1, len(parts), 2):
+            token = parts[i]
+            if node:
+                key = (parts[i - 1], token)
+                while node:
+                    nxt = goto[node].get(key)
+                    if nxt is not None:
+                        break
+                    node = fail[node]
+                else:
+                    nxt = root.get(token)
+            else:
+                nxt = root.get(token)
+            node = nxt or 0
+            if node and out[node]:
+                yield i, node
+
+    def find(self, text):
+        # Returns {skill: [(start, end), ...]} with character offsets into
+        # text.lower() for every skill that occurs at least once, under any
+        # of its names.
+        return self._find(_TOKEN_RE.split(text.lower()))
+
+    def _find(self, parts):
+        offsets = [0]
+        for part in parts:
+            offsets.append(offsets[-1] + len(part))
+        hits = {}
+        for i, node in self._scan(parts):
+            for skill_id, length in self._out[node]:
+                start = offsets[i - 2 * (length - 1)]
+                for skill in self._skills_by_id[skill_id]:
+                    hits.setdefault(skill, []).append((start, offsets[i + 1]))
+        return hits
+
+    def counts(self, text):
+        counts = {}
+        for _, node in self._scan(_TOKEN_RE.split(text.lower())):
+            for skill_id, _ in self._out[node]:
+                for skill in self._skills_by_id[skill_id]:
+                    counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+    def ids(self, text):
+        # Canonical IDs of the requested skills that occur in text.
+        found = set()
+        for _, node in self._scan(_TOKEN_RE.split(text.lower())):
+            found.update(skill_id for skill_id, _ in self._out[node])
+        return found
+
+    def matched(self, text):
+        skills_by_id = self._skills_by_id
+        return {skill for skill_id in self.ids(text) for skill in skills_by_id[skill_id]}
+
+@lru_cache(maxsize=32)
+def compiled_matcher(skills):
+    # One SkillMatcher per job spec (a tuple of skills) and process, for
+    # callers that score resumes one at a time.
+    return SkillMatcher(skills)
+
+# -------------------- Incremental matching -------------------- #
+# What each resume was found to contain is kept per skill, so editing the
+# skill list only looks for the skills that are new.  A resume's distinct
+# tokens are kept as a sorted array of hashes: a skill none of whose names
+# has all its tokens there can't occur, and a one-token name that is there
+# does, so most new skills are settled without the text.  Only a multi-token
+# name whose tokens are all present, or occurrences needed for experience
+# years, send a resume back to its text.
+
+@lru_cache(maxsize=1024)
+def _form_tokens(skill, taxonomy):
+    # Token hashes of each of skill's names.
+    return [np.array([hash(token) for _, token in tokenize(form.lower())], dtype=np.int64)
+            for form in dict.fromkeys(form.lower() for form in taxonomy.surface_forms(skill))]
+
+@lru_cache(maxsize=32)
+def _delta_matcher(skills, taxonomy):
+    return SkillMatcher(skills, taxonomy)
+
+class ResumeSkills:
+    def __init__(self, text, matcher):
+        parts = _TOKEN_RE.split(text.lower())
+        # hash() is salted per process, like the objects holding these.
+        self.vocabulary = np.unique(np.fromiter(map(hash, set(parts[1::2])), dtype=np.int64))
+        self.spans = matcher._find(parts)
+        self.found = set(self.spans)
+        self.checked = set(matcher.skills)
+        self.taxonomy = matcher.taxonomy
+        self.mentions = stated_mentions(text)
+
+    def _has(self, tokens):
+        if not len(self.vocabulary):
+            return False
+        i = np.searchsorted(self.vocabulary, tokens)
+        return bool(np.all(self.vocabulary[np.minimum(i, len(self.vocabulary) - 1)] == tokens))
+
+    def pending(self, skills, spans=False):
+        # The skills that need the text: new ones the vocabulary can't settle
+        # and, with spans=True, found ones whose occurrences aren't known.
+        # Settles the others.
+        need = []
+        for skill in dict.fromkeys(skills):
+            if skill in self.checked:
+                if spans and skill in self.found and skill not in self.spans:
+                    need.append(skill)
+                continue
+            forms = [tokens for tokens in _form_tokens(skill, self.taxonomy) if len(tokens) and self._has(tokens)]
+            if not forms:
+                self.checked.add(skill)
+            elif any(len(tokens) == 1 for tokens in forms) and not spans:
+                self.checked.add(skill)
+                self.found.add(skill)
+            else:
+                need.append(skill)
+        return need
+
+    def scan(self, text, skills):
+        # Finds skills (from pending()) in the resume's text.
+        found = _delta_matcher(tuple(skills), self.taxonomy).find(text)
+        self.spans.update(found)
+        self.found.update(found)
+        self.checked.update(skills)
+
+    def years(self, skills):
+        # experience_years for skills, all of whose occurrences must be
+        # known (pending(skills, spans=True) is empty).
+        return credit_years(self.mentions, {skill: self.spans[skill] for skill in skills if skill in self.spans})
+
+def update_resume_skills(resumes, skills, load_text, spans=False):
+    # Brings every ResumeSkills up to date with skills, calling
+    # load_text(i) for the few resumes that need their text.  Returns how
+    # many did.
+    loaded = 0
+    for i, resume in enumerate(resumes):
+        need = resume.pending(skills, spans)
+        if need:
+            resume.scan(load_text(i), need)
+            loaded += 1
+    return loaded
+
+def calculate_match(resume_text, essential_skills, preferred_skills, skill_experience_map, matcher=None,
+                    years_from_text=False):
+    # years_from_text weights each skill by the years the resume itself
+    # states for it (see experience.py) instead of skill_experience_map.
+    if matcher is None:
+        matcher = compiled_matcher(tuple(essential_skills + preferred_skills))
+    if years_from_text:
+        spans = matcher.find(resume_text)
+        return score_matched_skills(spans.keys(), essential_skills, preferred_skills,
+                                    experience_years(resume_text, spans))
+    return score_matched_skills(matcher.matched(resume_text), essential_skills, preferred_skills, skill_experience_map)
+
+def score_matched_skills(found, essential_skills, preferred_skills, skill_experience_map):
+    # The weighting half of calculate_match, for callers that already know
+    # which skills a resume contains.
+    total_essential = len(essential_skills)
+    total_preferred = len(preferred_skills)
+
+    essential_score = 0
+    preferred_score = 0
+
+    for skill in essential_skills:
+        if skill in found:
+            weight = 1 + 0.1 * skill_experience_map.get(skill, 0)
+            essential_score += weight
+
+    for skill in preferred_skills:
+        if skill in found:
+            weight = 1 + 0.1 * skill_experience_map.get(skill, 0)
+            preferred_score += weight
+
+    max_essential_score = total_essential * 2
+    max_preferred_score = total_preferred * 2
+
+    essential_percent = (essential_score / max_essential_score * 100) if total_essential else 0
+    preferred_percent = (preferred_score / max_preferred_score * 100) if total_preferred else 0
+
+    total_score = (0.7 * essential_percent + 0.3 * preferred_percent)
+    return round(total_score, 2)
+
+# -------------------- Batch scoring -------------------- #
+# calculate_match over a whole pool: skills are detected once into a
+# resumes x skills hit matrix, after which re-weighting is a handful of array
+# operations.  Results are bit-identical to calculate_match: weights are
+# accumulated column by column in skill order (the same float additions the
+# loop does) and rounding uses Python's round() on each distinct score.
+
+def skill_hit_matrix(texts, skills, matcher=None):
+    # Boolean matrix, one row per text and one column per (deduplicated)
+    # skill.  Column-major so each skill's column is contiguous.
+    skills = list(dict.fromkeys(skills))
+    if matcher is None:
+        matcher = SkillMatcher(skills)
+    return found_hit_matrix([matcher.matched(text) for text in texts], skills)
+
+def found_hit_matrix(found, skills):
+    # As skill_hit_matrix, from each resume's matched() skill set.
+    skills = list(dict.fromkeys(skills))
+    column = {skill: j for j, skill in enumerate(skills)}
+    hits = np.zeros((len(found), len(skills)), dtype=bool, order="F")
+    for i, matched in enumerate(found):
+        for skill in matched:
+            j = column.get(skill)
+            if j is not None:
+                hits[i, j] = True
+    return hits, skills
+
+def skill_years_matrix(years, skills):
+    # Years per resume and skill, aligned with a hit matrix's columns, from
+    # each resume's experience_years() map; 0 where none is stated.
+    column = {skill: j for j, skill in enumerate(skills)}
+    matrix = np.zeros((len(years), len(skills)), order="F")
+    for i, stated in enumerate(years):
+        for skill, value in stated.items():
+            j = column.get(skill)
+            if j is not None:
+                matrix[i, j] = value
+    return matrix
+
+def score_hit_matrix(hits, skills, essential_skills, preferred_skills, skill_experience_map, resume_years=None):
+    # hits/skills as returned by skill_hit_matrix; skills missing from the
+    # matrix count as not found.  resume_years (skill_years_matrix) replaces
+    # skill_experience_map with each resume's own years.
+    column = {skill: j for j, skill in enumerate(skills)}
+    n = hits.shape[0]
+
+    def weighted(group):
+        score = np.zeros(n)
+        for skill in group:
+            j = column.get(skill)
+            if j is None:
+                continue
+            if resume_years is not None:
+                score += hits[:, j] * (1 + 0.1 * resume_years[:, j])
+            else:
+                score += hits[:, j] * (1 + 0.1 * skill_experience_map.get(skill, 0))
+        return score
+
+    total_essential = len(essential_skills)
+    total_preferred = len(preferred_skills)
+    essential_percent = (weighted(essential_skills) / (total_essential * 2) * 100) if total_essential else 0
+    preferred_percent = (weighted(preferred_skills) / (total_preferred * 2) * 100) if total_preferred else 0
+    total_score = np.broadcast_to(0.7 * essential_percent + 0.3 * preferred_percent, (n,))
+    return round_scores(total_score)
+
+def round_scores(scores, ndigits=2):
+    # np.round scales, rounds and divides, which can differ from round() in
+    # the last bit; only distinct values go through round(), so this stays
+    # cheap for large pools.
+    values, inverse = np.unique(scores, return_inverse=True)
+    return np.array([round(v, ndigits) for v in values.tolist()], dtype=float)[inverse.reshape(-1)]
+
+def calculate_matches(resume_texts, essential_skills, preferred_skills, skill_experience_map, matcher=None,
+                      years_from_text=False):
+    if not years_from_text:
+        hits, skills = skill_hit_matrix(resume_texts, essential_skills + preferred_skills, matcher)
+        return score_hit_matrix(hits, skills, essential_skills, preferred_skills, skill_experience_map)
+    skills = list(dict.fromkeys(essential_skills + preferred_skills))
+    if matcher is None:
+        matcher = SkillMatcher(skills)
+    found, years = [], []
+    for text in resume_texts:
+        spans = matcher.find(text)
+        found.append(spans.keys())
+        years.append(experience_years(text, spans))
+    hits, skills = found_hit_matrix(found, skills)
+    return score_hit_matrix(hits, skills, essential_skills, preferred_skills, skill_experience_map,
+                            resume_years=skill_years_matrix(years, skills))
@@ -0,0 +1,82 @@
+# Skill taxonomy: canonical skills and their aliases, so "k8s" finds
+# Kubernetes and "Postgres" finds PostgreSQL.
+# Requested skills are normalised to canonical skill IDs here; SkillMatcher
+# compiles every name and alias of the requested IDs into its automaton once
+# per job, so one pass over a resume yields the IDs it mentions and matching
+# is a set intersection.  Skills the taxonomy doesn't know are their own ID.
+#
+# The taxonomy is skill_taxonomy.json next to this module, or the file named
+# by RESUME_SKILL_TAXONOMY_PATH; set that to "" to match skills literally.
+
+import json
+import os
+import threading
+
+DEFAULT_PATH = os.getenv(
+    "RESUME_SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json"),
+)
+
+def normalize(skill):
+    return " ".join(skill.lower().split())
+
+class SkillTaxonomy:
+    def __init__(self, entries=()):
+        # entries: [{"id": ..., "name": ..., "aliases": [...]}, ...]
+        self.names = {}
+        self._forms = {}
+        self._ids = {}
+        for entry in entries:
+            skill_id = entry["id"]
+            if skill_id in self.names:
+                raise ValueError(f"Duplicate skill id {skill_id!r} in taxonomy")
+            forms = list(dict.fromkeys([entry["name"]] + list(entry.get("aliases", []))))
+            self.names[skill_id] = entry["name"]
+            self._forms[skill_id] = forms
+            # The ID itself is a lookup key too, so an unknown skill's ID
+            # (its normalised text) can never collide with a taxonomy ID.
+            for key in {normalize(skill_id)} | {normalize(form) for form in forms}:
+                other = self._ids.setdefault(key, skill_id)
+                if other != skill_id:
+                    raise ValueError(f"Alias {key!r} belongs to both {other!r} and {skill_id!r}")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["skills"])
+
+    def __len__(self):
+        return len(self.names)
+
+    def known(self, skill):
+        return normalize(skill) in self._ids
+
+    def canonical_id(self, skill):
+        key = normalize(skill)
+        return self._ids.get(key, key)
+
+    def canonical_name(self, skill):
+        skill_id = self._ids.get(normalize(skill))
+        return self.names[skill_id] if skill_id else skill
+
+    def surface_forms(self, skill):
+        # Every spelling that counts as this skill in a resume.
+        skill_id = self._ids.get(normalize(skill))
+        if skill_id is None:
+            return [skill]
+        return list(dict.fromkeys(self._forms[skill_id] + [skill]))
+
+EMPTY = SkillTaxonomy()
+
+def load_taxonomy(path=DEFAULT_PATH):
+    return SkillTaxonomy.from_file(path) if path else EMPTY
+
+_default_taxonomy = None
+_default_lock = threading.Lock()
+
+def get_default_taxonomy():
+    global _default_taxonomy
+    with _default_lock:
+        if _default_taxonomy is None:
+            _default_taxonomy = load_taxonomy()
+        return _default_taxonomy
@@ -0,0 +1,10 @@
+# Stand-in for extraction.extract_text_detailed in ExtractionPool tests.  It
+# lives in its own module so the pool's spawned workers can import it
+# without loading the test module's dependencies.
+
+import time
+
+def slow_extractor(file_type, source, *budget):
+    if file_type == "hang":
+        time.sleep(60)
+    return f"parsed {file_type}", None
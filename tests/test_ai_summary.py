@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+import ai_summary
+from ai_summary import TokenBucket, generate_ai_summaries
+from fake_chat_server import serve
+from metrics import REGISTRY
+from text_cache import TextCache
+
+TEXTS = [f"Resume {i}: Python and SQL for {i} years." for i in range(8)]
+
+@pytest.fixture
+def chat():
+    servers = []
+
+    def start(**kwargs):
+        server = serve(**kwargs)
+        servers.append(server)
+        return server, "http://%s:%d/v1" % server.server_address
+
+    REGISTRY.reset()
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def counter(name, **labels):
+    return sum(c["value"] for c in REGISTRY.snapshot()["counters"]
+               if c["name"] == name and all(c["labels"].get(k) == v for k, v in labels.items()))
+
+def summarize(texts, api_base, **kwargs):
+    kwargs.setdefault("cache", None)
+    kwargs.setdefault("rate_per_minute", 60000)
+    return generate_ai_summaries(texts, api_key="test", api_base=api_base, **kwargs)
+
+def test_failed_requests_are_retried(chat):
+    server, api_base = chat(fail_rate=0.5, seed=3)
+    summaries = summarize(TEXTS, api_base, concurrency=4, retries=20)
+    assert all(summary.startswith("Summary ") for summary in summaries)
+    failures = server.stats["failures"]
+    assert failures > 0
+    assert server.stats["requests"] == len(TEXTS) + failures
+    assert counter("summary_retries") == failures
+
+def test_retry_after_is_honoured(chat):
+    server, api_base = chat(fail_rate=0.7, seed=3, retry_after=0.2)
+    start = time.monotonic()
+    [summary] = summarize(TEXTS[:1], api_base, retries=20)
+    assert summary.startswith("Summary ")
+    assert server.stats["failures"] > 0
+    assert time.monotonic() - start >= 0.2 * server.stats["failures"]
+
+def test_backoff_grows_and_retries_run_out(chat, monkeypatch):
+    # No Retry-After: waits 2**attempt * (0.5 + random()) seconds.
+    monkeypatch.setattr(ai_summary.random, "random", lambda: 0.0)
+    server, api_base = chat(fail_rate=1.0, retry_after=None)
+    start = time.monotonic()
+    [summary] = summarize(TEXTS[:1], api_base, retries=2)
+    assert time.monotonic() - start >= 0.5 + 1.0
+    assert summary.startswith("AI Summary failed: HTTP ")
+    assert server.stats["requests"] == 3
+
+def test_token_bucket_spaces_out_requests(chat):
+    _, api_base = chat()
+    start = time.monotonic()
+    summarize(TEXTS[:6], api_base, concurrency=6, bucket=TokenBucket(600, capacity=1))
+    assert time.monotonic() - start >= 0.45
+
+def test_token_bucket_allows_a_burst_of_its_capacity():
+    bucket = TokenBucket(60, capacity=5)
+
+    async def acquire(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(acquire(5))
+    assert time.monotonic() - start < 0.2
+    start = time.monotonic()
+    asyncio.run(acquire(1))
+    assert time.monotonic() - start >= 0.9
+
+def test_summaries_are_cached(chat, tmp_path):
+    server, api_base = chat()
+    cache = TextCache(str(tmp_path / "summaries.sqlite3"), name="summary_cache")
+    texts = TEXTS[:3] + TEXTS[:1]
+    first = summarize(texts, api_base, cache=cache)
+    # The repeated text shares one request.
+    assert server.stats["requests"] == 3
+    assert first[3] == first[0]
+    again = summarize(texts, api_base, cache=cache)
+    assert again == first
+    assert server.stats["requests"] == 3
+    assert counter("cache_requests", cache="summary_cache", result="hit") == 4
+
+def test_failures_are_not_cached(chat, tmp_path):
+    _, failing = chat(fail_rate=1.0)
+    cache = TextCache(str(tmp_path / "summaries.sqlite3"), name="summary_cache")
+    [summary] = summarize(TEXTS[:1], failing, cache=cache, retries=0)
+    assert summary.startswith("AI Summary failed")
+    server, api_base = chat()
+    [summary] = summarize(TEXTS[:1], api_base, cache=cache)
+    assert summary.startswith("Summary ") and server.stats["requests"] == 1
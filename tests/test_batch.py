@@ -0,0 +1,81 @@
+import os
+import shutil
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from batch import ResultWriter, iter_resume_paths, main, parse_skills, process_resumes
+from corpus import resume_text, write_docx, write_pdf
+
+JD = "Python engineer with SQL and Docker"
+ESSENTIAL, PREFERRED = "Python,SQL, Go", "Docker,Kubernetes"
+
+@pytest.fixture(scope="module")
+def resumes(tmp_path_factory):
+    root = tmp_path_factory.mktemp("resumes")
+    os.makedirs(root / "sub")
+    write_pdf(str(root / "a.pdf"), resume_text(0, skill_density=0.3))
+    write_docx(str(root / "sub" / "b.docx"), resume_text(1, skill_density=0.3))
+    write_pdf(str(root / "c.pdf"), resume_text(2, skill_density=0.3))
+    shutil.copy(root / "a.pdf", root / "z_copy.pdf")
+    (root / "broken.pdf").write_bytes(b"not a pdf")
+    (root / "notes.txt").write_text("ignored")
+    return root
+
+@pytest.fixture(autouse=True)
+def text_cache(tmp_path, monkeypatch):
+    # Read by the spawned workers when they import text_cache.
+    monkeypatch.setenv("RESUME_TEXT_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+
+def run(resumes, tmp_path, name, *args):
+    jd = tmp_path / "jd.txt"
+    jd.write_text(JD, encoding="utf-8")
+    output = str(tmp_path / name)
+    assert main(["--jd", str(jd), "--resumes", str(resumes), "--essential", ESSENTIAL, "--preferred", PREFERRED,
+                 "--output", output, "--workers", "1", "--chunk-size", "2", *args]) == 0
+    return output
+
+def test_resume_paths(resumes):
+    names = ["a.pdf", "broken.pdf", "c.pdf", "z_copy.pdf", os.path.join("sub", "b.docx")]
+    assert [os.path.relpath(p, resumes) for p in iter_resume_paths(str(resumes))] == names
+    assert [os.path.basename(p) for p in iter_resume_paths(str(resumes / "**" / "*.docx"))] == ["b.docx"]
+
+def test_parse_skills():
+    assert parse_skills(" Python, ,SQL ,") == ["Python", "SQL"] and parse_skills(None) == []
+
+def test_csv_output(resumes, tmp_path):
+    frame = pd.read_csv(run(resumes, tmp_path, "out.csv"))
+    assert frame["Candidate"].tolist() == ["a.pdf", "broken.pdf", "c.pdf", "z_copy.pdf", "b.docx"]
+    a, broken, _, copy, _ = frame.to_dict("records")
+    assert broken["Error"] and pd.isna(broken["Skill Match %"])
+    # The copy is flagged across a chunk boundary and keeps a's scores.
+    assert copy["Duplicate Of"] == a["Path"]
+    assert copy["Skill Match %"] == a["Skill Match %"] and copy["JD Similarity %"] == a["JD Similarity %"]
+    assert frame["Essential Skills"].dropna().str.endswith("/3").all()
+
+@pytest.mark.parametrize("fmt", ["jsonl", "parquet"])
+def test_other_formats_hold_the_same_rows(resumes, tmp_path, fmt):
+    csv = pd.read_csv(run(resumes, tmp_path, "out.csv"))
+    path = run(resumes, tmp_path, f"out.{fmt}")
+    other = pd.read_json(path, lines=True) if fmt == "jsonl" else pd.read_parquet(path)
+    assert other["Path"].tolist() == csv["Path"].tolist()
+    assert other["Skill Match %"].fillna(-1).tolist() == csv["Skill Match %"].fillna(-1).tolist()
+    if fmt == "jsonl":
+        assert isinstance(other["Skills Table"][0], dict)
+
+def test_process_resumes_collapses_duplicates(resumes):
+    paths = list(iter_resume_paths(str(resumes)))
+    frame = process_resumes(JD, paths, parse_skills(ESSENTIAL), parse_skills(PREFERRED), summaries=False,
+                            workers=1)
+    assert frame["Candidate"].tolist() == ["a.pdf", "broken.pdf", "c.pdf", "b.docx"]
+    assert frame["Duplicates"].tolist() == [1, 0, 0, 0]
+    assert set(frame["Skills Table"][0]) == {"Python", "SQL", "Go", "Docker", "Kubernetes"}
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError, match="output format"):
+        ResultWriter(str(tmp_path / "out.xlsx"))
@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from corpus import resume_text, skill_vocabulary
+from corpus_index import ResumeIndex
+from scoring import skill_hits, weighted_skill_score
+from skill_matcher import calculate_matches
+
+TEXTS = [resume_text(i, words=200, skill_density=0.2, vocabulary=skill_vocabulary(60)) for i in range(30)] + [
+    "Built k8s clusters on Amazon Web Services with apache spark and python3.",
+    "Amazon services, web apps and a driven event architecture: not the multi-word skills.",
+    "Practised site reliability engineering practices and event driven architecture on Google Cloud Platform.",
+    "C++ and C# developer using Node.js and Ruby on Rails.",
+]
+ESSENTIAL = ["Python", "Kubernetes", "AWS", "Apache Spark", "Event Driven Architecture",
+             "Site Reliability Engineering Practices"]
+PREFERRED = ["Ruby on Rails", "Node.js", "C++", "Google Cloud Platform", "Pyton"]
+JD = "Python data engineer building Spark pipelines on AWS"
+
+@pytest.fixture
+def index(tmp_path):
+    index = ResumeIndex(str(tmp_path / "index.sqlite3"))
+    for i, text in enumerate(TEXTS):
+        index.add(f"r{i}.pdf", text, digest=f"d{i}", commit=False)
+    index.commit()
+    yield index
+    index.close()
+
+def expected_match():
+    return calculate_matches(TEXTS, ESSENTIAL, PREFERRED, {"Python": 5})
+
+def test_match_scores_agree_with_calculate_matches(index):
+    np.testing.assert_array_equal(index.match_scores(ESSENTIAL, PREFERRED, {"Python": 5}), expected_match())
+
+def test_multi_word_skills_need_adjacent_tokens(index):
+    hits = index.skill_hits(["AWS", "Event Driven Architecture", "Site Reliability Engineering Practices"])
+    assert hits["AWS"][30] and not hits["AWS"][31]
+    assert hits["Event Driven Architecture"].tolist() == [i == 32 for i in range(len(TEXTS))]
+    assert hits["Site Reliability Engineering Practices"].tolist() == [i == 32 for i in range(len(TEXTS))]
+
+def test_skill_scores_agree_with_evaluate_skills(index):
+    expected = [weighted_skill_score(skill_hits(text, ESSENTIAL + PREFERRED), len(ESSENTIAL), len(PREFERRED))[0]
+                for text in TEXTS]
+    np.testing.assert_array_equal(index.skill_scores(ESSENTIAL, PREFERRED), expected)
+
+def test_top_k(index):
+    results = index.top_k(5, JD, ESSENTIAL, PREFERRED, {"Python": 5})
+    scores = expected_match()
+    assert [r["Score"] for r in results] == sorted(scores, reverse=True)[:5]
+    assert all(index.get_text(r["Resume ID"]) == TEXTS[int(r["Candidate"][1:-4])] for r in results)
+    assert all("JD Similarity %" in r for r in results)
+    similar = index.top_k(3, JD, mode="similarity")
+    assert [r["Resume ID"] for r in similar] == (np.argsort(-index.similarity(JD), kind="stable")[:3] + 1).tolist()
+    assert "JD Similarity %" not in similar[0]
+    assert index.top_k(0, JD, ESSENTIAL) == []
+    with pytest.raises(ValueError, match="ranking mode"):
+        index.top_k(5, JD, ESSENTIAL, mode="best")
+
+def test_similarity_scores_unrelated_resumes_zero(index):
+    scores = index.similarity("embedded firmware")
+    assert scores.shape == (len(TEXTS),) and not scores.any()
+    assert not index.similarity("").any()
+
+def test_duplicates_deletes_and_reopening(index, tmp_path):
+    assert index.add("again.pdf", TEXTS[0], digest="d0") == 1 and len(index) == len(TEXTS)
+    index.delete(1)
+    assert len(index) == len(TEXTS) - 1 and index.get_text(1) is None
+    expected = expected_match()[1:]
+    np.testing.assert_array_equal(index.match_scores(ESSENTIAL, PREFERRED, {"Python": 5}), expected)
+    reopened = ResumeIndex(index.path)
+    try:
+        assert len(reopened) == len(TEXTS) - 1
+        np.testing.assert_array_equal(reopened.match_scores(ESSENTIAL, PREFERRED, {"Python": 5}), expected)
+    finally:
+        reopened.close()
+
+def test_rows_without_token_runs_fall_back_to_text(index):
+    # As stored by a version without token runs, then upgraded.
+    with sqlite3.connect(index.path) as conn:
+        conn.execute("UPDATE resumes SET gram_hashes = NULL WHERE id % 2 = 0")
+    old = ResumeIndex(index.path)
+    try:
+        np.testing.assert_array_equal(old.match_scores(ESSENTIAL, PREFERRED, {"Python": 5}), expected_match())
+        assert old.upgrade() == len(TEXTS) // 2 and old.upgrade() == 0
+        np.testing.assert_array_equal(old.match_scores(ESSENTIAL, PREFERRED, {"Python": 5}), expected_match())
+    finally:
+        old.close()
@@ -0,0 +1,39 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from corpus import resume_text, write_docx, write_pdf
+from dedup import DuplicateIndex, find_duplicates, minhash, similarity
+from extraction import DOCX_TYPE, PDF_TYPE, extract_text
+
+def test_spacing_and_case_do_not_change_the_signature():
+    text = resume_text(0)
+    reflowed = "  ".join(text.upper().split())
+    assert similarity(minhash(text), minhash(reflowed)) == 1.0
+
+def test_text_without_words_has_no_signature():
+    assert minhash("") is None and minhash("-- / --") is None
+    assert DuplicateIndex().add("a", None) is None
+
+def test_first_copy_is_the_original():
+    a, b = resume_text(0), resume_text(1)
+    edited = a.replace("Summary", "Profile summary", 1)
+    assert find_duplicates([minhash(t) for t in [a, b, edited, a]]) == [None, None, 0, 0]
+
+def test_threshold_zero_turns_detection_off():
+    text = resume_text(0)
+    assert find_duplicates([minhash(text)] * 2, threshold=0) == [None, None]
+
+def test_pdf_and_docx_of_one_resume_are_duplicates(tmp_path):
+    text = resume_text(0)
+    write_pdf(str(tmp_path / "a.pdf"), text)
+    write_docx(str(tmp_path / "a.docx"), text)
+    write_pdf(str(tmp_path / "b.pdf"), resume_text(1))
+    duplicates = DuplicateIndex()
+    for name, file_type in [("a.pdf", PDF_TYPE), ("b.pdf", PDF_TYPE), ("a.docx", DOCX_TYPE)]:
+        signature = minhash(extract_text(file_type, (tmp_path / name).read_bytes()))
+        original = duplicates.add(name, signature)
+        assert original == ("a.pdf" if name == "a.docx" else None)
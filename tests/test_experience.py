@@ -0,0 +1,59 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from experience import credit_years, experience_years, stated_mentions
+from skill_matcher import SkillMatcher, calculate_match
+
+TODAY = datetime.date(2024, 6, 1)
+SKILLS = ["Python", "AWS", "Kubernetes", "Docker", "SQL"]
+
+def years(text, skills=SKILLS):
+    return experience_years(text, SkillMatcher(skills).find(text), today=TODAY)
+
+@pytest.mark.parametrize("text, expected", [
+    ("5 years of Python", {"Python": 5.0}),
+    ("3+ yrs experience with AWS and Docker", {"AWS": 3.0, "Docker": 3.0}),
+    ("2.5 years of professional experience in SQL", {"SQL": 2.5}),
+    ("Python (5 yrs), Kubernetes - 2 years", {"Python": 5.0, "Kubernetes": 2.0}),
+    ("Summary: 4 years of Python", {"Python": 4.0}),
+    ("Python. 5 years of leadership", {}),
+    ("Python and SQL", {}),
+    ("60 years of Python", {}),
+])
+def test_explicit_durations(text, expected):
+    assert years(text) == expected
+
+def test_date_ranges_credit_their_entry():
+    text = ("Acme, Jan 2018 - Mar 2021\nBuilt Python services on AWS.\n"
+            "Initech, 2021 to present\nRan Kubernetes and Python.")
+    assert years(text) == {"Python": 6.4, "AWS": 3.2, "Kubernetes": 3.4}
+
+def test_overlapping_ranges_count_once():
+    text = "Acme 2018 - 2020: Python\nSide project 2019 - 2021: Python"
+    assert years(text) == {"Python": 3.0}
+
+def test_the_larger_of_stated_and_dated_years_wins():
+    assert years("Acme 2020 - 2021: 6 years of Python") == {"Python": 6.0}
+    assert years("Acme 2010 - 2020: 2 years of Python") == {"Python": 10.0}
+
+def test_implausible_ranges_are_ignored():
+    assert years("Acme 2021 - 2018: Python") == {}
+
+def test_mentions_can_be_credited_to_another_skill_list():
+    text = "Acme, 2019 - 2022\nPython and Docker.\n4 years of SQL"
+    mentions = stated_mentions(text, TODAY)
+    for skills in (SKILLS, ["Docker"], ["SQL", "Go"]):
+        spans = SkillMatcher(skills).find(text)
+        assert credit_years(mentions, spans) == years(text, skills)
+
+def test_years_from_text_weight_the_match():
+    essential = ["Python", "SQL"]
+    short = calculate_match("1 year of Python and SQL", essential, [], {}, years_from_text=True)
+    long = calculate_match("8 years of Python and SQL", essential, [], {}, years_from_text=True)
+    assert long > short > 0
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from corpus import resume_text, write_docx, write_pdf
+from extraction import DOCX_TYPE, PDF_TYPE, ExtractionPool, extract_texts_parallel
+from slow_extractor import slow_extractor
+from text_cache import TextCache
+
+def test_extraction_pool_times_out_and_restarts():
+    with ExtractionPool(2, timeout=5, extractor=slow_extractor) as pool:
+        with ThreadPoolExecutor(2) as threads:
+            hung = threads.submit(pool.extract, "hang", b"%PDF")
+            other = threads.submit(pool.extract, "quick", b"%PDF")
+            start = time.monotonic()
+            with pytest.raises(RuntimeError, match="timed out"):
+                hung.result()
+            assert time.monotonic() - start < 30
+            assert other.result() == "parsed quick"
+        # The stuck worker was killed; the next file gets a fresh pool.
+        assert pool._generation == 1
+        assert pool.extract("quick", b"%PDF") == "parsed quick"
+
+def test_close_fails_files_in_flight_at_once():
+    pool = ExtractionPool(1, timeout=60, extractor=slow_extractor)
+    with ThreadPoolExecutor(1) as threads:
+        hung = threads.submit(pool.extract, "hang", b"%PDF")
+        time.sleep(1)
+        start = time.monotonic()
+        pool.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            hung.result()
+        assert time.monotonic() - start < 5
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.extract("quick", b"%PDF")
+
+def test_extract_texts_parallel_keeps_order_and_reports_failures(tmp_path):
+    write_pdf(str(tmp_path / "a.pdf"), resume_text(0))
+    write_docx(str(tmp_path / "b.docx"), resume_text(1))
+    items = [(PDF_TYPE, (tmp_path / "a.pdf").read_bytes()), (PDF_TYPE, b"not a pdf"),
+             (DOCX_TYPE, (tmp_path / "b.docx").read_bytes())]
+    cache = TextCache(str(tmp_path / "cache.sqlite3"))
+    texts, errors = extract_texts_parallel(items, max_workers=2, cache=cache)
+    assert list(errors) == [1] and texts[1] == ""
+    assert "Summary" in texts[0] and "Summary" in texts[2] and texts[0] != texts[2]
+    # Served from the cache the second time; the failure is tried again.
+    again, errors = extract_texts_parallel(items, max_workers=2, cache=cache)
+    assert again == texts and list(errors) == [1]
+
+def test_extract_texts_parallel_of_nothing():
+    assert extract_texts_parallel([]) == ([], {})
@@ -0,0 +1,55 @@
+import difflib
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fuzzy_matcher import FuzzyIndex, fuzzy_match, trigrams
+
+TEXT = "Senior Pyhton developer: Django, PostgreSQL, Kubernets, React.js and machine-learning pipelines"
+TERMS = ["Python", "python", "Kubernetes", "SQL", "Postgres", "Go", "React", "machine learning", "Rust", ""]
+
+def brute_ratio(term, text, threshold):
+    # The original fuzzy_match: difflib against every word of the text.
+    return any(difflib.SequenceMatcher(None, word, term.lower()).ratio() >= threshold
+               for word in text.lower().split())
+
+def brute_trigram(term, text, threshold):
+    a = trigrams(term.lower())
+    return any(2 * len(a & trigrams(word)) / (len(a) + len(trigrams(word))) >= threshold
+               for word in text.lower().split())
+
+@pytest.mark.parametrize("threshold", [0.0, 0.5, 0.6, 0.8, 1.0])
+def test_ratio_matches_difflib(threshold):
+    index = FuzzyIndex(TEXT)
+    for term in TERMS:
+        assert index.contains(term, threshold, method="ratio") == brute_ratio(term, TEXT, threshold), term
+
+@pytest.mark.parametrize("threshold", [0.3, 0.6, 0.9])
+def test_trigram_matches_dice(threshold):
+    index = FuzzyIndex(TEXT)
+    for term in TERMS:
+        assert index.contains(term, threshold, method="trigram") == brute_trigram(term, TEXT, threshold), term
+
+def test_random_words_agree_with_brute_force():
+    rng = random.Random(0)
+    words = ["".join(rng.choice("abcdef") for _ in range(rng.randint(1, 9))) for _ in range(300)]
+    text = " ".join(words)
+    index = FuzzyIndex(text)
+    for term in words[:60]:
+        mutated = term[:-1] + rng.choice("xyz")
+        for method, brute in (("ratio", brute_ratio), ("trigram", brute_trigram)):
+            assert index.contains(mutated, 0.6, method) == brute(mutated, text, 0.6)
+
+def test_matches_lists_every_similar_word():
+    index = FuzzyIndex(vocabulary=["python", "pyhton", "java", "jython"])
+    assert sorted(index.matches("Python", 0.8)) == ["jython", "pyhton", "python"]
+    assert index.matches("rust") == []
+
+def test_unknown_method():
+    with pytest.raises(ValueError, match="fuzzy match method"):
+        fuzzy_match("python", TEXT, method="soundex")
@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ranking import TopK, page_count, paginate, top_k
+
+def test_top_k_keeps_earliest_of_equal_scores():
+    ranking = TopK(3)
+    for score, name in [(50, "a"), (70, "b"), (50, "c"), (70, "d"), (50, "e")]:
+        ranking.push(score, name)
+    assert ranking.items() == ["b", "d", "a"]
+    assert ranking.seen == 5
+
+def test_top_k_matches_a_stable_sort():
+    rng = random.Random(0)
+    scored = [(rng.choice([10, 20, 30, 40]), i) for i in range(500)]
+    expected = [i for _, i in sorted(scored, key=lambda entry: -entry[0])[:25]]
+    assert top_k(scored, 25) == expected
+
+def test_upload_order_breaks_ties_whatever_the_push_order():
+    # As the ranking script pushes: (score, -upload index) keys, in
+    # completion order.
+    ranking = TopK(2)
+    for index, score in [(3, 70), (1, 70), (2, 90), (0, 70)]:
+        ranking.push((score, -index), index)
+    assert ranking.items() == [2, 0]
+
+def test_top_k_of_zero_keeps_nothing():
+    ranking = TopK(0)
+    ranking.push(1, "a")
+    assert ranking.items() == [] and ranking.seen == 1
+
+def test_paginate_clamps_pages():
+    items = list(range(7))
+    assert page_count(7, 3) == 3 and page_count(0, 3) == 1
+    assert paginate(items, 1, 3) == [0, 1, 2]
+    assert paginate(items, 3, 3) == [6]
+    assert paginate(items, 9, 3) == [6]
+    assert paginate(items, 0, 3) == [0, 1, 2]
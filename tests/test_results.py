@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from results import COLUMNS, ResultStore
+
+ESSENTIAL = ["Python", "SQL"]
+PREFERRED = ["Docker", "Python"]
+
+def store(capacity=1):
+    results = ResultStore(ESSENTIAL, PREFERRED, capacity=capacity)
+    results.append("in/a.pdf", hits=[1, 1, 0, 1], skill_match=85.004)
+    results.append("in/b.docx", hits=[1, 0, 1, 1], skill_match=61.5)
+    results.append("in/c.pdf", error="not a PDF")
+    results.append("in/d.pdf", hits=[1, 1, 0, 1], skill_match=85.004)
+    results.duplicate_of[3] = "in/a.pdf"
+    results.summaries[0] = "Strong Python engineer"
+    results.similarity[:] = [40.123, 10.0, np.nan, 40.123]
+    return results
+
+def test_rows_grow_past_capacity():
+    results = store()
+    assert len(results) == 4
+    assert results.hits.tolist() == [[1, 1, 0, 1], [1, 0, 1, 1], [0, 0, 0, 0], [1, 1, 0, 1]]
+    assert np.isnan(results.skill_match[2]) and results.skill_match[1] == np.float32(61.5)
+    assert results.ok_rows() == [0, 1]
+
+def test_frame_renders_the_batch_columns():
+    frame = store().to_frame(skills_table="dict")
+    assert list(frame.columns) == COLUMNS
+    a, b, c, _ = frame.to_dict("records")
+    assert a["Candidate"] == "a.pdf" and a["Skill Match %"] == 85.0 and a["JD Similarity %"] == 40.12
+    assert a["Match Level"] == "🟢 High" and b["Match Level"] == "🟡 Medium"
+    assert a["Essential Skills"] == "2/2" and b["Preferred Skills"] == "2/2"
+    # A skill listed twice appears once, with its first column's hit.
+    assert a["Skills Table"] == {"Python": "🟢", "SQL": "🟢", "Docker": "🔴"}
+    assert a["AI Summary"] == "Strong Python engineer" and pd.isna(b["AI Summary"])
+    assert c["Error"] == "not a PDF"
+    assert all(pd.isna(c[column]) for column in ["Match Level", "Essential Skills", "Skills Table"])
+    assert frame["Duplicate Of"].isna().tolist() == [True, True, True, False]
+
+def test_json_tables_match_dict_tables():
+    results = store()
+    tables = results.to_frame(skills_table="json")["Skills Table"].tolist()
+    assert [None if pd.isna(t) else json.loads(t) for t in tables] == [
+        results.skills_table(row) if row != 2 else None for row in range(len(results))]
+
+def test_optional_columns():
+    results = ResultStore(ESSENTIAL, PREFERRED)
+    results.append("a.pdf", hits=[0, 0, 0, 0], skill_match=0)
+    frame = results.to_frame()
+    assert "Skills Table" not in frame.columns and frame.loc[0, "Match Level"] == "🔴 Low"
+    assert frame[["AI Summary", "Duplicate Of", "Error"]].isna().all(axis=None)
+
+def test_collapse_duplicates():
+    frame = store().to_frame(collapse_duplicates=True)
+    assert frame["Path"].tolist() == ["in/a.pdf", "in/b.docx", "in/c.pdf"]
+    assert frame["Duplicates"].tolist() == [1, 0, 0] and "Duplicate Of" not in frame.columns
+
+def test_extend_offsets_sparse_maps():
+    merged = store()
+    merged.extend(store())
+    assert len(merged) == 8 and merged.hits[5].tolist() == [1, 0, 1, 1]
+    assert merged.errors == {2: "not a PDF", 6: "not a PDF"}
+    assert merged.duplicate_of == {3: "in/a.pdf", 7: "in/a.pdf"}
+    assert merged.summaries == {0: "Strong Python engineer", 4: "Strong Python engineer"}
+    assert merged.similarity[4] == np.float32(40.123)
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from corpus import resume_text, write_docx, write_pdf
+from extraction import DOCX_TYPE, PDF_TYPE, extract_text
+from sections import excerpt, find_sections, relevant_text
+
+RESUME = "\n".join([
+    "Jane Doe",
+    "jane@example.com",
+    "Professional Summary",
+    "Data engineer building Spark pipelines.",
+    "WORK EXPERIENCE",
+    "Acme Ltd: Kafka and Airflow.",
+    "Technical Skills: Python, SQL",
+    "References",
+    "John Smith, Manager at Acme Ltd",
+    "Hobbies & Interests",
+    "Chess and hiking.",
+])
+
+def kinds(text):
+    return [kind for kind, _, _ in find_sections(text)]
+
+def test_headings_split_the_resume():
+    assert kinds(RESUME) == ["header", "summary", "experience", "skills", "references", "interests"]
+    sections = find_sections(RESUME)
+    assert sections[0][1] == 0 and sections[-1][2] == len(RESUME)
+    assert all(end == start for (_, _, end), (_, start, _) in zip(sections, sections[1:]))
+
+def test_relevant_text_drops_boilerplate_and_short_header():
+    kept = relevant_text(RESUME, enabled=True)
+    assert "Spark pipelines" in kept and "Python, SQL" in kept
+    assert "John Smith" not in kept and "Chess" not in kept and "jane@example.com" not in kept
+
+def test_text_without_headings_is_kept_whole():
+    text = "Built Spark pipelines and Kafka consumers for five years."
+    assert kinds(text) == ["header"]
+    assert relevant_text(text, enabled=True) == text
+    assert excerpt(text, 20) == text[:20]
+
+def test_excerpt_stays_within_limit():
+    for limit in (40, 120, 1000):
+        prompt = excerpt(RESUME, limit)
+        assert len(prompt) <= limit
+        assert "John Smith" not in prompt
+    assert "Spark pipelines" in prompt and "Python, SQL" in prompt
+
+@pytest.mark.parametrize("fmt, file_type, write", [("pdf", PDF_TYPE, write_pdf), ("docx", DOCX_TYPE, write_docx)])
+def test_extracted_resumes_are_segmented(tmp_path, fmt, file_type, write):
+    # Headings must stay on lines of their own after extraction, whatever
+    # the format.
+    path = str(tmp_path / f"resume.{fmt}")
+    write(path, resume_text(0))
+    with open(path, "rb") as f:
+        text = extract_text(file_type, f.read())
+    assert kinds(text) == ["header", "summary", "experience", "projects", "skills", "education"]
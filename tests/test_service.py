@@ -0,0 +1,131 @@
+import base64
+import http.client
+import json
+import os
+import socket
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from corpus import resume_text, write_docx, write_pdf
+from service import serve_in_thread
+from text_cache import TextCache
+
+SKILLS = {"essential": ["Python", "SQL"], "preferred": "Docker, Kubernetes"}
+
+@pytest.fixture(scope="module")
+def address(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("service")
+    _, address, stop = serve_in_thread(workers=1, timeout=60, cache=TextCache(str(tmp / "cache.sqlite3")),
+                                       batch_window=0.01, max_body=1024 * 1024)
+    yield address
+    stop()
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("files")
+    write_pdf(str(tmp / "a.pdf"), resume_text(0))
+    write_docx(str(tmp / "b.docx"), resume_text(1))
+    return {name: base64.b64encode((tmp / name).read_bytes()).decode("ascii") for name in ["a.pdf", "b.docx"]}
+
+def request(address, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(*address, timeout=60)
+    try:
+        data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode("utf-8")
+        connection.request(method, path, data, headers or {})
+        response = connection.getresponse()
+        payload = response.read()
+        if response.getheader("Content-Type") == "application/json":
+            payload = json.loads(payload)
+        return response.status, payload
+    finally:
+        connection.close()
+
+def raw_request(address, head):
+    with socket.create_connection(address, timeout=60) as sock:
+        sock.sendall(head)
+        return sock.recv(65536).decode("latin-1")
+
+def test_health(address):
+    assert request(address, "GET", "/health") == (200, {"status": "ok", "workers": 1})
+
+def test_extract(address, files):
+    status, payload = request(address, "POST", "/extract", {"resumes": [
+        {"name": "a.pdf", "content": files["a.pdf"]},
+        {"name": "b.docx", "content": files["b.docx"]},
+        {"name": "c.txt", "text": "Already extracted"},
+        {"name": "d.pdf", "content": base64.b64encode(b"not a pdf").decode("ascii")},
+    ]})
+    assert status == 200
+    results = payload["results"]
+    assert [r["name"] for r in results] == ["a.pdf", "b.docx", "c.txt", "d.pdf"]
+    assert "Summary" in results[0]["text"] and "Summary" in results[1]["text"]
+    assert results[2] == {"name": "c.txt", "text": "Already extracted", "error": None}
+    assert results[3]["text"] is None and results[3]["error"]
+
+def test_score(address):
+    status, payload = request(address, "POST", "/score", {**SKILLS, "years": {"Python": 5}, "resumes": [
+        {"name": "a", "text": "Python and SQL on Kubernetes"},
+        {"name": "b", "text": "JavaScript only"},
+    ]})
+    assert status == 200
+    a, b = payload["results"]
+    assert a["found"] == ["Python", "SQL", "Kubernetes"] and a["missing"] == ["Docker"]
+    assert a["match"] > b["match"] == 0
+    assert b["found"] == [] and b["error"] is None
+
+def test_rank(address, files):
+    status, payload = request(address, "POST", "/rank", {**SKILLS, "jd": "Python data engineer", "top_k": 2,
+                                                         "resumes": [
+        {"name": "weak", "text": "Docker"},
+        {"name": "strong", "text": "Python, SQL, Docker and Kubernetes"},
+        {"name": "file", "content": files["a.pdf"], "type": "pdf"},
+        {"name": "broken", "content": base64.b64encode(b"not a pdf").decode("ascii"), "type": "pdf"},
+    ]})
+    assert status == 200
+    assert payload["total"] == 3
+    assert [item["rank"] for item in payload["ranked"]] == [1, 2]
+    assert payload["ranked"][0]["name"] == "strong"
+    assert all("jd_similarity" in item for item in payload["ranked"])
+    assert [e["name"] for e in payload["errors"]] == ["broken"]
+
+@pytest.mark.parametrize("path, body, message", [
+    ("/score", {"resumes": [{"text": "x"}]}, "skill"),
+    ("/score", {**SKILLS, "resumes": []}, "resumes"),
+    ("/score", {**SKILLS, "resumes": [{"name": "a.pdf", "content": "%%%"}]}, "base64"),
+    ("/score", {**SKILLS, "resumes": [{"name": "a.rtf", "content": ""}]}, "file type"),
+    ("/score", {**SKILLS, "years": {"Python": "lots"}, "resumes": [{"text": "x"}]}, "years"),
+    ("/rank", {**SKILLS, "resumes": [{"text": "x"}]}, "jd"),
+    ("/rank", {**SKILLS, "jd": "x", "top_k": 0, "resumes": [{"text": "x"}]}, "top_k"),
+    ("/rank", {**SKILLS, "jd": "x", "top_k": True, "resumes": [{"text": "x"}]}, "top_k"),
+    ("/rank", [1, 2], "JSON object"),
+])
+def test_bad_bodies_are_rejected(address, path, body, message):
+    status, payload = request(address, "POST", path, body)
+    assert status == 400 and message in payload["error"]
+
+def test_invalid_json(address):
+    status, payload = request(address, "POST", "/score", b"{not json")
+    assert status == 400 and "JSON" in payload["error"]
+
+def test_unknown_route_and_method(address):
+    assert request(address, "GET", "/nope")[0] == 404
+    assert request(address, "GET", "/score")[0] == 405
+
+def test_body_too_large(address):
+    # Refused on the header alone, before any of the body is read.
+    reply = raw_request(address, b"POST /extract HTTP/1.1\r\nHost: x\r\nContent-Length: 1048577\r\n\r\n")
+    assert reply.startswith("HTTP/1.1 413 ")
+
+@pytest.mark.parametrize("length", [b"ten", b"-5"])
+def test_invalid_content_length(address, length):
+    reply = raw_request(address, b"POST /score HTTP/1.1\r\nHost: x\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert reply.startswith("HTTP/1.1 400 ") and "Content-Length" in reply
+
+def test_metrics(address):
+    status, text = request(address, "GET", "/metrics")
+    assert status == 200 and "resume_matcher_service_requests_total" in text.decode("utf-8")
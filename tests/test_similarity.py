@@ -0,0 +1,44 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from similarity import calculate_similarities, calculate_similarity
+
+JD = "Data engineer with Python, Spark and Airflow experience"
+RESUMES = [
+    "Data engineer: Python, Spark, Airflow and Kafka.",
+    "Frontend developer working with React and TypeScript.",
+    "Python developer. References: available on request from Spark Ltd.",
+    "",
+]
+
+def reference(jd_text, texts):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    from sections import relevant_text
+
+    vectors = TfidfVectorizer(stop_words='english').fit_transform([jd_text] + [relevant_text(t) for t in texts])
+    return cosine_similarity(vectors[1:], vectors[0]).ravel() * 100
+
+def test_matches_cosine_similarity_over_the_pool():
+    scores = calculate_similarities(JD, RESUMES)
+    np.testing.assert_allclose(scores, reference(JD, RESUMES))
+    assert scores[0] > scores[2] > scores[1] == scores[3] == 0
+
+def test_accepts_a_generator():
+    scores = calculate_similarities(JD, (text for text in RESUMES))
+    np.testing.assert_allclose(scores, calculate_similarities(JD, RESUMES))
+
+def test_single_resume():
+    assert calculate_similarity(RESUMES[0], JD) == pytest.approx(reference(JD, RESUMES[:1])[0])
+
+@pytest.mark.parametrize("jd_text, texts", [("the and of", ["a the", "of"]), ("", [])])
+def test_empty_vocabulary_scores_zero(jd_text, texts):
+    scores = calculate_similarities(jd_text, texts)
+    assert scores.shape == (len(texts),) and not scores.any()
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from skill_matcher import SkillMatcher, calculate_match, score_hit_matrix, skill_hit_matrix
+from taxonomy import EMPTY
+
+ESSENTIAL = ["C", "Java", "Python"]
+PREFERRED = ["C++", "JavaScript", "Go"]
+EXPERIENCE = {"C": 3, "Java": 2, "C++": 5, "JavaScript": 1}
+TEXTS = [
+    "Senior C++ engineer, some JavaScript tooling.",
+    "Java and C developer; Python scripts.",
+    "JavaScript, TypeScript and Node.js on the front end.",
+    "Embedded C, C/C++ and a little Go.",
+    "Data engineering with Python and SQL.",
+    "",
+]
+
+def test_batch_scores_match_calculate_match():
+    hits, skills = skill_hit_matrix(TEXTS, ESSENTIAL + PREFERRED)
+    batch = score_hit_matrix(hits, skills, ESSENTIAL, PREFERRED, EXPERIENCE)
+    single = [calculate_match(text, ESSENTIAL, PREFERRED, EXPERIENCE) for text in TEXTS]
+    assert batch.tolist() == single
+
+@pytest.mark.parametrize("text, skill, found", [
+    ("Java developer", "Java", True),
+    ("JavaScript developer", "Java", False),
+    ("JavaScript developer", "JavaScript", True),
+    ("C programmer", "C", True),
+    ("C programmer", "C++", False),
+    ("C++ programmer", "C++", True),
+])
+def test_word_boundaries(text, skill, found):
+    hits, _ = skill_hit_matrix([text], [skill])
+    assert bool(hits[0, 0]) is found
+    assert (calculate_match(text, [skill], [], {}) > 0) is found
+
+def test_find_reports_offsets_and_counts():
+    text = "Python, then more python. Machine Learning too."
+    matcher = SkillMatcher(["Python", "Machine Learning", "Rust"], EMPTY)
+    spans = matcher.find(text)
+    assert {skill: [text[a:b] for a, b in found] for skill, found in spans.items()} == {
+        "Python": ["Python", "python"], "Machine Learning": ["Machine Learning"]}
+    assert matcher.counts(text) == {"Python": 2, "Machine Learning": 1}
+
+def test_overlapping_names_are_all_found():
+    matcher = SkillMatcher(["Spring", "Spring Boot", "Boot"], EMPTY)
+    assert matcher.matched("Spring Boot services") == {"Spring", "Spring Boot", "Boot"}
@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from skill_matcher import SkillMatcher
+from taxonomy import EMPTY, SkillTaxonomy, load_taxonomy
+
+ENTRIES = [
+    {"id": "kubernetes", "name": "Kubernetes", "aliases": ["k8s"]},
+    {"id": "postgresql", "name": "PostgreSQL", "aliases": ["Postgres", "postgre sql"]},
+    {"id": "cpp", "name": "C++", "aliases": ["cpp"]},
+]
+
+@pytest.fixture
+def taxonomy():
+    return SkillTaxonomy(ENTRIES)
+
+def test_names_and_aliases_map_to_one_id(taxonomy):
+    for skill in ["Kubernetes", "k8s", "K8S", " kubernetes "]:
+        assert taxonomy.known(skill)
+        assert taxonomy.canonical_id(skill) == "kubernetes"
+        assert taxonomy.canonical_name(skill) == "Kubernetes"
+    assert taxonomy.canonical_id("Postgre   SQL") == "postgresql"
+
+def test_unknown_skills_are_their_own_id(taxonomy):
+    assert not taxonomy.known("Terraform")
+    assert taxonomy.canonical_id("Terraform  Cloud") == "terraform cloud"
+    assert taxonomy.canonical_name("Terraform") == "Terraform"
+    assert taxonomy.surface_forms("Terraform") == ["Terraform"]
+
+def test_surface_forms_include_the_requested_spelling(taxonomy):
+    assert taxonomy.surface_forms("k8s") == ["Kubernetes", "k8s"]
+    assert taxonomy.surface_forms("Postgre SQL") == ["PostgreSQL", "Postgres", "postgre sql", "Postgre SQL"]
+
+@pytest.mark.parametrize("entries, message", [
+    (ENTRIES + [{"id": "cpp", "name": "CPP"}], "Duplicate skill id"),
+    (ENTRIES + [{"id": "kube", "name": "Kube", "aliases": ["K8s"]}], "belongs to both"),
+    (ENTRIES + [{"id": "k8s", "name": "K8s tooling"}], "belongs to both"),
+])
+def test_conflicting_entries_are_rejected(entries, message):
+    with pytest.raises(ValueError, match=message):
+        SkillTaxonomy(entries)
+
+def test_aliases_count_when_matching(taxonomy):
+    matcher = SkillMatcher(["Kubernetes", "Postgres", "Docker"], taxonomy)
+    assert matcher.matched("Ran k8s and PostgreSQL, no containers.") == {"Kubernetes", "Postgres"}
+    literal = SkillMatcher(["Kubernetes", "Postgres"], EMPTY)
+    assert literal.matched("Ran k8s and PostgreSQL.") == set()
+
+def test_default_taxonomy_is_consistent():
+    # Loading validates every id and alias; each skill matches its own name.
+    taxonomy = load_taxonomy()
+    assert len(taxonomy) > 50
+    for skill_id, name in taxonomy.names.items():
+        assert taxonomy.canonical_id(name) == skill_id
+    matcher = SkillMatcher(["Kubernetes", "AWS"])
+    assert matcher.matched("Deployed with k8s on Amazon Web Services") == {"Kubernetes", "AWS"}
+
+def test_load_from_file(tmp_path):
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps({"skills": ENTRIES}), encoding="utf-8")
+    assert load_taxonomy(str(path)).canonical_id("k8s") == "kubernetes"
+    assert load_taxonomy("") is EMPTY
@@ -0,0 +1,78 @@
+import os
+import sqlite3
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import text_cache
+from metrics import REGISTRY
+from text_cache import TextCache
+
+def test_get_and_put(tmp_path):
+    REGISTRY.reset()
+    cache = TextCache(str(tmp_path / "cache.sqlite3"), name="test_cache")
+    assert cache.get("abc", "v1") is None
+    cache.put("abc", "v1", "Python and SQL")
+    assert cache.get("abc", "v1") == "Python and SQL"
+    # A new extractor version is a different entry.
+    assert cache.get("abc", "v2") is None
+    counters = {c["labels"]["result"]: c["value"] for c in REGISTRY.snapshot()["counters"]
+                if c["labels"].get("cache") == "test_cache"}
+    assert counters == {"hit": 1, "miss": 2}
+
+def test_total_follows_puts_replacements_and_clear(tmp_path):
+    cache = TextCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("a", "v1", "x" * 10)
+    cache.put("b", "v1", "é" * 10)
+    assert cache.total_size() == 30
+    cache.put("a", "v1", "x" * 4)
+    assert cache.total_size() == 24
+    cache.clear()
+    assert cache.total_size() == 0 and cache.get("b", "v1") is None
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(text_cache.time, "time", lambda: next(clock))
+    cache = TextCache(str(tmp_path / "cache.sqlite3"), max_bytes=100)
+    for key in "abcd":
+        cache.put(key, "v1", key * 25)
+    assert cache.get("a", "v1") == "a" * 25
+    # Over budget: drops the oldest entries until it is down to 90 bytes.
+    cache.put("e", "v1", "e" * 25)
+    assert [cache.get(key, "v1") is not None for key in "abcde"] == [True, False, False, True, True]
+    assert cache.total_size() == 75
+    # Texts bigger than the whole budget are not stored.
+    cache.put("f", "v1", "f" * 101)
+    assert cache.get("f", "v1") is None and cache.total_size() == 75
+
+def test_existing_cache_is_totalled_once(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TextCache(path).put("a", "v1", "x" * 10)
+    with sqlite3.connect(path) as conn:
+        # As written before the total was kept.
+        conn.execute("DROP TABLE cache_size")
+    assert TextCache(path).total_size() == 10
+    assert TextCache(path).total_size() == 10
+
+def test_connections_are_closed(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(text_cache.sqlite3, "connect", tracking_connect)
+    cache = TextCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("a", "v1", "text")
+    cache.get("a", "v1")
+    cache.clear()
+    assert len(opened) == 4
+    for conn in opened:
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            continue
+        raise AssertionError("connection left open")
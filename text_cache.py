@@ -0,0 +1,129 @@
+# Persistent cache of extracted resume text, keyed by the SHA-256 of the
+# uploaded bytes plus the extractor version that produced the text.
+# Backed by SQLite so it survives Streamlit reruns and server restarts and is
+# safe to share between sessions.  The total size of the cached texts is kept
+# in a one-row table, updated in the same transaction as every write, so
+# checking the size budget never has to scan the cache.
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import REGISTRY
+
+DEFAULT_PATH = os.getenv(
+    "RESUME_TEXT_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_matcher", "text_cache.sqlite3"),
+)
+DEFAULT_MAX_BYTES = int(float(os.getenv("RESUME_TEXT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+class TextCache:
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES, name=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        # Label for hit/miss metrics, e.g. "text_cache" or "summary_cache".
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts ("
+                " digest TEXT NOT NULL,"
+                " version TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " PRIMARY KEY (digest, version))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS texts_last_access ON texts (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)")
+            # Caches written before the total was kept are summed once.
+            conn.execute("INSERT OR IGNORE INTO cache_size (id, total) SELECT 0, COALESCE(SUM(size), 0) FROM texts")
+
+    @contextmanager
+    def _connect(self):
+        # One transaction (committed, or rolled back on error) on a
+        # connection that is closed afterwards.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, digest, version):
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT text FROM texts WHERE digest = ? AND version = ?", (digest, version)
+            ).fetchone()
+            REGISTRY.cache_result(self.name, row is not None)
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE texts SET last_access = ? WHERE digest = ? AND version = ?",
+                (time.time(), digest, version),
+            )
+            return row[0]
+
+    def put(self, digest, version, text):
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock, self._connect() as conn:
+            old = conn.execute("SELECT size FROM texts WHERE digest = ? AND version = ?", (digest, version)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO texts (digest, version, text, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (digest, version, text, size, time.time()),
+            )
+            total = self._add_size(conn, size - (old[0] if old else 0))
+            self._evict(conn, total)
+
+    @staticmethod
+    def _add_size(conn, delta):
+        conn.execute("UPDATE cache_size SET total = total + ? WHERE id = 0", (delta,))
+        return conn.execute("SELECT total FROM cache_size WHERE id = 0").fetchone()[0]
+
+    def total_size(self):
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT total FROM cache_size WHERE id = 0").fetchone()[0]
+
+    def _evict(self, conn, total):
+        # Drop least recently used entries until the cache is back under its
+        # size budget (with some headroom so we don't evict on every put).
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute("SELECT digest, version, size FROM texts ORDER BY last_access")
+        stale = []
+        freed = 0
+        for digest, version, size in rows:
+            if total - freed <= target:
+                break
+            stale.append((digest, version))
+            freed += size
+        conn.executemany("DELETE FROM texts WHERE digest = ? AND version = ?", stale)
+        self._add_size(conn, -freed)
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM texts")
+            conn.execute("UPDATE cache_size SET total = 0 WHERE id = 0")
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_default_cache():
+    # Locked, since pipeline threads may ask for it at the same time.
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TextCache(name="text_cache")
+        return _default_cache
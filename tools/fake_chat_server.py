@@ -0,0 +1,100 @@
+# Local stand-in for the chat-completions endpoint used by ai_summary.py.
+# Returns a canned summary for every request, optionally with latency and
+# injected 429/500 failures, so the summary stage can be exercised without
+# network access or an API key:
+#
+#   python tools/fake_chat_server.py --port 8001 --latency 0.5 --fail-rate 0.2 [--retry-after 0]
+#   OPENAI_API_BASE=http://127.0.0.1:8001/v1 python "resume_matcher_app (5).py" ...
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def make_handler(latency=0.0, fail_rate=0.0, seed=None, retry_after=0.0):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    stats = {"requests": 0, "failures": 0}
+
+    class ChatHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                prompt = body["messages"][-1]["content"]
+            except (ValueError, KeyError, IndexError):
+                self.send_error(400, "malformed chat completion request")
+                return
+
+            with lock:
+                stats["requests"] += 1
+                fail = rng.random() < fail_rate
+                if fail:
+                    stats["failures"] += 1
+            if latency:
+                time.sleep(latency)
+            if fail:
+                self.send_response(rng.choice([429, 500]))
+                if retry_after is not None:
+                    self.send_header("Retry-After", f"{retry_after:g}")
+                self.end_headers()
+                return
+
+            digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+            payload = json.dumps({
+                "id": f"chatcmpl-{digest}",
+                "object": "chat.completion",
+                "model": body.get("model", ""),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": f"Summary {digest}: {len(prompt)} prompt chars."},
+                }],
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    ChatHandler.stats = stats
+    return ChatHandler
+
+def serve(host="127.0.0.1", port=0, latency=0.0, fail_rate=0.0, seed=None, retry_after=0.0):
+    # Starts the server on a background thread and returns it; the bound
+    # address is server.server_address and counters are server.stats.
+    # retry_after=None leaves the Retry-After header off failures, so the
+    # client falls back to its own backoff.
+    handler = make_handler(latency, fail_rate, seed, retry_after)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.stats = handler.stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 429/500")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After seconds sent with failures")
+    args = parser.parse_args()
+    handler = make_handler(args.latency, args.fail_rate, retry_after=args.retry_after)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"Serving fake chat completions on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()